@@ -0,0 +1,38 @@
+import threading
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class BlockHeaderCache:
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._headers: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._headers)
+
+    def get(self, block_number: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            header = self._headers.get(block_number)
+            if header is None:
+                self.misses += 1
+                return None
+            self._headers.move_to_end(block_number)
+            self.hits += 1
+            return header
+
+    def discard(self, block_number: int) -> None:
+        with self._lock:
+            self._headers.pop(block_number, None)
+
+    def put(self, block_number: int, header: Dict[str, Any]) -> None:
+        with self._lock:
+            self._headers[block_number] = header
+            self._headers.move_to_end(block_number)
+            while len(self._headers) > self.maxsize:
+                self._headers.popitem(last=False)
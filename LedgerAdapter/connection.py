@@ -1,27 +1,49 @@
+import threading
+
 from abc import ABC
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from web3.providers import HTTPProvider
-from requests import Session
-from requests.adapters import HTTPAdapter
+# requests and web3 are imported on first use, so modules that only need
+# the Connection type (utils, hashing helpers) do not pay for them.
+if TYPE_CHECKING:
+    from web3.providers import HTTPProvider
 
 
 class Connection(ABC):
 
-    def __init__(self, node_url: str, request_timeout: int = 5):
+    def __init__(self, node_url: str, request_timeout: int = 5, pool_maxsize: int = 10):
         self.auth_token = None
         self.ca_cert_path = None
         self.node_url = node_url
         self.request_timeout = request_timeout
+        self.pool_maxsize = pool_maxsize
+        self.active_requests = 0
+        self._active_lock = threading.Lock()
+
+        from requests import Session
+        from requests.adapters import HTTPAdapter
 
         self.session = Session()
-        self.adapter = HTTPAdapter()
-        
+        self.adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        # Each request holds one pooled connection while it runs, so the
+        # active count is the pool's utilization.
+        self._adapter_send = self.adapter.send
+        self.adapter.send = self._send
+
         self.session.mount('http://', self.adapter)
         self.session.mount('https://', self.adapter)
 
         self.session.verify = False
 
+    def _send(self, *args: Any, **kwargs: Any) -> Any:
+        with self._active_lock:
+            self.active_requests += 1
+        try:
+            return self._adapter_send(*args, **kwargs)
+        finally:
+            with self._active_lock:
+                self.active_requests -= 1
+
     def with_tls(self, ca_cert_path: Optional[str] = None) -> 'Connection':
         if not self.node_url.startswith('https://'):
             raise ValueError(
@@ -58,7 +80,9 @@ class Connection(ABC):
                 f"Authentication failed for user '{username}' at {self.node_url}: {str(e)}"
             )
 
-    def get_provider(self) -> HTTPProvider:
+    def get_provider(self) -> 'HTTPProvider':
+        from web3.providers import HTTPProvider
+
         return HTTPProvider(
             self.node_url,
             session=self.session,
@@ -1,7 +1,12 @@
 from abc import ABC
+from contextlib import contextmanager, nullcontext
+from dataclasses import replace
 from eth_account import Account
+from eth_utils.abi import get_abi_output_types
 from hexbytes import HexBytes
-from typing import List, Dict, Union, Optional, Any
+import threading
+import time
+from typing import List, Dict, Union, Optional, Any, Tuple, Iterator
 from web3 import Web3
 from web3.contract.contract import ContractFunction
 from web3.exceptions import Web3RPCError, ContractLogicError
@@ -9,6 +14,11 @@ from web3.middleware import ExtraDataToPOAMiddleware
 from web3.providers import HTTPProvider
 from web3.types import TxReceipt
 
+from .block_cache import BlockHeaderCache
+from .instrumentation import Instrumentation, RpcCounterMiddleware
+from .known_hashes import KnownHashBloom, KnownHashSet
+from .journal import CONFIRMED, DROPPED, FAILED, TransactionJournal
+from .metrics import ContractMetrics, MetricsMiddleware, MetricsRegistry, track_block_cache
 from .models import (
     BlockchainError,
     BlockchainValue,
@@ -16,16 +26,35 @@ from .models import (
     BlockDetails,
     EventData,
     EventDetails,
+    NotSentError,
+    RawBlockchainResponse,
+    RawBlockDetails,
+    RawEventData,
+    RawEventDetails,
+    RawTransactionDetails,
     TransactionDetails,
 )
+from .sender_pool import SenderLane, SenderPool
+from .signing import SigningPipeline
 from .utils import (
     bytes_to_0xhex,
     hex0x_to_bytes,
     parse_error,
     parse_event_data,
+    parse_raw_event_data,
 )
 
 
+# Shared no-op context used when instrumentation is off, so the hot path
+# pays one attribute check per stage.
+_UNTRACED = nullcontext()
+
+
+def _block_hash(event: EventData | RawEventData) -> str:
+    block_hash = event.block_hash
+    return block_hash.lower() if isinstance(block_hash, str) else bytes_to_0xhex(block_hash)
+
+
 class Contract(ABC):
 
     def __init__(self,
@@ -41,18 +70,168 @@ class Contract(ABC):
             address=contract_address,
             abi=contract_abi
         )
+
+        self.journal: Optional[TransactionJournal] = None
+        self.known_hashes: Optional[Union[KnownHashSet, KnownHashBloom]] = None
+        self.block_headers = BlockHeaderCache()
+        self.instrumentation: Optional[Instrumentation] = None
+        self.metrics: Optional[ContractMetrics] = None
+        self._signing_pipelines: Dict[Tuple[str, Optional[int]], SigningPipeline] = {}
+        self._signing_lock = threading.Lock()
+
+    def __enter__(self) -> 'Contract':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._signing_lock:
+            pipelines = list(self._signing_pipelines.values())
+            self._signing_pipelines = {}
+        for pipeline in pipelines:
+            pipeline.close()
+
+    def _signing_pipeline(self,
+                          private_key: str,
+                          max_workers: Optional[int]) -> SigningPipeline:
+        # Worker processes are kept for the life of the contract, so only the
+        # first execute_many for a key pays the pool start-up.
+        with self._signing_lock:
+            pipeline = self._signing_pipelines.get((private_key, max_workers))
+            if pipeline is None:
+                pipeline = SigningPipeline(private_key, max_workers=max_workers)
+                self._signing_pipelines[(private_key, max_workers)] = pipeline
+            return pipeline
+
+    def with_instrumentation(self, instrumentation: Instrumentation) -> 'Contract':
+        if self.instrumentation is None:
+            self.w3.middleware_onion.add(
+                lambda w3: RpcCounterMiddleware(w3, self.instrumentation),
+                name='rpc_counter'
+            )
+        self.instrumentation = instrumentation
+        return self
+
+    def with_metrics(self, registry: MetricsRegistry) -> 'Contract':
+        if self.metrics is not None:
+            raise ValueError("Metrics are already configured for this contract")
+        self.metrics = ContractMetrics(registry, self.contract.address)
+        self.w3.middleware_onion.add(
+            lambda w3: MetricsMiddleware(w3, self.metrics),
+            name='metrics'
+        )
+        track_block_cache(registry, self.block_headers, self.contract.address)
+        return self
+
+    def _operation(self, name: str):
+        if self.metrics is not None:
+            return self._measured_operation(name)
+        if self.instrumentation is None:
+            return _UNTRACED
+        return self.instrumentation.operation(name)
+
+    @contextmanager
+    def _measured_operation(self, name: str) -> Iterator[None]:
+        with self.metrics.operation(name):
+            if self.instrumentation is None:
+                yield
+            else:
+                with self.instrumentation.operation(name):
+                    yield
+
+    def _stage(self, name: str):
+        if self.instrumentation is None:
+            return _UNTRACED
+        return self.instrumentation.stage(name)
+
+    def with_journal(self, journal: TransactionJournal) -> 'Contract':
+        self.journal = journal
+        return self
+
+    def with_known_hashes(self,
+                          known_hashes: Union[KnownHashSet, KnownHashBloom]
+                          ) -> 'Contract':
+        self.known_hashes = known_hashes
+        return self
+
+    def sync_known_hashes(self,
+                          from_block: int = 0,
+                          to_block: Union[int, str] = 'latest') -> None:
+        if self.known_hashes is None:
+            raise BlockchainError(message="No known-hash store configured")
+        self.known_hashes.observe_events(self.get_events(from_block, to_block))
+
+    def _known_on_chain(self,
+                        hashed_values: List[bytes],
+                        read_function: Any) -> List[bool]:
+        if self.known_hashes is None:
+            return [False] * len(hashed_values)
+
+        known = [
+            self.known_hashes.might_contain(bytes_to_0xhex(hashed_value))
+            for hashed_value in hashed_values
+        ]
+        if self.known_hashes.exact:
+            return known
+
+        # Bloom positives are confirmed with one batched read; a reverted
+        # read means the hash is not registered.
+        positives = [i for i, hit in enumerate(known) if hit]
+        results = self.call_many([read_function(hashed_values[i]) for i in positives])
+        for i, result in zip(positives, results):
+            known[i] = not isinstance(result, BlockchainError)
+        return known
+
+    def _raise_if_known(self,
+                        hashed_value: bytes,
+                        read_function: Any) -> None:
+        if self._known_on_chain([hashed_value], read_function)[0]:
+            raise BlockchainError(message="Hash already exists")
     
     def wait_for_receipt(self,
-                         tx_hash: str):
+                         tx_hash: str,
+                         raw: bool = False):
         try:
-            return self._parse_receipt(
-                self.w3.eth.wait_for_transaction_receipt(tx_hash)
-            )
+            with self._stage('wait_for_receipt'):
+                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
         except Web3RPCError as e:
             return parse_error(e)
+        finally:
+            if self.metrics is not None:
+                self.metrics.settled(tx_hash)
+
+        if self.journal is not None:
+            self.journal.update(
+                bytes_to_0xhex(receipt.transactionHash),
+                CONFIRMED if receipt.status == 1 else FAILED
+            )
+        with self._stage('parse_receipt'):
+            response = self._parse_receipt(receipt, raw=raw)
+        if self.known_hashes is not None:
+            for event in response.events:
+                self.known_hashes.observe(event.event_name, event.event_results)
+        return response
 
     def _parse_receipt(self,
-                       receipt: TxReceipt) -> BlockchainResponse:        
+                       receipt: TxReceipt,
+                       raw: bool = False) -> BlockchainResponse | RawBlockchainResponse:
+        if raw:
+            return RawBlockchainResponse(
+                status=receipt.status,
+                block=RawBlockDetails(
+                    block_hash=receipt.blockHash,
+                    block_number=receipt.blockNumber
+                ),
+                transaction=RawTransactionDetails(
+                    transaction_hash=receipt.transactionHash,
+                    from_address=receipt['from'],
+                    to_address=receipt['to'],
+                    gas_used=receipt.gasUsed
+                ),
+                events=self._parse_events(receipt, raw=True)
+            )
+
         return BlockchainResponse(
             status=str(receipt.status),
             block=BlockDetails(
@@ -69,13 +248,20 @@ class Contract(ABC):
         )
 
     def _parse_events(self,
-                      receipt: TxReceipt) -> List[EventDetails]:
+                      receipt: TxReceipt,
+                      raw: bool = False) -> List[EventDetails | RawEventDetails]:
         parsed_events = []
         for event_abi in [abi for abi in self.contract.abi if abi['type'] == 'event']:
             event_name = event_abi['name']
             event_processor = getattr(self.contract.events, event_name)
             logs = event_processor().process_receipt(receipt)
             for log in logs:
+                if raw:
+                    parsed_events.append(RawEventDetails(
+                        event_name=log.event,
+                        event_results=dict(log.args)
+                    ))
+                    continue
                 event_data = EventDetails(
                     event_name=log.event,
                     event_results={
@@ -88,87 +274,618 @@ class Contract(ABC):
 
     def call(self,
              contract_function: ContractFunction) -> BlockchainValue | BlockchainError:
+        with self._operation('call'):
+            try:
+                with self._stage('eth_call'):
+                    result = contract_function.call()
+                return BlockchainValue(value=bytes_to_0xhex(result))
+            except Exception as e:
+                raise parse_error(e)
+
+    def _build_transaction(self,
+                           contract_function: ContractFunction,
+                           address: str,
+                           nonce: int,
+                           chain_id: int,
+                           gas: Optional[int] = None) -> Dict:
+        tx_params = {
+            'from': address,
+            'chainId': chain_id,
+            'gasPrice': 0,
+            'nonce': nonce
+        }
+        if gas is None:
+            gas = self._estimate_gas(contract_function, address, chain_id)
+        tx_params['gas'] = gas
+        with self._stage('build_transaction'):
+            return contract_function.build_transaction(tx_params)
+
+    def _estimate_gas(self,
+                      contract_function: ContractFunction,
+                      address: str,
+                      chain_id: int) -> int:
+        with self._stage('estimate_gas'):
+            gas_estimate = contract_function.estimate_gas({
+                'from': address,
+                'chainId': chain_id,
+                'gasPrice': 0
+            })
+        return int(gas_estimate * 1.2)
+
+    def _estimate_gas_many(self,
+                           contract_functions: List[ContractFunction],
+                           address: str) -> List[Union[int, BlockchainError]]:
+        # The round trip is timed by the batch_request stage; estimate_gas
+        # only covers encoding the calls and reading the results.
+        with self._stage('estimate_gas'):
+            requests = [
+                ('eth_estimateGas', [{
+                    'from': address,
+                    'to': contract_function.address,
+                    'data': contract_function._encode_transaction_data(),
+                    'gasPrice': hex(0)
+                }])
+                for contract_function in contract_functions
+            ]
+        responses = self._batch_request(requests)
+        estimates = []
+        with self._stage('estimate_gas'):
+            for response in responses:
+                error = response.get('error')
+                if error is not None:
+                    estimates.append(BlockchainError(message=error.get('message', str(error))))
+                else:
+                    estimates.append(int(int(response['result'], 16) * 1.2))
+        return estimates
+
+    def _send_raw_transaction(self,
+                              raw_transaction: bytes,
+                              address: str,
+                              nonce: int,
+                              contract_function: ContractFunction) -> str:
+        tx_hash = bytes_to_0xhex(Web3.keccak(raw_transaction))
+        if self.journal is None:
+            with self._stage('send_raw_transaction'):
+                self.w3.eth.send_raw_transaction(raw_transaction)
+            if self.metrics is not None:
+                self.metrics.sent(tx_hash)
+            return tx_hash
+
+        # Journal before sending: a crash after the node accepted the
+        # transaction must still leave a pending entry to reconcile.
+        args = contract_function.args
+        if len(args) == 1 and isinstance(args[0], bytes):
+            payload_hash = bytes_to_0xhex(args[0])
+        else:
+            payload_hash = bytes_to_0xhex(
+                Web3.keccak(hexstr=contract_function._encode_transaction_data())
+            )
+        self.journal.record(tx_hash, nonce, address, payload_hash)
         try:
-            return BlockchainValue(value=bytes_to_0xhex( contract_function.call() ))
-        except Exception as e:
-            raise parse_error(e)
+            with self._stage('send_raw_transaction'):
+                self.w3.eth.send_raw_transaction(raw_transaction)
+        except Web3RPCError:
+            self.journal.update(tx_hash, FAILED)
+            raise
+        if self.metrics is not None:
+            self.metrics.sent(tx_hash)
+        return tx_hash
+
+    def call_many(self,
+                  contract_functions: List[ContractFunction],
+                  block_identifier: Union[int, str] = 'latest',
+                  from_address: Optional[str] = None) -> List[Any]:
+        with self._operation('call_many'):
+            if isinstance(block_identifier, int):
+                block_identifier = hex(block_identifier)
+
+            requests = []
+            for contract_function in contract_functions:
+                params = {
+                    'to': self.contract.address,
+                    'data': contract_function._encode_transaction_data()
+                }
+                if from_address is not None:
+                    params['from'] = from_address
+                requests.append(('eth_call', [params, block_identifier]))
+
+            # Reverted calls come back as BlockchainError items rather than
+            # raising, so one bad entry does not fail the whole batch.
+            responses = self._batch_request(requests)
+            results = []
+            with self._stage('decode'):
+                for contract_function, response in zip(contract_functions, responses):
+                    error = response.get('error')
+                    if error is not None:
+                        results.append(BlockchainError(message=error.get('message', str(error))))
+                        continue
+                    decoded = self.w3.codec.decode(
+                        get_abi_output_types(contract_function.abi),
+                        Web3.to_bytes(hexstr=response['result'])
+                    )
+                    results.append(bytes_to_0xhex(decoded[0] if len(decoded) == 1 else list(decoded)))
+            return results
+
+    def simulate_many(self,
+                      contract_functions: List[ContractFunction],
+                      from_address: str) -> List[Optional[BlockchainError]]:
+        # Dry-run against the pending state as the sender, so reverts are
+        # caught before a nonce is spent on them.
+        return [
+            result if isinstance(result, BlockchainError) else None
+            for result in self.call_many(
+                contract_functions, block_identifier='pending', from_address=from_address
+            )
+        ]
 
     def execute(self, 
                 contract_function: ContractFunction,
-                private_key: str,
+                private_key: Union[str, SenderPool],
                 synchronous: bool = False
                 ) -> Union[BlockchainResponse, HexBytes, BlockchainError]:
+        if self.metrics is not None:
+            self.metrics.refresh(self._fetch_receipts)
+        with self._operation('execute'):
+            if isinstance(private_key, SenderPool):
+                return self._execute_pooled(contract_function, private_key, synchronous)
+
+            try:
+                account = Account.from_key(private_key)
+                with self._stage('get_transaction_count'):
+                    nonce = self.w3.eth.get_transaction_count(account.address)
+                with self._stage('chain_id'):
+                    chain_id = self.w3.eth.chain_id
+                tx = self._build_transaction(
+                    contract_function, account.address, nonce, chain_id
+                )
+                with self._stage('sign'):
+                    signed_tx = self.w3.eth.account.sign_transaction(tx, private_key)
+                tx_hash = self._send_raw_transaction(
+                    signed_tx.raw_transaction, account.address, nonce, contract_function
+                )
+
+                if synchronous:
+                    receipt = self.wait_for_receipt(tx_hash)
+                    return receipt
+
+                return tx_hash
+            except (Web3RPCError,ContractLogicError) as e:
+                raise parse_error(e)
+
+    def _execute_pooled(self,
+                        contract_function: ContractFunction,
+                        sender_pool: SenderPool,
+                        synchronous: bool
+                        ) -> Union[BlockchainResponse, str]:
+        sender_pool.refresh_if_due(self.w3)
+        lane = sender_pool.acquire()
+        nonce = None
         try:
-            account = Account.from_key(private_key)
-            nonce = self.w3.eth.get_transaction_count(account.address)
-            tx_params = {
-                'from': account.address,
-                'chainId': self.w3.eth.chain_id,
+            # Estimate before reserving: a call that would revert then fails
+            # without leaving a nonce gap behind other in-flight writes.
+            with self._stage('chain_id'):
+                chain_id = self.w3.eth.chain_id
+            gas = self._estimate_gas(contract_function, lane.address, chain_id)
+            with self._stage('get_transaction_count'):
+                nonce = lane.reserve_nonce(self.w3)
+            tx = self._build_transaction(
+                contract_function, lane.address, nonce, chain_id, gas
+            )
+            with self._stage('sign'):
+                signed_tx = lane.account.sign_transaction(tx)
+            tx_hash = self._send_raw_transaction(
+                signed_tx.raw_transaction, lane.address, nonce, contract_function
+            )
+        except Exception as e:
+            sender_pool.release(lane)
+            if nonce is not None:
+                self._give_back_nonce(lane, nonce, chain_id)
+            if isinstance(e, (Web3RPCError, ContractLogicError)):
+                raise parse_error(e)
+            raise
+
+        sender_pool.track(lane, tx_hash)
+        if synchronous:
+            try:
+                return self.wait_for_receipt(tx_hash)
+            finally:
+                sender_pool.complete(tx_hash)
+
+        return tx_hash
+
+    def _give_back_nonce(self,
+                         lane: SenderLane,
+                         nonce: int,
+                         chain_id: int) -> None:
+        if lane.release_nonce(nonce):
+            return
+        # Later nonces are already out: fill this one with a zero-value
+        # self-transfer so the transactions queued behind it can be mined.
+        try:
+            filler = lane.account.sign_transaction({
+                'to': lane.address,
+                'value': 0,
+                'gas': 21_000,
                 'gasPrice': 0,
-                'nonce': nonce
-            }
-            gas_estimate = contract_function.estimate_gas(tx_params)
-            tx_params['gas'] = int(gas_estimate * 1.2)
-            tx = contract_function.build_transaction(tx_params)
-            signed_tx = self.w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+                'nonce': nonce,
+                'chainId': chain_id
+            })
+            self.w3.eth.send_raw_transaction(filler.raw_transaction)
+        except Web3RPCError:
+            # The node rejected the filler, so it already holds a
+            # transaction with this nonce.
+            pass
+        except Exception:
+            lane.reuse_nonce(nonce)
+
+    def _require_private_key(self, private_key: Any) -> None:
+        # Batch writes assign consecutive nonces from one account and sign
+        # them in one process pool, which a multi-account pool cannot share.
+        if isinstance(private_key, SenderPool):
+            raise ValueError(
+                "Batch writes need a single private key; send SenderPool writes one by one with execute"
+            )
+
+    def execute_many(self,
+                     contract_functions: List[ContractFunction],
+                     private_key: str,
+                     synchronous: bool = False,
+                     max_workers: Optional[int] = None,
+                     simulate: bool = False
+                     ) -> List[Union[BlockchainResponse, str, BlockchainError]]:
+        self._require_private_key(private_key)
+        if self.metrics is not None:
+            self.metrics.refresh(self._fetch_receipts)
+        with self._operation('execute_many'):
+            if simulate:
+                failures = self.simulate_many(
+                    contract_functions, Account.from_key(private_key).address
+                )
+                passing = [i for i, failure in enumerate(failures) if failure is None]
+                submitted = self.execute_many(
+                    [contract_functions[i] for i in passing],
+                    private_key,
+                    synchronous=synchronous,
+                    max_workers=max_workers
+                ) if passing else []
+                results: List[Any] = list(failures)
+                for i, result in zip(passing, submitted):
+                    results[i] = result
+                return results
+
+            try:
+                account = Account.from_key(private_key)
+                with self._stage('get_transaction_count'):
+                    first_nonce = self.w3.eth.get_transaction_count(account.address, 'pending')
+                with self._stage('chain_id'):
+                    chain_id = self.w3.eth.chain_id
+            except (Web3RPCError,ContractLogicError) as e:
+                raise parse_error(e)
+
+            # Every item gets its own result: a failed estimate skips that
+            # item without a nonce, and a rejected send stops the batch so
+            # later nonces are not left queued behind a gap.
+            results: List[Any] = [NotSentError() for _ in contract_functions]
+            transactions = []
+            estimates = self._estimate_gas_many(contract_functions, account.address)
+            for i, (contract_function, gas) in enumerate(zip(contract_functions, estimates)):
+                if isinstance(gas, BlockchainError):
+                    results[i] = gas
+                    continue
+                transactions.append((i, self._build_transaction(
+                    contract_function, account.address, first_nonce + len(transactions), chain_id, gas
+                )))
+
+            sent = []
+            # Signing is lazy and overlaps with sending, so the two are
+            # timed together.
+            with self._stage('sign_and_send'):
+                pipeline = self._signing_pipeline(private_key, max_workers)
+                raw_transactions = pipeline.sign(tx for _, tx in transactions)
+                for (i, tx), raw_transaction in zip(transactions, raw_transactions):
+                    try:
+                        results[i] = self._send_raw_transaction(
+                            raw_transaction, account.address, tx['nonce'], contract_functions[i]
+                        )
+                    except (Web3RPCError, ContractLogicError) as e:
+                        results[i] = parse_error(e)
+                        break
+                    except Exception as e:
+                        results[i] = BlockchainError(message=str(e))
+                        break
+                    sent.append(i)
 
             if synchronous:
-                receipt = self.wait_for_receipt(tx_hash)
-                return receipt
-            
-            return bytes_to_0xhex(tx_hash)
-        except (Web3RPCError,ContractLogicError) as e:
-            raise parse_error(e)
+                for i in sent:
+                    results[i] = self.wait_for_receipt(results[i])
+            return results
+
+    def _add_many(self,
+                  hashed_values: List[bytes],
+                  add_function: Any,
+                  read_function: Any,
+                  private_key: str,
+                  synchronous: bool,
+                  max_workers: Optional[int],
+                  simulate: bool = False
+                  ) -> List[Union[BlockchainResponse, str, BlockchainError]]:
+        self._require_private_key(private_key)
+        known = self._known_on_chain(hashed_values, read_function)
+        results: List[Any] = [None] * len(hashed_values)
+        to_submit = []
+        seen = set()
+        for i, hashed_value in enumerate(hashed_values):
+            if known[i] or hashed_value in seen:
+                results[i] = BlockchainError(message="Hash already exists")
+                continue
+            seen.add(hashed_value)
+            to_submit.append(i)
+
+        submitted = self.execute_many(
+            [add_function(hashed_values[i]) for i in to_submit],
+            private_key,
+            synchronous=synchronous,
+            max_workers=max_workers,
+            simulate=simulate
+        ) if to_submit else []
+        for i, result in zip(to_submit, submitted):
+            results[i] = result
+        return results
+
+    def _batch_request(self,
+                       requests: List[Tuple[str, List[Any]]],
+                       batch_size: int = 500) -> List[Dict[str, Any]]:
+        responses = []
+        for start in range(0, len(requests), batch_size):
+            chunk = requests[start:start + batch_size]
+            if self.instrumentation is not None:
+                for method, _ in chunk:
+                    self.instrumentation.count_rpc(method)
+            started = time.perf_counter()
+            try:
+                with self._stage('batch_request'):
+                    batch = self.w3.provider.make_batch_request(chunk)
+            except Web3RPCError as e:
+                if self.metrics is not None:
+                    self.metrics.observe_rpc('batch', time.perf_counter() - started, error=True)
+                raise parse_error(e)
+            if self.metrics is not None:
+                self.metrics.observe_rpc('batch', time.perf_counter() - started, error=isinstance(batch, dict))
+            if isinstance(batch, dict):
+                error = batch.get('error') or {}
+                raise BlockchainError(
+                    message=error.get('message', 'Batch request failed')
+                )
+            responses.extend(batch)
+        return responses
+
+    def _fetch_receipts(self, tx_hashes: List[str]) -> List[Optional[Dict[str, Any]]]:
+        return [
+            response.get('result')
+            for response in self._batch_request([
+                ('eth_getTransactionReceipt', [tx_hash]) for tx_hash in tx_hashes
+            ])
+        ]
+
+    def get_block_headers(self,
+                          block_numbers: List[int]) -> Dict[int, Dict[str, Any]]:
+        headers = {}
+        missing = []
+        for block_number in dict.fromkeys(block_numbers):
+            header = self.block_headers.get(block_number)
+            if header is None:
+                missing.append(block_number)
+            else:
+                headers[block_number] = header
+
+        responses = self._batch_request([
+            ('eth_getBlockByNumber', [hex(block_number), False])
+            for block_number in missing
+        ])
+        for block_number, response in zip(missing, responses):
+            block = response.get('result')
+            if block is None:
+                raise BlockchainError(
+                    message=f"Block {block_number} not found: {response.get('error')}"
+                )
+            # Raw batch results skip the middleware stack, so mirror what
+            # ExtraDataToPOAMiddleware does for single requests.
+            header = {
+                'number': block_number,
+                'hash': block['hash'].lower(),
+                'parentHash': block['parentHash'],
+                'timestamp': int(block['timestamp'], 16),
+                'proofOfAuthorityData': block.get('extraData'),
+            }
+            self.block_headers.put(block_number, header)
+            headers[block_number] = header
+        return headers
+
+    def _with_timestamps(self,
+                         events: List[EventData] | List[RawEventData]
+                         ) -> List[EventData] | List[RawEventData]:
+        headers = self.get_block_headers([int(e.block_number) for e in events])
+
+        # A header cached before a reorg has the right number but the wrong
+        # hash; drop it and read the block again.
+        stale = {
+            int(event.block_number) for event in events
+            if headers[int(event.block_number)]['hash'] != _block_hash(event)
+        }
+        if stale:
+            for block_number in stale:
+                self.block_headers.discard(block_number)
+            headers.update(self.get_block_headers(list(stale)))
+            for event in events:
+                if headers[int(event.block_number)]['hash'] != _block_hash(event):
+                    raise BlockchainError(
+                        message=f"Block {event.block_number} was reorganized; read the events again"
+                    )
+
+        enriched = []
+        for event in events:
+            timestamp = headers[int(event.block_number)]['timestamp']
+            if isinstance(event, RawEventData):
+                enriched.append(replace(event, timestamp=timestamp))
+            else:
+                event.timestamp = str(timestamp)
+                enriched.append(event)
+        return enriched
+
+    def recover_journal(self) -> Dict[str, str]:
+        if self.journal is None:
+            raise BlockchainError(message="No journal configured")
+
+        pending = self.journal.pending()
+        accounts = list(dict.fromkeys(entry.account for entry in pending))
+        # One batch: each entry's receipt and transaction, then each
+        # account's mined nonce.
+        responses = self._batch_request(
+            [('eth_getTransactionReceipt', [entry.tx_hash]) for entry in pending]
+            + [('eth_getTransactionByHash', [entry.tx_hash]) for entry in pending]
+            + [('eth_getTransactionCount', [account, 'latest']) for account in accounts]
+        )
+        receipts = responses[:len(pending)]
+        transactions = responses[len(pending):2 * len(pending)]
+        mined_nonces = {
+            account: int(response['result'], 16)
+            for account, response in zip(accounts, responses[2 * len(pending):])
+            if response.get('result') is not None
+        }
+
+        statuses = {}
+        for entry, receipt_response, transaction_response in zip(pending, receipts, transactions):
+            receipt = receipt_response.get('result')
+            if receipt is not None:
+                status = CONFIRMED if int(receipt['status'], 16) == 1 else FAILED
+            elif transaction_response.get('result') is not None:
+                # Still known to the node, so it may yet be mined.
+                statuses[entry.tx_hash] = entry.status
+                continue
+            elif 'result' in transaction_response or mined_nonces.get(entry.account, 0) > entry.nonce:
+                # The node has no record of it: it was never accepted (a
+                # crash before sending) or was dropped, or its nonce went to
+                # another transaction. Either way it can no longer be mined.
+                status = DROPPED
+            else:
+                statuses[entry.tx_hash] = entry.status
+                continue
+            self.journal.update(entry.tx_hash, status)
+            statuses[entry.tx_hash] = status
+        self.journal.compact()
+        return statuses
 
     def get_events(
         self,
         from_block: int = 0,
         to_block: Union[int, str] = 'latest',
         event_name: Optional[str] = None,
-        argument_filters: Optional[Dict[str, Any]] = None
-    ) -> List[EventData]:
+        argument_filters: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
+        with_timestamps: bool = False
+    ) -> List[EventData] | List[RawEventData]:
 
         if argument_filters is not None and event_name is None:
             raise BlockchainError(
                 message="argument_filters requires a specific event_name"
             )
-        
-        try:
-            if event_name is not None:
-                event_names_in_abi = {
-                    entry['name']
-                    for entry in self.contract.abi
-                    if entry['type'] == 'event'
-                }
-                if event_name not in event_names_in_abi:
-                    raise BlockchainError(
-                        message=f"Event '{event_name}' not found in contract ABI"
-                    )
-                event_processor = getattr(self.contract.events, event_name)
-                logs = list(event_processor.get_logs(
-                    argument_filters=hex0x_to_bytes(argument_filters),
+
+        with self._operation('get_events'):
+            try:
+                with self._stage('get_logs'):
+                    logs = self._get_logs(from_block, to_block, event_name, argument_filters)
+            except BlockchainError:
+                raise
+            except Web3RPCError as e:
+                raise parse_error(e)
+
+            parse = parse_raw_event_data if raw else parse_event_data
+            with self._stage('parse_events'):
+                events = [parse(log) for log in logs]
+            if with_timestamps:
+                with self._stage('timestamps'):
+                    events = self._with_timestamps(events)
+            return events
+
+    def _get_logs(self,
+                  from_block: int,
+                  to_block: Union[int, str],
+                  event_name: Optional[str],
+                  argument_filters: Optional[Dict[str, Any]]) -> List[Any]:
+        if event_name is not None:
+            event_names_in_abi = {
+                entry['name']
+                for entry in self.contract.abi
+                if entry['type'] == 'event'
+            }
+            if event_name not in event_names_in_abi:
+                raise BlockchainError(
+                    message=f"Event '{event_name}' not found in contract ABI"
+                )
+            event_processor = getattr(self.contract.events, event_name)
+            return list(event_processor.get_logs(
+                argument_filters=hex0x_to_bytes(argument_filters),
+                from_block=from_block,
+                to_block=to_block
+            ))
+
+        logs = []
+        for abi_entry in self.contract.abi:
+            if abi_entry['type'] == 'event':
+                event_processor = getattr(self.contract.events, abi_entry['name'])
+                logs.extend(event_processor.get_logs(
                     from_block=from_block,
                     to_block=to_block
                 ))
-            else:
-                logs = []
-                for abi_entry in self.contract.abi:
-                    if abi_entry['type'] == 'event':
-                        event_processor = getattr(self.contract.events, abi_entry['name'])
-                        logs.extend(event_processor.get_logs(
-                            from_block=from_block,
-                            to_block=to_block
-                        ))
-                logs.sort(key=lambda log: (
-                    log.blockNumber,
-                    log.transactionIndex,
-                    log.logIndex
-                ))
+        logs.sort(key=lambda log: (
+            log.blockNumber,
+            log.transactionIndex,
+            log.logIndex
+        ))
+        return logs
 
-        except BlockchainError:
-            raise
-        except Web3RPCError as e:
-            raise parse_error(e)  
-            
-        return [parse_event_data(log) for log in logs]
+    def iter_event_batches(
+        self,
+        from_block: int = 0,
+        to_block: Union[int, str] = 'latest',
+        event_name: Optional[str] = None,
+        argument_filters: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
+        with_timestamps: bool = False,
+        block_chunk_size: int = 5000
+    ) -> Iterator[Tuple[int, int, List[EventData] | List[RawEventData]]]:
+        if not isinstance(to_block, int):
+            try:
+                to_block = self.w3.eth.get_block(to_block)['number']
+            except Web3RPCError as e:
+                raise parse_error(e)
+
+        for start in range(from_block, to_block + 1, block_chunk_size):
+            end = min(start + block_chunk_size - 1, to_block)
+            events = self.get_events(
+                from_block=start,
+                to_block=end,
+                event_name=event_name,
+                argument_filters=argument_filters,
+                raw=raw,
+                with_timestamps=with_timestamps
+            )
+            if self.metrics is not None:
+                self.metrics.scan_progress(end, to_block, len(events))
+            yield start, end, events
+
+    def iter_events(
+        self,
+        from_block: int = 0,
+        to_block: Union[int, str] = 'latest',
+        event_name: Optional[str] = None,
+        argument_filters: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
+        with_timestamps: bool = False,
+        block_chunk_size: int = 5000
+    ) -> Iterator[EventData | RawEventData]:
+        for _, _, events in self.iter_event_batches(
+            from_block, to_block, event_name, argument_filters, raw,
+            with_timestamps, block_chunk_size
+        ):
+            yield from events
@@ -1,9 +1,56 @@
-from typing import Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from web3 import Web3
 
 from .contract import Contract
+from .hashing import hash_file, hash_json_file
 from .connection import Connection
-from .models import BlockchainValue, BlockchainResponse, BlockchainError
+from .models import (
+    BlockchainValue,
+    BlockchainResponse,
+    BlockchainError,
+    DagTraversal,
+    ImportItem,
+    NotSentError,
+)
+from .sender_pool import SenderPool
+from .utils import bytes_to_0xhex, digest_to_bytes
+
+if TYPE_CHECKING:
+    from .link_validator import LinkValidator
+
+
+def _edge_levels(edges: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+    # Kahn's algorithm over the edge set; an edge's level is the
+    # topological depth of its source node.
+    outgoing: Dict[str, List[str]] = {}
+    in_degree: Dict[str, int] = {}
+    for from_hash, to_hash in edges:
+        outgoing.setdefault(from_hash, []).append(to_hash)
+        in_degree.setdefault(from_hash, 0)
+        in_degree[to_hash] = in_degree.get(to_hash, 0) + 1
+
+    depth = {node: 0 for node, degree in in_degree.items() if degree == 0}
+    frontier = list(depth)
+    while frontier:
+        next_frontier = []
+        for node in frontier:
+            for neighbour in outgoing.get(node, ()):
+                depth[neighbour] = max(depth.get(neighbour, 0), depth[node] + 1)
+                in_degree[neighbour] -= 1
+                if in_degree[neighbour] == 0:
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    if any(degree > 0 for degree in in_degree.values()):
+        raise ValueError("Edges contain a cycle")
+
+    levels: List[List[Tuple[str, str]]] = []
+    for from_hash, to_hash in edges:
+        level = depth[from_hash]
+        while len(levels) <= level:
+            levels.append([])
+        levels[level].append((from_hash, to_hash))
+    return [level for level in levels if level]
 
 
 class DagHashManager(Contract):
@@ -16,14 +63,64 @@ class DagHashManager(Contract):
             contract_address=contract_address,
             contract_abi=contract_abi
         )
-    
+        self.link_validator: Optional['LinkValidator'] = None
+
+    def with_link_validator(self, link_validator: 'LinkValidator') -> 'DagHashManager':
+        self.link_validator = link_validator
+        return self
+
     def add_hash(self,
                  value: str,
-                 private_key: str,
+                 private_key: str | SenderPool,
                  synchronous: bool = False) -> BlockchainResponse | BlockchainError:
-        hashed_value = Web3.keccak(text=value)
+        return self.add_hash_digest(Web3.keccak(text=value), private_key, synchronous)
+
+    def add_hash_digest(self,
+                        digest: bytes | str,
+                        private_key: str | SenderPool,
+                        synchronous: bool = False) -> BlockchainResponse | BlockchainError:
+        hashed_value = digest_to_bytes(digest)
+        self._raise_if_known(hashed_value, self.contract.functions.readHash)
         contract_function = self.contract.functions.addHash(hashed_value)
         return self.execute(contract_function, private_key, synchronous)
+
+    def add_hash_file(self,
+                      path: str,
+                      private_key: str | SenderPool,
+                      synchronous: bool = False,
+                      json_document: bool = False) -> BlockchainResponse | BlockchainError:
+        digest = hash_json_file(path) if json_document else hash_file(path)
+        return self.add_hash_digest(digest, private_key, synchronous)
+
+    def add_hash_many(self,
+                      values: List[str],
+                      private_key: str,
+                      synchronous: bool = False,
+                      max_workers: Optional[int] = None,
+                      simulate: bool = False) -> List[BlockchainResponse | str | BlockchainError]:
+        return self.add_hash_digest_many(
+            [Web3.keccak(text=value) for value in values],
+            private_key,
+            synchronous,
+            max_workers,
+            simulate
+        )
+
+    def add_hash_digest_many(self,
+                             digests: List[bytes | str],
+                             private_key: str,
+                             synchronous: bool = False,
+                             max_workers: Optional[int] = None,
+                             simulate: bool = False) -> List[BlockchainResponse | str | BlockchainError]:
+        return self._add_many(
+            [digest_to_bytes(digest) for digest in digests],
+            self.contract.functions.addHash,
+            self.contract.functions.readHash,
+            private_key,
+            synchronous,
+            max_workers,
+            simulate
+        )
     
     def read_hash(self,
                   hashed_value: str) -> BlockchainValue | BlockchainError:
@@ -33,7 +130,7 @@ class DagHashManager(Contract):
     
     def deprecate_hash(self,
                        hashed_value: str,
-                       private_key: str,
+                       private_key: str | SenderPool,
                        synchronous: bool = False) -> BlockchainResponse | BlockchainError:
         hashed_value_bytes = Web3.to_bytes(hexstr=hashed_value)
         contract_function = self.contract.functions.deprecateHash(hashed_value_bytes)
@@ -41,7 +138,7 @@ class DagHashManager(Contract):
     
     def delete_hash(self,
                     hashed_value: str,
-                    private_key: str,
+                    private_key: str | SenderPool,
                     synchronous: bool = False) -> BlockchainResponse | BlockchainError:
         hashed_value_bytes = Web3.to_bytes(hexstr=hashed_value)
         contract_function = self.contract.functions.deleteHash(hashed_value_bytes)
@@ -50,12 +147,23 @@ class DagHashManager(Contract):
     def add_outgoing_link(self,
                           from_hash: str,
                           to_hash: str,
-                          private_key: str,
+                          private_key: str | SenderPool,
                           synchronous: bool = False) -> BlockchainResponse | BlockchainError:
+        if self.link_validator is not None:
+            self.link_validator.check(from_hash, to_hash)
         from_hash_bytes = Web3.to_bytes(hexstr=from_hash)
         to_hash_bytes = Web3.to_bytes(hexstr=to_hash)
         contract_function = self.contract.functions.addOutgoingLink(from_hash_bytes, to_hash_bytes)
-        return self.execute(contract_function, private_key, synchronous)
+        result = self.execute(contract_function, private_key, synchronous)
+        # Links still in flight count too, so a later check cannot race a
+        # cycle into the same nonce queue.
+        if self.link_validator is not None:
+            if isinstance(result, BlockchainResponse):
+                if result.status == '1':
+                    self.link_validator.record(from_hash, to_hash, result.transaction.transaction_hash)
+            elif not isinstance(result, BlockchainError):
+                self.link_validator.record(from_hash, to_hash, result)
+        return result
 
     def read_outgoing_links(self,
                             hashed_value: str) -> BlockchainValue | BlockchainError:
@@ -66,9 +174,172 @@ class DagHashManager(Contract):
     def delete_outgoing_link(self,
                              from_hash: str,
                              to_hash: str,
-                             private_key: str,
+                             private_key: str | SenderPool,
                              synchronous: bool = False) -> BlockchainResponse | BlockchainError:
         from_hash_bytes = Web3.to_bytes(hexstr=from_hash)
         to_hash_bytes = Web3.to_bytes(hexstr=to_hash)
         contract_function = self.contract.functions.deleteOutgoingLink(from_hash_bytes, to_hash_bytes)
         return self.execute(contract_function, private_key, synchronous)
+
+    def traverse(self,
+                 root: str,
+                 max_depth: Optional[int] = None,
+                 block_identifier: Optional[int] = None) -> DagTraversal:
+        # The contract only stores outgoing links; reverse lookups go
+        # through DagMirror.parents / ancestors.
+        read_links = self.contract.functions.readOutgoingLinks
+
+        # Every level is read at the same block so the result is a
+        # consistent snapshot and can be cached by block number.
+        if block_identifier is None:
+            block_identifier = self.w3.eth.block_number
+
+        root = root.lower()
+        levels = [[root]]
+        links = {}
+        errors = {}
+        visited = {root}
+        frontier = [root]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            results = self.call_many(
+                [read_links(Web3.to_bytes(hexstr=node)) for node in frontier],
+                block_identifier=block_identifier
+            )
+            next_frontier = []
+            for node, result in zip(frontier, results):
+                if isinstance(result, BlockchainError):
+                    if node == root:
+                        raise result
+                    # Not a leaf: the read failed, so its links are unknown.
+                    errors[node] = str(result)
+                    continue
+                links[node] = [neighbour.lower() for neighbour in result]
+                for neighbour in links[node]:
+                    if neighbour not in visited:
+                        visited.add(neighbour)
+                        next_frontier.append(neighbour)
+            if next_frontier:
+                levels.append(next_frontier)
+            frontier = next_frontier
+            depth += 1
+
+        return DagTraversal(
+            root=root,
+            block_number=block_identifier,
+            levels=levels,
+            links=links,
+            errors=errors
+        )
+
+    def _submit_level(self,
+                      kind: str,
+                      keys: List[str],
+                      contract_functions: List[Any],
+                      private_key: str,
+                      max_workers: Optional[int]) -> List[ImportItem]:
+        try:
+            results = self.execute_many(
+                contract_functions,
+                private_key,
+                synchronous=True,
+                max_workers=max_workers,
+                simulate=True
+            )
+        except BlockchainError:
+            # The batch failed before anything was sent.
+            results = [NotSentError() for _ in contract_functions]
+
+        # Only items that never went out are retried, one by one, so a
+        # rejected send cannot take the rest of the level down with it.
+        for i, result in enumerate(results):
+            if isinstance(result, NotSentError):
+                try:
+                    results[i] = self.execute(contract_functions[i], private_key, synchronous=True)
+                except BlockchainError as e:
+                    results[i] = e
+
+        items = []
+        for key, result in zip(keys, results):
+            if isinstance(result, BlockchainResponse) and result.status == '1':
+                items.append(ImportItem(
+                    kind=kind, key=key, status='added',
+                    transaction_hash=result.transaction.transaction_hash
+                ))
+            elif isinstance(result, BlockchainResponse):
+                items.append(ImportItem(
+                    kind=kind, key=key, status='failed',
+                    transaction_hash=result.transaction.transaction_hash,
+                    error='Transaction reverted'
+                ))
+            else:
+                items.append(ImportItem(kind=kind, key=key, status='failed', error=str(result)))
+        return items
+
+    def import_dag(self,
+                   nodes: List[bytes | str],
+                   edges: List[Tuple[bytes | str, bytes | str]],
+                   private_key: str,
+                   max_workers: Optional[int] = None) -> List[ImportItem]:
+        self._require_private_key(private_key)
+        node_hashes = list(dict.fromkeys(
+            bytes_to_0xhex(digest_to_bytes(node)) for node in nodes
+        ))
+        edge_hashes = list(dict.fromkeys(
+            (bytes_to_0xhex(digest_to_bytes(f)), bytes_to_0xhex(digest_to_bytes(t)))
+            for f, t in edges
+        ))
+        levels = _edge_levels(edge_hashes)
+
+        # Resuming is stateless: whatever is already on chain is skipped.
+        read_hash = self.contract.functions.readHash
+        existing = self.call_many([read_hash(Web3.to_bytes(hexstr=h)) for h in node_hashes])
+        report = []
+        to_add = []
+        for node, result in zip(node_hashes, existing):
+            if isinstance(result, BlockchainError):
+                to_add.append(node)
+            else:
+                report.append(ImportItem(kind='node', key=node, status='exists'))
+
+        if to_add:
+            report.extend(self._submit_level(
+                'node',
+                to_add,
+                [self.contract.functions.addHash(Web3.to_bytes(hexstr=h)) for h in to_add],
+                private_key,
+                max_workers
+            ))
+
+        sources = list(dict.fromkeys(f for f, _ in edge_hashes))
+        read_links = self.contract.functions.readOutgoingLinks
+        current_links = {
+            source: set() if isinstance(result, BlockchainError) else {h.lower() for h in result}
+            for source, result in zip(
+                sources,
+                self.call_many([read_links(Web3.to_bytes(hexstr=h)) for h in sources])
+            )
+        }
+
+        for level in levels:
+            pending = []
+            for from_hash, to_hash in level:
+                if to_hash in current_links[from_hash]:
+                    report.append(ImportItem(kind='edge', key=f"{from_hash}->{to_hash}", status='exists'))
+                else:
+                    pending.append((from_hash, to_hash))
+            if not pending:
+                continue
+            report.extend(self._submit_level(
+                'edge',
+                [f"{f}->{t}" for f, t in pending],
+                [
+                    self.contract.functions.addOutgoingLink(
+                        Web3.to_bytes(hexstr=f), Web3.to_bytes(hexstr=t)
+                    )
+                    for f, t in pending
+                ],
+                private_key,
+                max_workers
+            ))
+        return report
@@ -0,0 +1,143 @@
+import json
+import os
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .dag_hash_manager import DagHashManager
+from .models import EventData
+
+
+HASH_ADDED = 'HashAdded'
+HASH_DEPRECATED = 'HashDeprecated'
+HASH_DELETED = 'HashDeleted'
+LINK_ADDED = 'OutgoingLinkAdded'
+LINK_DELETED = 'OutgoingLinkDeleted'
+
+ACTIVE = 'active'
+DEPRECATED = 'deprecated'
+
+
+class DagMirror:
+
+    def __init__(self, manager: DagHashManager):
+        self.manager = manager
+        self.nodes: Dict[str, str] = {}
+        self.outgoing: Dict[str, Set[str]] = {}
+        self.incoming: Dict[str, Set[str]] = {}
+        self.last_block = -1
+
+    def apply(self, event: EventData) -> None:
+        args = event.event_args
+        if event.event_name in (LINK_ADDED, LINK_DELETED):
+            from_hash = args['fromHash'].lower()
+            to_hash = args['toHash'].lower()
+            if event.event_name == LINK_ADDED:
+                self.outgoing.setdefault(from_hash, set()).add(to_hash)
+                self.incoming.setdefault(to_hash, set()).add(from_hash)
+            else:
+                self.outgoing.get(from_hash, set()).discard(to_hash)
+                self.incoming.get(to_hash, set()).discard(from_hash)
+            return
+
+        hashed_value = args.get('hashValue')
+        if not isinstance(hashed_value, str):
+            return
+        hashed_value = hashed_value.lower()
+        if event.event_name == HASH_ADDED:
+            self.nodes[hashed_value] = ACTIVE
+        elif event.event_name == HASH_DEPRECATED:
+            self.nodes[hashed_value] = DEPRECATED
+        elif event.event_name == HASH_DELETED:
+            self.nodes.pop(hashed_value, None)
+
+    def sync(self,
+             to_block: Union[int, str] = 'latest',
+             block_chunk_size: int = 5000) -> int:
+        applied = 0
+        for _, end, events in self.manager.iter_event_batches(
+            from_block=self.last_block + 1,
+            to_block=to_block,
+            block_chunk_size=block_chunk_size
+        ):
+            for event in events:
+                self.apply(event)
+            applied += len(events)
+            self.last_block = end
+        return applied
+
+    def children(self, hashed_value: str) -> Set[str]:
+        return set(self.outgoing.get(hashed_value.lower(), ()))
+
+    def parents(self, hashed_value: str) -> Set[str]:
+        return set(self.incoming.get(hashed_value.lower(), ()))
+
+    def _walk(self,
+              start: str,
+              adjacency: Dict[str, Set[str]],
+              max_depth: Optional[int]) -> Set[str]:
+        seen = set()
+        frontier = [start.lower()]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier = []
+            for node in frontier:
+                for neighbour in adjacency.get(node, ()):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+            depth += 1
+        return seen
+
+    def descendants(self, hashed_value: str, max_depth: Optional[int] = None) -> Set[str]:
+        return self._walk(hashed_value, self.outgoing, max_depth)
+
+    def ancestors(self, hashed_value: str, max_depth: Optional[int] = None) -> Set[str]:
+        return self._walk(hashed_value, self.incoming, max_depth)
+
+    def path(self, from_hash: str, to_hash: str) -> Optional[List[str]]:
+        source = from_hash.lower()
+        target = to_hash.lower()
+        previous: Dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                return path[::-1]
+            for neighbour in self.outgoing.get(node, ()):
+                if neighbour not in previous:
+                    previous[neighbour] = node
+                    queue.append(neighbour)
+        return None
+
+    def edges(self) -> Iterable[Tuple[str, str]]:
+        for from_hash, targets in self.outgoing.items():
+            for to_hash in targets:
+                yield from_hash, to_hash
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'last_block': self.last_block,
+                'nodes': self.nodes,
+                'edges': sorted(self.edges()),
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, manager: DagHashManager) -> 'DagMirror':
+        mirror = cls(manager)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        mirror.last_block = data['last_block']
+        mirror.nodes = data['nodes']
+        for from_hash, to_hash in data['edges']:
+            mirror.outgoing.setdefault(from_hash, set()).add(to_hash)
+            mirror.incoming.setdefault(to_hash, set()).add(from_hash)
+        return mirror
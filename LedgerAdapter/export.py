@@ -0,0 +1,154 @@
+import json
+import os
+
+from typing import Any, Dict, List, Optional, Union
+
+from .contract import Contract
+from .models import RawEventData
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+STATE_FILE = '_export_state.json'
+
+
+def _arrow_type(abi_type: str) -> 'pa.DataType':
+    if abi_type.endswith(']'):
+        return pa.list_(_arrow_type(abi_type[:abi_type.rindex('[')]))
+    if abi_type == 'bool':
+        return pa.bool_()
+    if abi_type in ('address', 'string'):
+        return pa.string()
+    if abi_type == 'bytes':
+        return pa.binary()
+    if abi_type.startswith('bytes'):
+        return pa.binary(int(abi_type[5:]))
+    if abi_type.startswith(('uint', 'int')):
+        signed = abi_type.startswith('int')
+        bits = int(abi_type[3 if signed else 4:] or 256)
+        if bits <= 64:
+            return pa.int64() if signed else pa.uint64()
+        # Wider integers do not fit an Arrow integer; keep them exact as text.
+        return pa.string()
+    return pa.string()
+
+
+def _arrow_value(value: Any, arrow_type: 'pa.DataType') -> Any:
+    if value is None:
+        return None
+    if pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return str(value)
+    if pa.types.is_list(arrow_type):
+        return [_arrow_value(v, arrow_type.value_type) for v in value]
+    if isinstance(value, bytes):
+        return bytes(value)
+    return value
+
+
+class ParquetEventExporter:
+
+    def __init__(self,
+                 contract: Contract,
+                 directory: str,
+                 blocks_per_file: int = 10_000):
+        if pa is None:
+            raise ImportError(
+                "ParquetEventExporter requires pyarrow "
+                "(pip install 'LedgerAdapter[arrow]')"
+            )
+        self.contract = contract
+        self.directory = directory
+        self.blocks_per_file = blocks_per_file
+        self.schemas: Dict[str, pa.Schema] = {
+            entry['name']: self._schema(entry)
+            for entry in contract.contract.abi
+            if entry['type'] == 'event'
+        }
+
+    @staticmethod
+    def _schema(event_abi: Dict[str, Any]) -> 'pa.Schema':
+        return pa.schema(
+            [
+                ('block_number', pa.int64()),
+                ('log_index', pa.int32()),
+                ('event_name', pa.string()),
+                ('transaction_hash', pa.binary(32)),
+                ('block_hash', pa.binary(32)),
+                ('address', pa.string()),
+            ] + [
+                (f"arg_{entry['name']}", _arrow_type(entry['type']))
+                for entry in event_abi['inputs']
+            ]
+        )
+
+    @property
+    def last_exported_block(self) -> Optional[int]:
+        path = os.path.join(self.directory, STATE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['last_block']
+
+    def _save_state(self, last_block: int) -> None:
+        path = os.path.join(self.directory, STATE_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'last_block': last_block}, f)
+        os.replace(tmp_path, path)
+
+    def to_record_batches(self,
+                          events: List[RawEventData]) -> Dict[str, 'pa.RecordBatch']:
+        grouped: Dict[str, List[RawEventData]] = {}
+        for event in events:
+            grouped.setdefault(event.event_name, []).append(event)
+
+        batches = {}
+        for event_name, group in grouped.items():
+            schema = self.schemas[event_name]
+            columns = [
+                pa.array([e.block_number for e in group], pa.int64()),
+                pa.array([e.log_index for e in group], pa.int32()),
+                pa.array([e.event_name for e in group], pa.string()),
+                pa.array([bytes(e.transaction_hash) for e in group], pa.binary(32)),
+                pa.array([bytes(e.block_hash) for e in group], pa.binary(32)),
+                pa.array([str(e.address) for e in group], pa.string()),
+            ]
+            for field in list(schema)[len(columns):]:
+                name = field.name[len('arg_'):]
+                columns.append(pa.array(
+                    [_arrow_value(e.event_args.get(name), field.type) for e in group],
+                    field.type
+                ))
+            batches[event_name] = pa.RecordBatch.from_arrays(columns, schema=schema)
+        return batches
+
+    def export(self,
+               from_block: Optional[int] = None,
+               to_block: Union[int, str] = 'latest') -> int:
+        if from_block is None:
+            last_block = self.last_exported_block
+            from_block = 0 if last_block is None else last_block + 1
+
+        os.makedirs(self.directory, exist_ok=True)
+        written = 0
+        for start, end, events in self.contract.iter_event_batches(
+            from_block=from_block,
+            to_block=to_block,
+            raw=True,
+            block_chunk_size=self.blocks_per_file
+        ):
+            for event_name, batch in self.to_record_batches(events).items():
+                partition = os.path.join(self.directory, f"event_name={event_name}")
+                os.makedirs(partition, exist_ok=True)
+                pq.write_table(
+                    pa.Table.from_batches([batch]),
+                    os.path.join(partition, f"blocks_{start:012d}_{end:012d}.parquet")
+                )
+                written += batch.num_rows
+            self._save_state(end)
+        return written
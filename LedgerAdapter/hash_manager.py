@@ -1,9 +1,12 @@
-from typing import Dict
+from typing import Dict, List, Optional
 from web3 import Web3
 
 from .contract import Contract
+from .hashing import hash_file, hash_json_file
 from .connection import Connection
 from .models import BlockchainValue, BlockchainResponse, BlockchainError
+from .sender_pool import SenderPool
+from .utils import digest_to_bytes
 
 
 class HashManager(Contract):
@@ -21,12 +24,57 @@ class HashManager(Contract):
     
     def add(self, 
             value: str,
-            private_key: str,
+            private_key: str | SenderPool,
             synchronous: bool = False) -> BlockchainResponse | BlockchainError:
-        hashed_value = Web3.keccak(text=value)
+        return self.add_digest(Web3.keccak(text=value), private_key, synchronous)
+
+    def add_digest(self,
+                   digest: bytes | str,
+                   private_key: str | SenderPool,
+                   synchronous: bool = False) -> BlockchainResponse | BlockchainError:
+        hashed_value = digest_to_bytes(digest)
+        self._raise_if_known(hashed_value, self.contract.functions.read)
         contract_function = self.contract.functions.add(hashed_value)
         return self.execute(contract_function, private_key, synchronous)
 
+    def add_file(self,
+                 path: str,
+                 private_key: str | SenderPool,
+                 synchronous: bool = False,
+                 json_document: bool = False) -> BlockchainResponse | BlockchainError:
+        digest = hash_json_file(path) if json_document else hash_file(path)
+        return self.add_digest(digest, private_key, synchronous)
+
+    def add_many(self,
+                 values: List[str],
+                 private_key: str,
+                 synchronous: bool = False,
+                 max_workers: Optional[int] = None,
+                 simulate: bool = False) -> List[BlockchainResponse | str | BlockchainError]:
+        return self.add_digest_many(
+            [Web3.keccak(text=value) for value in values],
+            private_key,
+            synchronous,
+            max_workers,
+            simulate
+        )
+
+    def add_digest_many(self,
+                        digests: List[bytes | str],
+                        private_key: str,
+                        synchronous: bool = False,
+                        max_workers: Optional[int] = None,
+                        simulate: bool = False) -> List[BlockchainResponse | str | BlockchainError]:
+        return self._add_many(
+            [digest_to_bytes(digest) for digest in digests],
+            self.contract.functions.add,
+            self.contract.functions.read,
+            private_key,
+            synchronous,
+            max_workers,
+            simulate
+        )
+
     def read(self,
              hashed_value: str) -> BlockchainValue | BlockchainError:
         hashed_value_bytes = Web3.to_bytes(hexstr=hashed_value)
@@ -35,7 +83,7 @@ class HashManager(Contract):
     
     def deprecate(self,
                   hashed_value: str,
-                  private_key: str,
+                  private_key: str | SenderPool,
                   synchronous: bool = False) -> BlockchainResponse | BlockchainError:
         hashed_value_bytes = Web3.to_bytes(hexstr=hashed_value)
         contract_function = self.contract.functions.deprecate(hashed_value_bytes)
@@ -0,0 +1,108 @@
+import json
+import mmap
+import os
+
+import jcs
+
+from collections import deque
+from Crypto.Hash import keccak
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+# Streaming relies on jcs's private encoder. If it moves or stops matching
+# jcs.canonicalize, hashing falls back to building the canonical string.
+try:
+    from jcs._jcs import JSONEncoder
+    _PROBE = {"b": [1.5, 1e21, "\u00e9\n"], "a": None, "\u20ac": True}
+    if ''.join(JSONEncoder(sort_keys=True).iterencode(_PROBE)).encode('utf-8') != jcs.canonicalize(_PROBE):
+        JSONEncoder = None
+except (ImportError, AttributeError, TypeError):
+    JSONEncoder = None
+
+
+# Canonical chunks are tiny (a key, a separator, a number); hashing them one
+# by one costs more in call overhead than in keccak, so they are buffered.
+_BUFFER_SIZE = 1 << 16
+
+_FILE_CHUNK_SIZE = 1 << 20
+
+
+def hash_canonical_json(json_data: Any) -> str:
+    hasher = keccak.new(digest_bits=256)
+    if JSONEncoder is None:
+        hasher.update(jcs.canonicalize(json_data))
+        return '0x' + hasher.hexdigest()
+    buffer = []
+    buffered = 0
+    for chunk in JSONEncoder(sort_keys=True).iterencode(json_data):
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= _BUFFER_SIZE:
+            hasher.update(''.join(buffer).encode('utf-8'))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        hasher.update(''.join(buffer).encode('utf-8'))
+    return '0x' + hasher.hexdigest()
+
+
+def _hash_chunk(documents: List[Any], parse: bool) -> List[str]:
+    if parse:
+        documents = [json.loads(document) for document in documents]
+    return [hash_canonical_json(document) for document in documents]
+
+
+def _read_ndjson(path: Union[str, os.PathLike]) -> Iterator[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def canonicalize_and_hash_many(
+        source: Union[Iterable[Any], str, os.PathLike],
+        max_workers: int | None = None,
+        chunksize: int = 256
+        ) -> Iterator[Tuple[int, str]]:
+    # A path is read as NDJSON and parsed in the workers, so the parent only
+    # ships raw lines.
+    from concurrent.futures import ProcessPoolExecutor
+
+    parse = isinstance(source, (str, os.PathLike))
+    documents = iter(_read_ndjson(source) if parse else source)
+    workers = max_workers or os.cpu_count() or 1
+
+    # Keep a bounded window of chunks in flight: results stay in input order
+    # and a million-line input is never fully buffered.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = deque()
+        index = 0
+        while True:
+            chunk = list(islice(documents, chunksize))
+            if chunk:
+                window.append(executor.submit(_hash_chunk, chunk, parse))
+            if window and (not chunk or len(window) >= 2 * workers):
+                for digest in window.popleft().result():
+                    yield index, digest
+                    index += 1
+            if not chunk and not window:
+                return
+
+
+def hash_file(path: Union[str, os.PathLike]) -> str:
+    hasher = keccak.new(digest_bits=256)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        # mmap refuses empty files; their digest is keccak of no input.
+        if size == 0:
+            return '0x' + hasher.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for offset in range(0, size, _FILE_CHUNK_SIZE):
+                    hasher.update(view[offset:offset + _FILE_CHUNK_SIZE])
+    return '0x' + hasher.hexdigest()
+
+
+def hash_json_file(path: Union[str, os.PathLike]) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return hash_canonical_json(json.load(f))
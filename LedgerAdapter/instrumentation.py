@@ -0,0 +1,177 @@
+import logging
+import math
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from web3.middleware import Web3Middleware
+
+
+TOTAL = 'total'
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile.
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class Trace:
+    __slots__ = ('operation', 'stages', 'rpc_calls', 'duration', 'error')
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.stages: Dict[str, float] = {}
+        self.rpc_calls: Dict[str, int] = {}
+        self.duration = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def rpc_count(self) -> int:
+        return sum(self.rpc_calls.values())
+
+
+class Instrumentation:
+    # One trace per top-level operation and thread; operations started
+    # while a trace is active (e.g. the call_many inside a simulated
+    # execute_many) are folded into it.
+
+    def __init__(self, *hooks: Callable[[Trace], None]):
+        self.hooks = list(hooks)
+        self._local = threading.local()
+
+    def add_hook(self, hook: Callable[[Trace], None]) -> 'Instrumentation':
+        self.hooks.append(hook)
+        return self
+
+    @property
+    def current(self) -> Optional[Trace]:
+        return getattr(self._local, 'trace', None)
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[Trace]:
+        if self.current is not None:
+            yield self.current
+            return
+
+        trace = Trace(name)
+        self._local.trace = trace
+        start = time.perf_counter()
+        try:
+            yield trace
+        except BaseException as e:
+            trace.error = type(e).__name__
+            raise
+        finally:
+            trace.duration = time.perf_counter() - start
+            self._local.trace = None
+            for hook in self.hooks:
+                hook(trace)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        trace = self.current
+        if trace is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace.stages[name] = trace.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count_rpc(self, method: str, n: int = 1) -> None:
+        trace = self.current
+        if trace is not None:
+            trace.rpc_calls[method] = trace.rpc_calls.get(method, 0) + n
+
+
+class RpcCounterMiddleware(Web3Middleware):
+
+    def __init__(self, w3: Any, instrumentation: Instrumentation):
+        super().__init__(w3)
+        self.instrumentation = instrumentation
+
+    def wrap_make_request(self, make_request: Callable) -> Callable:
+        def middleware(method: str, params: Any) -> Any:
+            self.instrumentation.count_rpc(method)
+            return make_request(method, params)
+        return middleware
+
+
+def log_hook(logger: Optional[logging.Logger] = None,
+             level: int = logging.DEBUG) -> Callable[[Trace], None]:
+    logger = logger or logging.getLogger('LedgerAdapter')
+
+    def hook(trace: Trace) -> None:
+        if not logger.isEnabledFor(level):
+            return
+        stages = ' '.join(f"{name}={seconds * 1000:.2f}ms" for name, seconds in trace.stages.items())
+        logger.log(
+            level,
+            "%s %.2fms rpc=%d %s%s",
+            trace.operation,
+            trace.duration * 1000,
+            trace.rpc_count,
+            stages,
+            f" error={trace.error}" if trace.error else ''
+        )
+    return hook
+
+
+class HistogramHook:
+    # Keeps the most recent `max_samples` durations per (operation, stage).
+
+    def __init__(self, max_samples: int = 10_000):
+        self.max_samples = max_samples
+        self.samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self.rpc_calls: Dict[Tuple[str, str], int] = {}
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, trace: Trace) -> None:
+        with self._lock:
+            self.counts[trace.operation] = self.counts.get(trace.operation, 0) + 1
+            if trace.error is not None:
+                self.errors[trace.operation] = self.errors.get(trace.operation, 0) + 1
+            for stage, seconds in ((TOTAL, trace.duration), *trace.stages.items()):
+                key = (trace.operation, stage)
+                if key not in self.samples:
+                    self.samples[key] = deque(maxlen=self.max_samples)
+                self.samples[key].append(seconds)
+            for method, count in trace.rpc_calls.items():
+                key = (trace.operation, method)
+                self.rpc_calls[key] = self.rpc_calls.get(key, 0) + count
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            summary: Dict[str, Dict[str, Any]] = {
+                operation: {'count': count, 'errors': self.errors.get(operation, 0), 'stages': {}, 'rpc_calls': {}}
+                for operation, count in self.counts.items()
+            }
+            for (operation, stage), samples in self.samples.items():
+                values = sorted(samples)
+                summary[operation]['stages'][stage] = {
+                    'count': len(values),
+                    'mean': sum(values) / len(values),
+                    'p50': percentile(values, 0.50),
+                    'p95': percentile(values, 0.95),
+                    'p99': percentile(values, 0.99),
+                    'max': values[-1],
+                }
+            for (operation, method), count in self.rpc_calls.items():
+                summary[operation]['rpc_calls'][method] = count
+            return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+            self.rpc_calls.clear()
+            self.counts.clear()
+            self.errors.clear()
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+
+from dataclasses import asdict, replace
+from typing import Dict, List
+
+from .models import JournalEntry
+
+
+PENDING = 'pending'
+CONFIRMED = 'confirmed'
+FAILED = 'failed'
+DROPPED = 'dropped'
+
+
+class TransactionJournal:
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._entries: Dict[str, JournalEntry] = {}
+        self._lock = threading.Lock()
+        self._replay()
+        self._file = open(path, 'a', encoding='utf-8')
+        if self._has_torn_tail():
+            self._file.write('\n')
+            self._file.flush()
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = JournalEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    # A torn trailing line from a crash mid-write; the entry
+                    # it belonged to was never acknowledged to the caller.
+                    continue
+                self._entries[entry.tx_hash] = entry
+
+    def _has_torn_tail(self) -> bool:
+        if os.path.getsize(self.path) == 0:
+            return False
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def _append(self, entry: JournalEntry) -> None:
+        self._file.write(json.dumps(asdict(entry)) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._entries[entry.tx_hash] = entry
+
+    def record(self,
+               tx_hash: str,
+               nonce: int,
+               account: str,
+               payload_hash: str,
+               status: str = PENDING) -> JournalEntry:
+        entry = JournalEntry(
+            tx_hash=tx_hash,
+            nonce=nonce,
+            account=account,
+            payload_hash=payload_hash,
+            status=status
+        )
+        with self._lock:
+            self._append(entry)
+        return entry
+
+    def update(self, tx_hash: str, status: str) -> None:
+        with self._lock:
+            entry = self._entries.get(tx_hash)
+            if entry is None or entry.status == status:
+                return
+            self._append(replace(entry, status=status))
+
+    def get(self, tx_hash: str) -> JournalEntry | None:
+        return self._entries.get(tx_hash)
+
+    def pending(self) -> List[JournalEntry]:
+        with self._lock:
+            return [e for e in self._entries.values() if e.status == PENDING]
+
+    def compact(self) -> None:
+        # Settled entries are only history; rewrite the file with what is
+        # still pending so replay stays proportional to in-flight writes.
+        with self._lock:
+            self._entries = {
+                tx_hash: entry for tx_hash, entry in self._entries.items() if entry.status == PENDING
+            }
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(asdict(entry)) + '\n')
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'TransactionJournal':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
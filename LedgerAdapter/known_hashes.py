@@ -0,0 +1,118 @@
+import math
+import os
+import struct
+
+from typing import Any, Dict, Iterable, Optional, Set
+
+from .models import EventData
+
+
+HASH_ADDED = 'HashAdded'
+HASH_DELETED = 'HashDeleted'
+
+
+class KnownHashSet:
+    # Membership answers are definitive: a hit means the hash is on chain.
+    exact = True
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._hashes: Set[str] = set()
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._hashes.update(line.strip() for line in f if line.strip())
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, hashed_value: str) -> None:
+        self._hashes.add(hashed_value.lower())
+
+    def discard(self, hashed_value: str) -> None:
+        self._hashes.discard(hashed_value.lower())
+
+    def might_contain(self, hashed_value: str) -> bool:
+        return hashed_value.lower() in self._hashes
+
+    def observe(self, event_name: str, args: Dict[str, Any]) -> None:
+        hashed_value = args.get('hashValue')
+        if isinstance(hashed_value, bytes):
+            hashed_value = '0x' + hashed_value.hex()
+        if not isinstance(hashed_value, str):
+            return
+        if event_name == HASH_ADDED:
+            self.add(hashed_value)
+        elif event_name == HASH_DELETED:
+            self.discard(hashed_value)
+
+    def observe_events(self, events: Iterable[EventData]) -> None:
+        for event in events:
+            self.observe(event.event_name, event.event_args)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{hashed_value}\n" for hashed_value in self._hashes)
+        os.replace(tmp_path, self.path)
+
+
+class KnownHashBloom:
+    # Membership answers may be false positives and must be confirmed on
+    # chain; a miss is definitive.
+    exact = False
+
+    _HEADER = struct.Struct('>QI')
+
+    def __init__(self,
+                 capacity: int = 1_000_000,
+                 error_rate: float = 0.001,
+                 path: Optional[str] = None):
+        self.path = path
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.num_bits, self.num_hashes = self._HEADER.unpack(
+                    f.read(self._HEADER.size)
+                )
+                self._bits = bytearray(f.read())
+            return
+
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, hashed_value: str) -> Iterable[int]:
+        # The keys are already keccak digests, so two 64-bit slices of the
+        # digest are independent enough for double hashing.
+        digest = bytes.fromhex(hashed_value[2:] if hashed_value.startswith('0x') else hashed_value)
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, hashed_value: str) -> None:
+        for position in self._positions(hashed_value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def discard(self, hashed_value: str) -> None:
+        # Bloom filters cannot forget; a stale positive is resolved on chain.
+        pass
+
+    def might_contain(self, hashed_value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(hashed_value)
+        )
+
+    observe = KnownHashSet.observe
+    observe_events = KnownHashSet.observe_events
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self._HEADER.pack(self.num_bits, self.num_hashes))
+            f.write(self._bits)
+        os.replace(tmp_path, self.path)
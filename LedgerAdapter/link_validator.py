@@ -0,0 +1,181 @@
+import time
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from web3 import Web3
+
+from .dag_mirror import DEPRECATED, DagMirror
+from .models import BlockchainError
+
+
+class LinkValidator:
+    # Keeps a topological order of the mirrored graph up to date
+    # (Pearce-Kelly): a link that agrees with the order is accepted in O(1),
+    # otherwise only the nodes between the two positions are searched.
+    #
+    # Links sent but not yet seen by the mirror live in a pending overlay,
+    # never in the mirror itself: they leave it when the mirror confirms
+    # them, when their receipt shows a revert, or after max_pending_age.
+
+    def __init__(self,
+                 mirror: DagMirror,
+                 refresh_interval: float = 5.0,
+                 max_pending_age: float = 600.0):
+        self.mirror = mirror
+        self.refresh_interval = refresh_interval
+        self.max_pending_age = max_pending_age
+        self.order: Dict[str, int] = {}
+        self.pending: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+        self.pending_outgoing: Dict[str, Set[str]] = {}
+        self.pending_incoming: Dict[str, Set[str]] = {}
+        self._next_index = 0
+        self._synced_block = None
+        self._last_refresh = time.monotonic()
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        outgoing = self.mirror.outgoing
+        in_degree: Dict[str, int] = {node: 0 for node in self.mirror.nodes}
+        for from_hash, targets in outgoing.items():
+            in_degree.setdefault(from_hash, 0)
+            for to_hash in targets:
+                in_degree[to_hash] = in_degree.get(to_hash, 0) + 1
+
+        self.order = {}
+        frontier = [node for node, degree in in_degree.items() if degree == 0]
+        while frontier:
+            node = frontier.pop()
+            self.order[node] = len(self.order)
+            for neighbour in outgoing.get(node, ()):
+                in_degree[neighbour] -= 1
+                if in_degree[neighbour] == 0:
+                    frontier.append(neighbour)
+        if len(self.order) != len(in_degree):
+            raise BlockchainError(message="Mirrored graph contains a cycle")
+        self._next_index = len(self.order)
+        self._synced_block = self.mirror.last_block
+
+        for from_hash, to_hash in list(self.pending):
+            if to_hash in outgoing.get(from_hash, ()):
+                self.discard(from_hash, to_hash)
+            else:
+                self._reorder(from_hash, to_hash)
+
+    def _refresh(self) -> None:
+        if self._synced_block != self.mirror.last_block:
+            self._rebuild()
+        elif time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        self._last_refresh = now = time.monotonic()
+
+        for edge, (_, recorded_at) in list(self.pending.items()):
+            if now - recorded_at > self.max_pending_age:
+                self.discard(*edge)
+        sent = [(edge, tx_hash) for edge, (tx_hash, _) in self.pending.items() if tx_hash is not None]
+        if not sent:
+            return
+        receipts = self.mirror.manager._fetch_receipts([tx_hash for _, tx_hash in sent])
+        for (edge, _), receipt in zip(sent, receipts):
+            if receipt is not None and int(receipt['status'], 16) != 1:
+                self.discard(*edge)
+
+    def _index(self, node: str) -> int:
+        if node not in self.order:
+            self.order[node] = self._next_index
+            self._next_index += 1
+        return self.order[node]
+
+    def _reach(self,
+               start: str,
+               adjacencies: Iterable[Dict[str, Set[str]]],
+               keep) -> List[str]:
+        adjacencies = list(adjacencies)
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for adjacency in adjacencies:
+                for neighbour in adjacency.get(node, ()):
+                    if neighbour not in seen and keep(self.order.get(neighbour, -1)):
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+        return list(seen)
+
+    def _read_on_chain(self, hashed_values: List[str]) -> None:
+        read_hash = self.mirror.manager.contract.functions.readHash
+        functions = [read_hash(Web3.to_bytes(hexstr=h)) for h in hashed_values]
+        results = self.mirror.manager.call_many(functions)
+        for function, result in zip(functions, results):
+            if isinstance(result, BlockchainError):
+                raise BlockchainError(message="Hash does not exist")
+            names = [output.get('name') for output in function.abi.get('outputs', [])]
+            if 'deprecated' in names and isinstance(result, list) \
+                    and result[names.index('deprecated')]:
+                raise BlockchainError(message="Hash is deprecated")
+
+    def check(self, from_hash: str, to_hash: str) -> None:
+        self._refresh()
+        from_hash = from_hash.lower()
+        to_hash = to_hash.lower()
+
+        for hashed_value in (from_hash, to_hash):
+            if self.mirror.nodes.get(hashed_value) == DEPRECATED:
+                raise BlockchainError(message="Hash is deprecated")
+        # Nodes the mirror has not seen yet may be newer than the last sync.
+        unknown = [h for h in dict.fromkeys((from_hash, to_hash)) if h not in self.mirror.nodes]
+        if unknown:
+            self._read_on_chain(unknown)
+
+        if from_hash == to_hash:
+            raise BlockchainError(message="Link would create a cycle")
+        if to_hash in self.mirror.outgoing.get(from_hash, ()) or (from_hash, to_hash) in self.pending:
+            raise BlockchainError(message="Link already exists")
+        upper = self._index(from_hash)
+        if self._index(to_hash) > upper:
+            return
+        forward = self._reach(
+            to_hash, (self.mirror.outgoing, self.pending_outgoing), lambda i: i <= upper
+        )
+        if from_hash in forward:
+            raise BlockchainError(message="Link would create a cycle")
+
+    def record(self, from_hash: str, to_hash: str, tx_hash: Optional[str] = None) -> None:
+        from_hash = from_hash.lower()
+        to_hash = to_hash.lower()
+        self.pending[(from_hash, to_hash)] = (tx_hash, time.monotonic())
+        self.pending_outgoing.setdefault(from_hash, set()).add(to_hash)
+        self.pending_incoming.setdefault(to_hash, set()).add(from_hash)
+        self._reorder(from_hash, to_hash)
+
+    def discard(self, from_hash: str, to_hash: str) -> None:
+        # Dropping an edge never invalidates the order, so nothing moves.
+        from_hash = from_hash.lower()
+        to_hash = to_hash.lower()
+        if self.pending.pop((from_hash, to_hash), None) is None:
+            return
+        self.pending_outgoing[from_hash].discard(to_hash)
+        if not self.pending_outgoing[from_hash]:
+            del self.pending_outgoing[from_hash]
+        self.pending_incoming[to_hash].discard(from_hash)
+        if not self.pending_incoming[to_hash]:
+            del self.pending_incoming[to_hash]
+
+    def _reorder(self, from_hash: str, to_hash: str) -> None:
+        lower = self._index(to_hash)
+        upper = self._index(from_hash)
+        if lower > upper:
+            return
+
+        # Reorder only the affected region: everything reaching from_hash
+        # moves ahead of everything reachable from to_hash.
+        forward = self._reach(
+            to_hash, (self.mirror.outgoing, self.pending_outgoing), lambda i: i <= upper
+        )
+        backward = self._reach(
+            from_hash, (self.mirror.incoming, self.pending_incoming), lambda i: i >= lower
+        )
+        forward.sort(key=self.order.__getitem__)
+        backward.sort(key=self.order.__getitem__)
+        slots = sorted(self.order[node] for node in backward + forward)
+        for node, index in zip(backward + forward, slots):
+            self.order[node] = index
@@ -0,0 +1,415 @@
+import argparse
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from web3 import Web3
+
+from .connection import Connection
+from .dag_hash_manager import DagHashManager
+from .hash_manager import HashManager
+from .instrumentation import percentile
+from .models import BlockchainError, BlockchainResponse
+from .sender_pool import SenderPool
+from .utils import wait_for_liveness
+
+
+OPERATIONS = ('add', 'read', 'deprecate', 'add_outgoing_link', 'get_events')
+DEFAULT_MIX = 'add=4,read=4,deprecate=1,add_outgoing_link=1,get_events=1'
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        weights[name] = float(weight or 1)
+    if not any(weights.values()):
+        raise ValueError("Operation mix must have a positive weight")
+    return weights
+
+
+def _is_success(result: Any) -> bool:
+    if isinstance(result, BlockchainError):
+        return False
+    return not isinstance(result, BlockchainResponse) or result.status == '1'
+
+
+def _succeeded(result: Any) -> Any:
+    # Writes report failure through their return value, so turn it into an
+    # exception the worker records as an error.
+    if isinstance(result, BlockchainError):
+        raise result
+    if not _is_success(result):
+        raise BlockchainError(message="Transaction reverted")
+    return result
+
+
+class LoadStats:
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            if error is None:
+                self.latencies[operation].append(seconds)
+                self.completed += 1
+            else:
+                self.errors[operation][f"{type(error).__name__}: {error}"[:200]] += 1
+                self.failed += 1
+
+    def snapshot(self) -> tuple:
+        with self._lock:
+            return self.completed, self.failed
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        operations = {}
+        with self._lock:
+            for operation in sorted(set(self.latencies) | set(self.errors)):
+                latencies = sorted(self.latencies[operation])
+                errors = sum(self.errors[operation].values())
+                operations[operation] = {
+                    'count': len(latencies),
+                    'errors': errors,
+                    'tps': len(latencies) / duration if duration else 0.0,
+                    'mean': sum(latencies) / len(latencies) if latencies else None,
+                    'p50': percentile(latencies, 0.50),
+                    'p95': percentile(latencies, 0.95),
+                    'p99': percentile(latencies, 0.99),
+                    'max': latencies[-1] if latencies else None,
+                }
+            return {
+                'duration': duration,
+                'completed': self.completed,
+                'failed': self.failed,
+                'tps': self.completed / duration if duration else 0.0,
+                'operations': operations,
+                'errors': {op: dict(counter) for op, counter in self.errors.items()},
+            }
+
+
+class KeyState:
+    # Writes for one key go through its own single-lane pool so concurrent
+    # workers share a local nonce counter, and ownership-bound operations
+    # (deprecate) only touch hashes this key added.
+
+    def __init__(self, private_key: str):
+        self.private_key = private_key
+        self.pool = SenderPool([private_key])
+        self.hashes: List[str] = []
+        self.nodes: List[str] = []
+        self.lock = threading.Lock()
+
+
+class LoadGenerator:
+
+    def __init__(self,
+                 hash_managers: List[HashManager],
+                 dag_hash_managers: List[DagHashManager],
+                 private_keys: List[str],
+                 mix: Dict[str, float],
+                 concurrency: int = 8,
+                 rate: Optional[float] = None,
+                 wait_for_receipts: bool = True,
+                 events_window: int = 100):
+        self.hash_managers = hash_managers
+        self.dag_hash_managers = dag_hash_managers
+        self.keys = [KeyState(private_key) for private_key in private_keys]
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.concurrency = concurrency
+        self.rate = rate
+        self.wait_for_receipts = wait_for_receipts
+        self.events_window = events_window
+        self.stats = LoadStats()
+        self.run_id = f"{int(time.time())}-{random.getrandbits(32):08x}"
+
+        self._counter = 0
+        self._counter_lock = threading.Lock()
+        self._next_start = None
+        self._schedule_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.handlers: Dict[str, Callable[[int, KeyState], None]] = {
+            'add': self._add,
+            'read': self._read,
+            'deprecate': self._deprecate,
+            'add_outgoing_link': self._add_outgoing_link,
+            'get_events': self._get_events,
+        }
+
+    def _value(self) -> str:
+        with self._counter_lock:
+            self._counter += 1
+            return f"load-{self.run_id}-{self._counter}"
+
+    def seed(self, per_key: int) -> None:
+        for key in self.keys:
+            values = [self._value() for _ in range(per_key)]
+            nodes = [self._value() for _ in range(per_key)]
+            added = self.hash_managers[0].add_many(values, key.private_key, synchronous=True)
+            added_nodes = self.dag_hash_managers[0].add_hash_many(nodes, key.private_key, synchronous=True)
+            key.hashes.extend(
+                Web3.keccak(text=v).to_0x_hex() for v, result in zip(values, added) if _is_success(result)
+            )
+            key.nodes.extend(
+                Web3.keccak(text=v).to_0x_hex() for v, result in zip(nodes, added_nodes) if _is_success(result)
+            )
+
+    def _add(self, worker: int, key: KeyState) -> None:
+        value = self._value()
+        manager = self.hash_managers[worker % len(self.hash_managers)]
+        _succeeded(manager.add(value, key.pool, synchronous=self.wait_for_receipts))
+        with key.lock:
+            key.hashes.append(Web3.keccak(text=value).to_0x_hex())
+
+    def _read(self, worker: int, key: KeyState) -> None:
+        with key.lock:
+            hashed_value = random.choice(key.hashes) if key.hashes else Web3.keccak(text=self._value()).to_0x_hex()
+        self.hash_managers[worker % len(self.hash_managers)].read(hashed_value)
+
+    def _deprecate(self, worker: int, key: KeyState) -> None:
+        with key.lock:
+            hashed_value = key.hashes.pop(random.randrange(len(key.hashes))) if key.hashes else None
+        if hashed_value is None:
+            raise ValueError("No hash available to deprecate")
+        _succeeded(self.hash_managers[worker % len(self.hash_managers)].deprecate(
+            hashed_value, key.pool, synchronous=self.wait_for_receipts
+        ))
+
+    def _add_outgoing_link(self, worker: int, key: KeyState) -> None:
+        # Links always point from an older node to a newer one, so the load
+        # never tries to close a cycle.
+        with key.lock:
+            if len(key.nodes) < 2:
+                raise ValueError("Not enough DAG nodes to link")
+            i, j = sorted(random.sample(range(len(key.nodes)), 2))
+            from_hash, to_hash = key.nodes[i], key.nodes[j]
+        _succeeded(self.dag_hash_managers[worker % len(self.dag_hash_managers)].add_outgoing_link(
+            from_hash, to_hash, key.pool, synchronous=self.wait_for_receipts
+        ))
+
+    def _get_events(self, worker: int, key: KeyState) -> None:
+        manager = self.hash_managers[worker % len(self.hash_managers)]
+        latest = manager.w3.eth.block_number
+        manager.get_events(from_block=max(0, latest - self.events_window), to_block=latest)
+
+    def _wait_for_slot(self) -> None:
+        if self.rate is None:
+            return
+        with self._schedule_lock:
+            now = time.perf_counter()
+            if self._next_start is None or self._next_start < now - 1.0:
+                self._next_start = now
+            start = self._next_start
+            self._next_start += 1.0 / self.rate
+        delay = start - time.perf_counter()
+        if delay > 0:
+            self._stop.wait(delay)
+
+    def _worker(self, worker: int, deadline: float, limit: Optional[int]) -> None:
+        key = self.keys[worker % len(self.keys)]
+        rng = random.Random(worker)
+        while not self._stop.is_set() and time.perf_counter() < deadline:
+            self._wait_for_slot()
+            if self._stop.is_set() or time.perf_counter() >= deadline:
+                return
+            operation = rng.choices(self.operations, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                self.handlers[operation](worker, key)
+            except Exception as e:
+                self.stats.record(operation, time.perf_counter() - start, e)
+            else:
+                self.stats.record(operation, time.perf_counter() - start)
+            if limit is not None and sum(self.stats.snapshot()) >= limit:
+                self._stop.set()
+
+    def run(self,
+            duration: float,
+            limit: Optional[int] = None,
+            interval: float = 1.0,
+            out=sys.stderr) -> Dict[str, Any]:
+        started = time.perf_counter()
+        deadline = started + duration
+        workers = [
+            threading.Thread(target=self._worker, args=(i, deadline, limit), daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in workers:
+            thread.start()
+
+        last_completed = 0
+        last_time = started
+        while True:
+            alive = [thread for thread in workers if thread.is_alive()]
+            if not alive:
+                break
+            alive[0].join(timeout=max(0.0, last_time + interval - time.perf_counter()))
+            now = time.perf_counter()
+            if out is None or now - last_time < interval:
+                continue
+            completed, failed = self.stats.snapshot()
+            print(
+                f"[{now - started:7.1f}s] completed={completed} failed={failed} "
+                f"tps={(completed - last_completed) / (now - last_time):.1f} "
+                f"in_flight={self._in_flight()}",
+                file=out,
+                flush=True
+            )
+            last_completed = completed
+            last_time = now
+
+        report = self.stats.report(time.perf_counter() - started)
+        report['in_flight'] = self._in_flight()
+        report['config'] = {
+            'concurrency': self.concurrency,
+            'rate': self.rate,
+            'keys': len(self.keys),
+            'connections': len(self.hash_managers),
+            'mix': dict(zip(self.operations, self.weights)),
+            'wait_for_receipts': self.wait_for_receipts,
+        }
+        return report
+
+    def _in_flight(self) -> int:
+        # Without receipt waits nothing else settles the pools, so poll
+        # their pending transactions before reporting them.
+        if not self.wait_for_receipts:
+            for key in self.keys:
+                key.pool.refresh(self.hash_managers[0].w3)
+        return sum(sum(key.pool.in_flight().values()) for key in self.keys)
+
+
+def _print_summary(report: Dict[str, Any], out=sys.stderr) -> None:
+    def ms(value):
+        return '-' if value is None else f"{value * 1000:.1f}"
+
+    print(
+        f"\n{report['completed']} ok, {report['failed']} failed in {report['duration']:.1f}s "
+        f"({report['tps']:.1f} ops/s)",
+        file=out
+    )
+    print(f"{'operation':<20}{'ok':>8}{'err':>6}{'tps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}", file=out)
+    for name, row in report['operations'].items():
+        print(
+            f"{name:<20}{row['count']:>8}{row['errors']:>6}{row['tps']:>9.1f}"
+            f"{ms(row['p50']):>9}{ms(row['p95']):>9}{ms(row['p99']):>9}",
+            file=out
+        )
+    for name, errors in report['errors'].items():
+        for message, count in sorted(errors.items(), key=lambda item: -item[1]):
+            print(f"  {name}: {count} x {message}", file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='ledger-adapter-load',
+        description="Drive a mix of LedgerAdapter operations against a node and report throughput and latency"
+    )
+    parser.add_argument('--node-url', action='append',
+                        help="node to target; repeat for several connections (default: a local stand-in node)")
+    parser.add_argument('--genesis', default='/app/genesis-contracts.json',
+                        help="genesis-contracts.json with the contract addresses and ABIs")
+    parser.add_argument('--connections', type=int, default=1,
+                        help="connections opened per node url")
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    parser.add_argument('--private-key', action='append',
+                        help="sender key; repeat to spread writes across accounts "
+                             "(required with --node-url; the local stand-in node uses a fresh key)")
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f"weighted operation mix (default: {DEFAULT_MIX})")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, help="target operations per second across all workers")
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds to run")
+    parser.add_argument('--operations', type=int, help="stop after this many operations")
+    parser.add_argument('--seed', type=int, default=20,
+                        help="hashes and DAG nodes added per key before the run")
+    parser.add_argument('--no-wait', action='store_true',
+                        help="measure writes up to submission instead of waiting for receipts")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between live updates")
+    parser.add_argument('--report', help="write the final JSON report to this file (default: stdout)")
+    parser.add_argument('--block-time', type=float, default=0.0, help="local stand-in block time")
+    parser.add_argument('--latency', type=float, default=0.0, help="local stand-in injected latency")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    node = None
+    private_keys = args.private_key
+    if args.node_url:
+        if not private_keys:
+            parser.error("--private-key is required with --node-url")
+        node_urls = args.node_url
+        with open(args.genesis, 'r', encoding='utf-8') as f:
+            genesis = json.load(f)
+    else:
+        from .local_node import LocalNode
+
+        node = LocalNode(block_time=args.block_time, latency=args.latency).start()
+        node_urls = [node.url]
+        genesis = node.genesis_contracts()
+        private_keys = private_keys or ['0x' + secrets.token_hex(32)]
+
+    try:
+        connections = []
+        for node_url in node_urls:
+            for _ in range(args.connections):
+                connection = Connection(node_url=node_url)
+                if args.username is not None:
+                    connection.with_authentication(args.username, args.password)
+                wait_for_liveness(connection)
+                connections.append(connection)
+
+        generator = LoadGenerator(
+            hash_managers=[
+                HashManager(connection, genesis['HashManager']['address'], genesis['HashManager']['abi'])
+                for connection in connections
+            ],
+            dag_hash_managers=[
+                DagHashManager(connection, genesis['DagHashManager']['address'], genesis['DagHashManager']['abi'])
+                for connection in connections
+            ],
+            private_keys=private_keys,
+            mix=mix,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            wait_for_receipts=not args.no_wait,
+        )
+        try:
+            generator.seed(args.seed)
+            report = generator.run(args.duration, limit=args.operations, interval=args.interval)
+        finally:
+            for manager in generator.hash_managers + generator.dag_hash_managers:
+                manager.close()
+    finally:
+        if node is not None:
+            node.stop()
+
+    _print_summary(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,707 @@
+import argparse
+import json
+import secrets
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import rlp
+
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from web3 import Web3
+
+
+CHAIN_ID = 1337
+BLOCK_GAS_LIMIT = 30_000_000
+ZERO_ADDRESS = '0x' + '00' * 20
+ZERO_HASH = '0x' + '00' * 32
+ERROR_SELECTOR = bytes.fromhex('08c379a0')
+
+HASH_MANAGER_ADDRESS = Web3.to_checksum_address('0x' + '42' * 19 + '01')
+DAG_HASH_MANAGER_ADDRESS = Web3.to_checksum_address('0x' + '42' * 19 + '02')
+
+
+def _function(name: str,
+              inputs: List[str],
+              outputs: List[Tuple[str, str]] = ()) -> Dict[str, Any]:
+    return {
+        'type': 'function',
+        'name': name,
+        'stateMutability': 'view' if outputs else 'nonpayable',
+        'inputs': [{'name': n, 'type': 'bytes32'} for n in inputs],
+        'outputs': [{'name': n, 'type': t} for n, t in outputs],
+    }
+
+
+def _event(name: str, inputs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    return {
+        'type': 'event',
+        'name': name,
+        'anonymous': False,
+        'inputs': [{'name': n, 'type': t, 'indexed': True} for n, t in inputs],
+    }
+
+
+HASH_RECORD = [('owner', 'address'), ('deprecated', 'bool'), ('timestamp', 'uint256')]
+HASH_EVENT = [('hashValue', 'bytes32'), ('owner', 'address')]
+LINK_EVENT = [('fromHash', 'bytes32'), ('toHash', 'bytes32')]
+
+HASH_MANAGER_ABI = [
+    _function('add', ['hashValue']),
+    _function('read', ['hashValue'], HASH_RECORD),
+    _function('deprecate', ['hashValue']),
+    _event('HashAdded', HASH_EVENT),
+    _event('HashDeprecated', HASH_EVENT),
+]
+
+DAG_HASH_MANAGER_ABI = [
+    _function('addHash', ['hashValue']),
+    _function('readHash', ['hashValue'], HASH_RECORD),
+    _function('deprecateHash', ['hashValue']),
+    _function('deleteHash', ['hashValue']),
+    _function('addOutgoingLink', ['fromHash', 'toHash']),
+    _function('readOutgoingLinks', ['hashValue'], [('', 'bytes32[]')]),
+    _function('deleteOutgoingLink', ['fromHash', 'toHash']),
+    _event('HashAdded', HASH_EVENT),
+    _event('HashDeprecated', HASH_EVENT),
+    _event('HashDeleted', HASH_EVENT),
+    _event('OutgoingLinkAdded', LINK_EVENT),
+    _event('OutgoingLinkDeleted', LINK_EVENT),
+]
+
+
+class Revert(Exception):
+    pass
+
+
+class RpcError(Exception):
+
+    def __init__(self, message: str, code: int = -32000, data: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class CallContext:
+    # `commit` is False for eth_call / eth_estimateGas: the checks run but
+    # nothing is written.
+
+    def __init__(self, sender: str, timestamp: int, commit: bool):
+        self.sender = sender
+        self.timestamp = timestamp
+        self.commit = commit
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+
+    def emit(self, event_name: str, **args: Any) -> None:
+        self.events.append((event_name, args))
+
+
+class HashManagerState:
+    abi = HASH_MANAGER_ABI
+    gas = 50_000
+
+    def __init__(self):
+        self.hashes: Dict[bytes, List[Any]] = {}
+
+    def _existing(self, hash_value: bytes) -> List[Any]:
+        if hash_value not in self.hashes:
+            raise Revert("Hash does not exist")
+        return self.hashes[hash_value]
+
+    def _owned(self, ctx: CallContext, hash_value: bytes) -> List[Any]:
+        record = self._existing(hash_value)
+        if record[0] != ctx.sender:
+            raise Revert("Caller is not the owner")
+        return record
+
+    def add(self, ctx: CallContext, hash_value: bytes) -> tuple:
+        if hash_value in self.hashes:
+            raise Revert("Hash already exists")
+        if ctx.commit:
+            self.hashes[hash_value] = [ctx.sender, False, ctx.timestamp]
+        ctx.emit('HashAdded', hashValue=hash_value, owner=ctx.sender)
+        return ()
+
+    def read(self, ctx: CallContext, hash_value: bytes) -> tuple:
+        return tuple(self._existing(hash_value))
+
+    def deprecate(self, ctx: CallContext, hash_value: bytes) -> tuple:
+        record = self._owned(ctx, hash_value)
+        if record[1]:
+            raise Revert("Hash is already deprecated")
+        if ctx.commit:
+            record[1] = True
+        ctx.emit('HashDeprecated', hashValue=hash_value, owner=ctx.sender)
+        return ()
+
+
+class DagHashManagerState(HashManagerState):
+    abi = DAG_HASH_MANAGER_ABI
+    gas = 70_000
+
+    def __init__(self):
+        super().__init__()
+        self.outgoing: Dict[bytes, List[bytes]] = {}
+
+    addHash = HashManagerState.add
+    readHash = HashManagerState.read
+    deprecateHash = HashManagerState.deprecate
+
+    def deleteHash(self, ctx: CallContext, hash_value: bytes) -> tuple:
+        record = self._owned(ctx, hash_value)
+        if not record[1]:
+            raise Revert("Hash must be deprecated before deletion")
+        links = [(hash_value, t) for t in self.outgoing.get(hash_value, ())]
+        links += [(f, hash_value) for f, targets in self.outgoing.items() if hash_value in targets]
+        for from_hash, to_hash in links:
+            ctx.emit('OutgoingLinkDeleted', fromHash=from_hash, toHash=to_hash)
+        if ctx.commit:
+            for from_hash, to_hash in links:
+                self.outgoing[from_hash].remove(to_hash)
+            self.outgoing.pop(hash_value, None)
+            del self.hashes[hash_value]
+        ctx.emit('HashDeleted', hashValue=hash_value, owner=ctx.sender)
+        return ()
+
+    def _reaches(self, start: bytes, target: bytes) -> bool:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbour in self.outgoing.get(stack.pop(), ()):
+                if neighbour == target:
+                    return True
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        return False
+
+    def addOutgoingLink(self, ctx: CallContext, from_hash: bytes, to_hash: bytes) -> tuple:
+        if from_hash == to_hash:
+            raise Revert("Cannot link hash to itself")
+        if self._existing(from_hash)[1]:
+            raise Revert("Source hash is not active")
+        if self._existing(to_hash)[1]:
+            raise Revert("Target hash is not active")
+        if to_hash in self.outgoing.get(from_hash, ()):
+            raise Revert("Link already exists")
+        if self._reaches(to_hash, from_hash):
+            raise Revert("Link would create a cycle")
+        if ctx.commit:
+            self.outgoing.setdefault(from_hash, []).append(to_hash)
+        ctx.emit('OutgoingLinkAdded', fromHash=from_hash, toHash=to_hash)
+        return ()
+
+    def readOutgoingLinks(self, ctx: CallContext, hash_value: bytes) -> tuple:
+        self._existing(hash_value)
+        return (list(self.outgoing.get(hash_value, ())),)
+
+    def deleteOutgoingLink(self, ctx: CallContext, from_hash: bytes, to_hash: bytes) -> tuple:
+        if to_hash not in self.outgoing.get(from_hash, ()):
+            raise Revert("Link does not exist")
+        if ctx.commit:
+            self.outgoing[from_hash].remove(to_hash)
+        ctx.emit('OutgoingLinkDeleted', fromHash=from_hash, toHash=to_hash)
+        return ()
+
+
+class DeployedContract:
+
+    def __init__(self, address: str, state: HashManagerState):
+        self.address = address
+        self.state = state
+        self.functions = {
+            function_abi_to_4byte_selector(entry): entry
+            for entry in state.abi if entry['type'] == 'function'
+        }
+        self.events = {
+            entry['name']: entry
+            for entry in state.abi if entry['type'] == 'event'
+        }
+
+    def run(self, ctx: CallContext, data: bytes) -> bytes:
+        entry = self.functions.get(data[:4])
+        if entry is None:
+            raise Revert("Unknown function selector")
+        args = decode([i['type'] for i in entry['inputs']], data[4:])
+        result = getattr(self.state, entry['name'])(ctx, *args)
+        return encode([o['type'] for o in entry['outputs']], result)
+
+    def log(self, event_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        entry = self.events[event_name]
+        return {
+            'address': self.address,
+            'topics': ['0x' + event_abi_to_log_topic(entry).hex()] + [
+                '0x' + encode([i['type']], [args[i['name']]]).hex()
+                for i in entry['inputs']
+            ],
+            'data': '0x',
+        }
+
+
+def _revert_data(message: str) -> str:
+    return '0x' + (ERROR_SELECTOR + encode(['string'], [message])).hex()
+
+
+def _quantity(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    return int(value, 16) if value else 0
+
+
+def _decode_raw_transaction(raw: bytes) -> Dict[str, Any]:
+    if raw[0] > 0x7f:
+        nonce, _, gas, to, _, data, *_ = rlp.decode(raw)
+        fields = {'nonce': nonce, 'gas': gas, 'to': to, 'data': data, 'type': 0}
+    else:
+        tx = TypedTransaction.from_bytes(raw).as_dict()
+        fields = {
+            'nonce': tx['nonce'], 'gas': tx['gas'], 'to': tx['to'],
+            'data': tx['data'], 'type': raw[0],
+        }
+    fields['nonce'] = int.from_bytes(fields['nonce'], 'big') if isinstance(fields['nonce'], bytes) else fields['nonce']
+    fields['gas'] = int.from_bytes(fields['gas'], 'big') if isinstance(fields['gas'], bytes) else fields['gas']
+    fields['to'] = Web3.to_checksum_address(fields['to']) if fields['to'] else None
+    fields['data'] = Web3.to_bytes(hexstr=fields['data']) if isinstance(fields['data'], str) else bytes(fields['data'])
+    fields['from'] = Account.recover_transaction(raw)
+    return fields
+
+
+class LocalNode:
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 block_time: float = 0.0,
+                 latency: float = 0.0,
+                 chain_id: int = CHAIN_ID,
+                 credentials: Optional[Dict[str, str]] = None):
+        self.host = host
+        self.port = port
+        self.block_time = block_time
+        self.latency = latency
+        self.chain_id = chain_id
+        self.credentials = credentials
+        self.tokens = set()
+
+        self.contracts = {
+            HASH_MANAGER_ADDRESS: DeployedContract(HASH_MANAGER_ADDRESS, HashManagerState()),
+            DAG_HASH_MANAGER_ADDRESS: DeployedContract(DAG_HASH_MANAGER_ADDRESS, DagHashManagerState()),
+        }
+        self.blocks: List[Dict[str, Any]] = []
+        self.blocks_by_hash: Dict[str, Dict[str, Any]] = {}
+        self.receipts: Dict[str, Dict[str, Any]] = {}
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        self.pending: List[Dict[str, Any]] = []
+        self.nonces: Dict[str, int] = {}
+        self.mined_nonces: Dict[str, int] = {}
+        self.queued: Dict[str, Dict[int, bytes]] = {}
+
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: List[threading.Thread] = []
+        self._mine()
+
+        self.methods: Dict[str, Callable[[List[Any]], Any]] = {
+            'web3_clientVersion': lambda params: 'LedgerAdapter/LocalNode',
+            'net_version': lambda params: str(self.chain_id),
+            'eth_chainId': lambda params: hex(self.chain_id),
+            'eth_syncing': lambda params: False,
+            'eth_accounts': lambda params: [],
+            'eth_gasPrice': lambda params: '0x0',
+            'eth_blockNumber': lambda params: hex(self.blocks[-1]['number']),
+            'eth_getTransactionCount': self._get_transaction_count,
+            'eth_call': self._call,
+            'eth_estimateGas': self._estimate_gas,
+            'eth_sendRawTransaction': self._send_raw_transaction,
+            'eth_getTransactionReceipt': lambda params: self._json(self.receipts.get(params[0])),
+            'eth_getTransactionByHash': lambda params: self._json(self.transactions.get(params[0])),
+            'eth_getBlockByNumber': self._get_block_by_number,
+            'eth_getBlockByHash': self._get_block_by_hash,
+            'eth_getLogs': self._get_logs,
+        }
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def genesis_contracts(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            'HashManager': {'address': HASH_MANAGER_ADDRESS, 'abi': HASH_MANAGER_ABI},
+            'DagHashManager': {'address': DAG_HASH_MANAGER_ADDRESS, 'abi': DAG_HASH_MANAGER_ABI},
+        }
+
+    def __enter__(self) -> 'LocalNode':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> 'LocalNode':
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._server.serve_forever, daemon=True)]
+        if self.block_time > 0:
+            self._threads.append(threading.Thread(target=self._mine_loop, daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    # Chain
+
+    def _mine_loop(self) -> None:
+        while not self._stop.wait(self.block_time):
+            with self._lock:
+                self._mine()
+
+    def _mine(self) -> None:
+        parent = self.blocks[-1] if self.blocks else None
+        number = 0 if parent is None else parent['number'] + 1
+        timestamp = max(int(time.time()), 0 if parent is None else parent['timestamp'])
+        block_hash = Web3.keccak(
+            number.to_bytes(32, 'big') + timestamp.to_bytes(32, 'big')
+            + bytes.fromhex((parent['hash'] if parent else ZERO_HASH)[2:])
+        ).to_0x_hex()
+
+        logs = []
+        gas_used = 0
+        for index, pending in enumerate(self.pending):
+            gas_used += pending['gas_used']
+            tx_logs = []
+            for log in pending['logs']:
+                tx_logs.append(dict(
+                    log,
+                    blockNumber=number,
+                    blockHash=block_hash,
+                    transactionHash=pending['hash'],
+                    transactionIndex=index,
+                    logIndex=len(logs) + len(tx_logs),
+                    removed=False,
+                ))
+            logs.extend(tx_logs)
+            self.receipts[pending['hash']] = {
+                'transactionHash': pending['hash'],
+                'transactionIndex': index,
+                'blockHash': block_hash,
+                'blockNumber': number,
+                'from': pending['from'],
+                'to': pending['to'],
+                'gasUsed': pending['gas_used'],
+                'cumulativeGasUsed': gas_used,
+                'effectiveGasPrice': 0,
+                'contractAddress': None,
+                'logs': tx_logs,
+                'logsBloom': '0x' + '00' * 256,
+                'status': pending['status'],
+                'type': pending['type'],
+            }
+            self.transactions[pending['hash']].update(
+                blockHash=block_hash, blockNumber=number, transactionIndex=index
+            )
+            self.mined_nonces[pending['from']] = pending['nonce'] + 1
+
+        block = {
+            'number': number,
+            'hash': block_hash,
+            'parentHash': parent['hash'] if parent else ZERO_HASH,
+            'nonce': '0x' + '00' * 8,
+            'sha3Uncles': ZERO_HASH,
+            'logsBloom': '0x' + '00' * 256,
+            'transactionsRoot': ZERO_HASH,
+            'stateRoot': ZERO_HASH,
+            'receiptsRoot': ZERO_HASH,
+            'miner': ZERO_ADDRESS,
+            'difficulty': 0,
+            'totalDifficulty': 0,
+            'extraData': '0x',
+            'size': 0,
+            'gasLimit': BLOCK_GAS_LIMIT,
+            'gasUsed': gas_used,
+            'timestamp': timestamp,
+            'transactions': [pending['hash'] for pending in self.pending],
+            'uncles': [],
+            'logs': logs,
+        }
+        self.blocks.append(block)
+        self.blocks_by_hash[block_hash] = block
+        self.pending = []
+
+    def _requested_block(self, block_identifier: Any) -> int:
+        if block_identifier in (None, 'latest', 'pending', 'safe', 'finalized'):
+            return self.blocks[-1]['number']
+        if block_identifier == 'earliest':
+            return 0
+        return _quantity(block_identifier)
+
+    def _block_number(self, block_identifier: Any) -> int:
+        return min(self._requested_block(block_identifier), self.blocks[-1]['number'])
+
+    def _apply(self, sender: str, to: Optional[str], data: bytes, commit: bool) -> Tuple[bytes, CallContext]:
+        # State is shared by every block tag: writes are visible as soon as
+        # they are accepted, and receipts appear when the block is mined.
+        contract = self.contracts.get(to)
+        ctx = CallContext(sender, self.blocks[-1]['timestamp'], commit)
+        if contract is None:
+            # A plain transfer to an account (such as a nonce filler) succeeds
+            # and does nothing; only calldata needs code to run.
+            if data:
+                raise Revert("No contract at address")
+            return b'', ctx
+        output = contract.run(ctx, data)
+        return output, ctx
+
+    def _accept(self, raw: bytes) -> None:
+        tx = _decode_raw_transaction(raw)
+        tx_hash = Web3.keccak(raw).to_0x_hex()
+        status = 1
+        logs = []
+        try:
+            _, ctx = self._apply(tx['from'], tx['to'], tx['data'], commit=True)
+            logs = [self.contracts[tx['to']].log(name, args) for name, args in ctx.events]
+        except Revert:
+            status = 0
+        gas = self.contracts[tx['to']].state.gas if tx['to'] in self.contracts else 21_000
+        self.nonces[tx['from']] = tx['nonce'] + 1
+        self.transactions[tx_hash] = {
+            'hash': tx_hash, 'from': tx['from'], 'to': tx['to'], 'nonce': tx['nonce'],
+            'gas': tx['gas'], 'gasPrice': 0, 'value': 0, 'input': '0x' + tx['data'].hex(),
+            'type': tx['type'], 'blockHash': None, 'blockNumber': None, 'transactionIndex': None,
+        }
+        self.pending.append({
+            'hash': tx_hash, 'from': tx['from'], 'to': tx['to'], 'nonce': tx['nonce'],
+            'type': tx['type'], 'status': status, 'logs': logs, 'gas_used': min(gas, tx['gas']),
+        })
+        if self.block_time <= 0:
+            self._mine()
+
+    # JSON-RPC methods
+
+    @staticmethod
+    def _json(value: Any) -> Any:
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            return value
+        if isinstance(value, int):
+            return hex(value)
+        if isinstance(value, list):
+            return [LocalNode._json(v) for v in value]
+        if isinstance(value, dict):
+            return {k: LocalNode._json(v) for k, v in value.items()}
+        return value
+
+    def _get_transaction_count(self, params: List[Any]) -> str:
+        address = Web3.to_checksum_address(params[0])
+        block_identifier = params[1] if len(params) > 1 else 'latest'
+        nonces = self.nonces if block_identifier == 'pending' else self.mined_nonces
+        return hex(nonces.get(address, 0))
+
+    def _call_params(self, params: List[Any]) -> Tuple[str, Optional[str], bytes]:
+        call = params[0]
+        sender = Web3.to_checksum_address(call.get('from') or ZERO_ADDRESS)
+        to = Web3.to_checksum_address(call['to']) if call.get('to') else None
+        data = Web3.to_bytes(hexstr=call.get('data') or call.get('input') or '0x')
+        return sender, to, data
+
+    def _call(self, params: List[Any]) -> str:
+        try:
+            output, _ = self._apply(*self._call_params(params), commit=False)
+        except Revert as e:
+            raise RpcError(f"execution reverted: {e}", code=3, data=_revert_data(str(e)))
+        return '0x' + output.hex()
+
+    def _estimate_gas(self, params: List[Any]) -> str:
+        self._call(params)
+        _, to, _ = self._call_params(params)
+        return hex(self.contracts[to].state.gas)
+
+    def _send_raw_transaction(self, params: List[Any]) -> str:
+        raw = Web3.to_bytes(hexstr=params[0])
+        tx_hash = Web3.keccak(raw).to_0x_hex()
+        if tx_hash in self.transactions:
+            raise RpcError("Known transaction")
+        tx = _decode_raw_transaction(raw)
+        expected = self.nonces.get(tx['from'], 0)
+        if tx['nonce'] < expected:
+            raise RpcError("Nonce too low")
+        if tx['nonce'] > expected:
+            # Future nonces wait until the gap before them is filled.
+            self.queued.setdefault(tx['from'], {})[tx['nonce']] = raw
+            return tx_hash
+
+        self._accept(raw)
+        queued = self.queued.get(tx['from'], {})
+        while self.nonces[tx['from']] in queued:
+            self._accept(queued.pop(self.nonces[tx['from']]))
+        return tx_hash
+
+    def _block_json(self, block: Optional[Dict[str, Any]], full: bool) -> Any:
+        if block is None:
+            return None
+        block = {k: v for k, v in block.items() if k != 'logs'}
+        if full:
+            block['transactions'] = [self.transactions[h] for h in block['transactions']]
+        return self._json(block)
+
+    def _get_block_by_number(self, params: List[Any]) -> Any:
+        if params[0] not in ('latest', 'pending', 'earliest', 'safe', 'finalized') \
+                and _quantity(params[0]) > self.blocks[-1]['number']:
+            return None
+        return self._block_json(self.blocks[self._block_number(params[0])], params[1])
+
+    def _get_block_by_hash(self, params: List[Any]) -> Any:
+        return self._block_json(self.blocks_by_hash.get(params[0]), params[1])
+
+    def _get_logs(self, params: List[Any]) -> List[Dict[str, Any]]:
+        query = params[0] if params else {}
+        addresses = query.get('address')
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {Web3.to_checksum_address(a) for a in addresses} if addresses else None
+        topics = query.get('topics') or []
+
+        if query.get('blockHash'):
+            block = self.blocks_by_hash.get(query['blockHash'])
+            blocks = [block] if block else []
+        else:
+            # A range that starts past the head is empty, not clamped onto
+            # the latest block.
+            start = self._requested_block(query.get('fromBlock', 'latest'))
+            end = self._block_number(query.get('toBlock', 'latest'))
+            blocks = self.blocks[start:end + 1] if start <= end else []
+
+        logs = []
+        for block in blocks:
+            for log in block['logs']:
+                if addresses is not None and log['address'] not in addresses:
+                    continue
+                if any(
+                    wanted is not None and (
+                        i >= len(log['topics'])
+                        or log['topics'][i] not in (wanted if isinstance(wanted, list) else [wanted])
+                    )
+                    for i, wanted in enumerate(topics)
+                ):
+                    continue
+                logs.append(self._json(log))
+        return logs
+
+    def handle_rpc(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        response: Dict[str, Any] = {'jsonrpc': '2.0', 'id': request.get('id')}
+        method = self.methods.get(request.get('method'))
+        if method is None:
+            response['error'] = {'code': -32601, 'message': f"Method {request.get('method')} not found"}
+            return response
+        try:
+            with self._lock:
+                response['result'] = method(request.get('params') or [])
+        except RpcError as e:
+            response['error'] = {'code': e.code, 'message': str(e)}
+            if e.data is not None:
+                response['error']['data'] = e.data
+        except Exception as e:
+            response['error'] = {'code': -32602, 'message': f"Invalid params: {e}"}
+        return response
+
+    # HTTP
+
+    def _handler(self) -> type:
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body: Any) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if node.latency:
+                    time.sleep(node.latency)
+                if self.path.rstrip('/') == '/liveness':
+                    self._reply(200, {'status': 'UP'})
+                else:
+                    self._reply(404, {'error': 'Not found'})
+
+            def do_POST(self):
+                if node.latency:
+                    time.sleep(node.latency)
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    self._reply(400, {'error': 'Invalid JSON'})
+                    return
+
+                if self.path.rstrip('/') == '/login':
+                    username = payload.get('username')
+                    if node.credentials is not None and node.credentials.get(username) != payload.get('password'):
+                        self._reply(401, {'error': 'Invalid credentials'})
+                        return
+                    token = secrets.token_hex(16)
+                    node.tokens.add(token)
+                    self._reply(200, {'token': token})
+                    return
+
+                if node.credentials is not None:
+                    token = self.headers.get('Authorization', '').removeprefix('Bearer ')
+                    if token not in node.tokens:
+                        self._reply(401, {'error': 'Unauthorized'})
+                        return
+
+                if isinstance(payload, list):
+                    self._reply(200, [node.handle_rpc(request) for request in payload])
+                else:
+                    self._reply(200, node.handle_rpc(payload))
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in node for LedgerAdapter")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8545)
+    parser.add_argument('--block-time', type=float, default=0.0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--genesis', help="write the contract addresses and ABIs to this file")
+    args = parser.parse_args(argv)
+
+    node = LocalNode(
+        host=args.host, port=args.port, block_time=args.block_time, latency=args.latency
+    )
+    if args.genesis:
+        with open(args.genesis, 'w', encoding='utf-8') as f:
+            json.dump(node.genesis_contracts(), f, indent=2)
+    node.start()
+    print(f"Local node listening on {node.url}", flush=True)
+    try:
+        node._stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+import json
+import os
+
+from typing import Any, List, Optional
+from web3 import Web3
+
+from .hash_manager import HashManager
+from .models import BlockchainError, BlockchainResponse, MerkleProof
+from .utils import bytes_to_0xhex, canonicalize_json
+
+
+# Leaves and internal nodes are hashed under different prefixes, so an
+# internal node can never be passed off as a leaf (RFC 6962).
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+
+
+def leaf_hash(document: Any) -> bytes:
+    return Web3.keccak(_LEAF_PREFIX + canonicalize_json(document).encode('utf-8'))
+
+
+def _hash_pair(left: bytes, right: bytes) -> bytes:
+    # Pairs are sorted before hashing so a proof needs no left/right flags.
+    if right < left:
+        left, right = right, left
+    return Web3.keccak(_NODE_PREFIX + left + right)
+
+
+def anchored_hash(root: str) -> str:
+    # The root is anchored through HashManager.add, which hashes its text.
+    return bytes_to_0xhex(Web3.keccak(text=root))
+
+
+def compute_root(leaf: str, proof: List[str]) -> str:
+    node = Web3.to_bytes(hexstr=leaf)
+    for sibling in proof:
+        node = _hash_pair(node, Web3.to_bytes(hexstr=sibling))
+    return bytes_to_0xhex(node)
+
+
+class MerkleTree:
+
+    def __init__(self, leaves: List[bytes]):
+        if not leaves:
+            raise ValueError("Cannot build a Merkle tree without leaves")
+        self.levels: List[List[bytes]] = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [
+                _hash_pair(level[i], level[i + 1])
+                for i in range(0, len(level) - 1, 2)
+            ]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> str:
+        return bytes_to_0xhex(self.levels[-1][0])
+
+    def proof(self, index: int) -> MerkleProof:
+        siblings = []
+        position = index
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(level):
+                siblings.append(bytes_to_0xhex(level[sibling]))
+            position //= 2
+        return MerkleProof(
+            index=index,
+            leaf=bytes_to_0xhex(self.levels[0][index]),
+            root=self.root,
+            proof=siblings
+        )
+
+    def save(self, path: str, **metadata: Any) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'root': self.root,
+                'leaves': [bytes_to_0xhex(leaf) for leaf in self.levels[0]],
+                **metadata
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'MerkleTree':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls([Web3.to_bytes(hexstr=leaf) for leaf in data['leaves']])
+
+
+class MerkleBatch:
+
+    def __init__(self,
+                 hash_manager: HashManager,
+                 directory: str):
+        self.hash_manager = hash_manager
+        self.directory = directory
+        self.leaves: List[bytes] = []
+        self.tree: Optional[MerkleTree] = None
+
+    def append(self, document: Any) -> int:
+        self.leaves.append(leaf_hash(document))
+        return len(self.leaves) - 1
+
+    def anchor(self,
+               private_key: str,
+               synchronous: bool = True) -> BlockchainResponse | str:
+        tree = MerkleTree(self.leaves)
+        response = self.hash_manager.add(
+            value=tree.root,
+            private_key=private_key,
+            synchronous=synchronous
+        )
+        # Only a sent or mined root is saved; on failure the leaves stay in
+        # the batch so it can be anchored again.
+        if isinstance(response, BlockchainError):
+            raise response
+        if isinstance(response, BlockchainResponse) and response.status != '1':
+            raise BlockchainError(message="Anchor transaction reverted")
+        transaction_hash = (
+            response.transaction.transaction_hash
+            if isinstance(response, BlockchainResponse) else response
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        tree.save(
+            os.path.join(self.directory, f"{tree.root}.json"),
+            anchored_hash=anchored_hash(tree.root),
+            transaction_hash=transaction_hash
+        )
+        self.tree = tree
+        self.leaves = []
+        return response
+
+    def proof(self, index: int) -> MerkleProof:
+        if self.tree is None:
+            raise ValueError("Batch has not been anchored yet")
+        return self.tree.proof(index)
+
+
+def verify_inclusion(hash_manager: HashManager,
+                     document: Any,
+                     proof: MerkleProof) -> bool:
+    leaf = bytes_to_0xhex(leaf_hash(document))
+    if leaf != proof.leaf or compute_root(leaf, proof.proof) != proof.root:
+        return False
+    try:
+        hash_manager.read(hashed_value=anchored_hash(proof.root))
+    except BlockchainError:
+        return False
+    return True
@@ -0,0 +1,473 @@
+import math
+import threading
+import time
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from web3.middleware import Web3Middleware
+
+from .models import BlockchainError
+
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OTHER_REASON = 'other'
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, Any] = {}
+        self._callbacks: List[Callable[[], Dict[Labels, float]]] = []
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Labels:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels {list(self.label_names)}, got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def add_callback(self, callback: Callable[[], Dict[Labels, float]]) -> '_Metric':
+        # Callbacks are evaluated on every collection, for values that are
+        # cheaper to read when scraped than to keep up to date.
+        with self._lock:
+            self._callbacks.append(callback)
+        return self
+
+    def samples(self) -> Dict[Labels, float]:
+        with self._lock:
+            values = dict(self._values)
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            for key, value in callback().items():
+                values[key] = values.get(key, 0) + value
+        return values
+
+    def get(self, **labels: Any) -> float:
+        return self.samples().get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self.samples().items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        if list(buckets) != sorted(buckets):
+            raise ValueError("Histogram buckets must be sorted")
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels: Any) -> Optional[Dict[str, Any]]:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                return None
+            return {'buckets': list(state[0]), 'sum': state[1], 'count': state[2]}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            states = {key: (list(state[0]), state[1], state[2]) for key, state in self._values.items()}
+        for key, (counts, total, count) in sorted(states.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, documentation: str,
+                       label_names: Sequence[str], **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, label_names, **kwargs)
+            elif type(metric) is not cls or metric.label_names != tuple(label_names):
+                raise ValueError(f"Metric '{name}' is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, label_names)
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, label_names)
+
+    def histogram(self,
+                  name: str,
+                  documentation: str,
+                  label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, label_names, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1', port: int = 0):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def __enter__(self) -> 'MetricsServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> 'MetricsServer':
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                payload = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class MetricsMiddleware(Web3Middleware):
+
+    def __init__(self, w3: Any, metrics: 'ContractMetrics'):
+        super().__init__(w3)
+        self.metrics = metrics
+
+    def wrap_make_request(self, make_request: Callable) -> Callable:
+        def middleware(method: str, params: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                response = make_request(method, params)
+            except Exception:
+                self.metrics.observe_rpc(method, time.perf_counter() - start, error=True)
+                raise
+            error = isinstance(response, dict) and 'error' in response
+            self.metrics.observe_rpc(method, time.perf_counter() - start, error=error)
+            return response
+        return middleware
+
+
+class ContractMetrics:
+    # Metric families are shared through the registry, so several contracts
+    # reporting to one registry are told apart by the `contract` label.
+
+    def __init__(self,
+                 registry: MetricsRegistry,
+                 contract: str,
+                 max_reasons: int = 100,
+                 refresh_interval: float = 5.0,
+                 max_in_flight_age: float = 600.0):
+        self.registry = registry
+        self.contract = contract
+        self.max_reasons = max_reasons
+        self.refresh_interval = refresh_interval
+        self.max_in_flight_age = max_in_flight_age
+        self._reasons: Set[str] = set()
+        self._in_flight: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._last_refresh = time.monotonic()
+        self._local = threading.local()
+
+        self.rpc_duration = registry.histogram(
+            'ledger_adapter_rpc_duration_seconds',
+            "JSON-RPC request latency by method",
+            ('contract', 'method')
+        )
+        self.rpc_errors = registry.counter(
+            'ledger_adapter_rpc_errors_total',
+            "JSON-RPC requests that failed or returned an error",
+            ('contract', 'method')
+        )
+        self.operation_duration = registry.histogram(
+            'ledger_adapter_operation_duration_seconds',
+            "Latency of execute, call and event operations",
+            ('contract', 'operation')
+        )
+        self.errors = registry.counter(
+            'ledger_adapter_errors_total',
+            "BlockchainErrors raised by operations, by reason",
+            ('contract', 'operation', 'reason')
+        )
+        self.transactions_sent = registry.counter(
+            'ledger_adapter_transactions_sent_total',
+            "Raw transactions accepted by the node",
+            ('contract',)
+        )
+        self.in_flight = registry.gauge(
+            'ledger_adapter_transactions_in_flight',
+            "Transactions sent whose receipt has not been waited for yet",
+            ('contract',)
+        ).add_callback(self._in_flight_sample)
+        self.event_scan_block = registry.gauge(
+            'ledger_adapter_event_scan_block',
+            "Last block covered by an event scan",
+            ('contract',)
+        )
+        self.event_scan_target = registry.gauge(
+            'ledger_adapter_event_scan_target_block',
+            "Block an event scan is working towards",
+            ('contract',)
+        )
+        self.events_scanned = registry.counter(
+            'ledger_adapter_events_scanned_total',
+            "Events returned by event scans",
+            ('contract',)
+        )
+
+    def _in_flight_sample(self) -> Dict[Labels, float]:
+        with self._lock:
+            return {(self.contract,): len(self._in_flight)}
+
+    def observe_rpc(self, method: str, seconds: float, error: bool = False) -> None:
+        self.rpc_duration.observe(seconds, contract=self.contract, method=method)
+        if error:
+            self.rpc_errors.inc(contract=self.contract, method=method)
+
+    def _reason(self, error: BlockchainError) -> str:
+        # Error messages can embed hashes or block numbers; cap the number
+        # of distinct label values so a noisy node cannot grow the registry.
+        reason = error.message
+        with self._lock:
+            if reason in self._reasons:
+                return reason
+            if len(self._reasons) < self.max_reasons:
+                self._reasons.add(reason)
+                return reason
+        return OTHER_REASON
+
+    def record_error(self, operation: str, error: BlockchainError) -> None:
+        self.errors.inc(contract=self.contract, operation=operation, reason=self._reason(error))
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        # Only the outermost operation on a thread is measured, matching how
+        # Instrumentation folds nested operations into one trace.
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        except BlockchainError as e:
+            if depth == 0:
+                self.record_error(name, e)
+            raise
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self.operation_duration.observe(
+                    time.perf_counter() - start, contract=self.contract, operation=name
+                )
+
+    def sent(self, tx_hash: str) -> None:
+        self.transactions_sent.inc(contract=self.contract)
+        with self._lock:
+            self._in_flight[tx_hash] = time.monotonic()
+
+    def settled(self, tx_hash: str) -> None:
+        with self._lock:
+            self._in_flight.pop(tx_hash, None)
+
+    def refresh(self, fetch_receipts: Callable[[List[str]], List[Any]], force: bool = False) -> None:
+        # Asynchronous writes never pass through wait_for_receipt, so their
+        # receipts are polled in one batch at most every refresh_interval.
+        # Transactions the node has dropped would never get a receipt and
+        # are expired after max_in_flight_age instead.
+        if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            self._last_refresh = now = time.monotonic()
+            with self._lock:
+                for tx_hash, sent_at in list(self._in_flight.items()):
+                    if now - sent_at > self.max_in_flight_age:
+                        del self._in_flight[tx_hash]
+                pending = list(self._in_flight)
+            if not pending:
+                return
+            try:
+                receipts = fetch_receipts(pending)
+            except Exception:
+                # Bookkeeping must not fail a write; the next refresh retries.
+                return
+            for tx_hash, receipt in zip(pending, receipts):
+                if receipt is not None:
+                    self.settled(tx_hash)
+        finally:
+            self._refreshing.release()
+
+    def scan_progress(self, block: int, target: int, events: int) -> None:
+        self.event_scan_block.set(block, contract=self.contract)
+        self.event_scan_target.set(target, contract=self.contract)
+        self.events_scanned.inc(events, contract=self.contract)
+
+
+def track_block_cache(registry: MetricsRegistry, cache: Any, contract: str) -> None:
+    registry.counter(
+        'ledger_adapter_block_header_cache_hits_total',
+        "Block header lookups served from the cache",
+        ('contract',)
+    ).add_callback(lambda: {(contract,): cache.hits})
+    registry.counter(
+        'ledger_adapter_block_header_cache_misses_total',
+        "Block header lookups that had to be fetched",
+        ('contract',)
+    ).add_callback(lambda: {(contract,): cache.misses})
+
+
+def track_connection(registry: MetricsRegistry, connection: Any) -> None:
+    node_url = connection.node_url
+    registry.gauge(
+        'ledger_adapter_http_requests_in_flight',
+        "HTTP requests to the node in progress, one pooled connection each",
+        ('node',)
+    ).add_callback(lambda: {(node_url,): connection.active_requests})
+    registry.gauge(
+        'ledger_adapter_http_pool_max_size',
+        "Connections kept per host by the HTTP pool",
+        ('node',)
+    ).add_callback(lambda: {(node_url,): connection.pool_maxsize})
+
+
+def track_sender_pool(registry: MetricsRegistry, sender_pool: Any) -> None:
+    registry.gauge(
+        'ledger_adapter_sender_in_flight',
+        "Transactions in flight per SenderPool account",
+        ('account',)
+    ).add_callback(lambda: {(account,): load for account, load in sender_pool.in_flight().items()})
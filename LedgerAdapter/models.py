@@ -1,29 +1,29 @@
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockchainValue:
     value: Any
 
-@dataclass
+@dataclass(slots=True)
 class BlockDetails:
     block_hash: str
     block_number: str
 
-@dataclass
+@dataclass(slots=True)
 class TransactionDetails:
     transaction_hash: str
     from_address: str
     to_address: str
     gas_used: str
 
-@dataclass
+@dataclass(slots=True)
 class EventDetails:
     event_name: str
     event_results: list
 
-@dataclass
+@dataclass(slots=True)
 class BlockchainResponse:
     status: str
     block: BlockDetails
@@ -39,6 +39,12 @@ class BlockchainError(Exception):
         return self.message
 
 @dataclass
+class NotSentError(BlockchainError):
+    # A batch item that never reached the node because an earlier send in
+    # the same batch was rejected; it is safe to submit again.
+    message: str = "Not sent: an earlier transaction in the batch was rejected"
+
+@dataclass(slots=True)
 class EventData:
     address: str
     block_hash: str
@@ -47,3 +53,74 @@ class EventData:
     event_args: Dict[str, Any]
     transaction_hash: str
     log_index: str
+    # Only set with with_timestamps=True; omitted from serialized output otherwise.
+    timestamp: Optional[str] = field(default=None, metadata={'omit_none': True})
+
+@dataclass(slots=True)
+class JournalEntry:
+    tx_hash: str
+    nonce: int
+    account: str
+    payload_hash: str
+    status: str
+
+@dataclass(slots=True)
+class MerkleProof:
+    index: int
+    leaf: str
+    root: str
+    proof: list[str]
+
+
+@dataclass(slots=True)
+class DagTraversal:
+    root: str
+    block_number: int
+    levels: list[list[str]]
+    links: Dict[str, list[str]]
+    errors: Dict[str, str] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class ImportItem:
+    kind: str
+    key: str
+    status: str
+    transaction_hash: Optional[str] = None
+    error: Optional[str] = None
+
+# Raw variants keep ints and 32-byte values exactly as web3 returns them,
+# skipping the str/0x-hex conversion for consumers that only forward data.
+@dataclass(slots=True, frozen=True)
+class RawBlockDetails:
+    block_hash: bytes
+    block_number: int
+
+@dataclass(slots=True, frozen=True)
+class RawTransactionDetails:
+    transaction_hash: bytes
+    from_address: str
+    to_address: str
+    gas_used: int
+
+@dataclass(slots=True, frozen=True)
+class RawEventDetails:
+    event_name: str
+    event_results: Dict[str, Any]
+
+@dataclass(slots=True, frozen=True)
+class RawBlockchainResponse:
+    status: int
+    block: RawBlockDetails
+    transaction: RawTransactionDetails
+    events: list[RawEventDetails]
+
+@dataclass(slots=True, frozen=True)
+class RawEventData:
+    address: str
+    block_hash: bytes
+    block_number: int
+    event_name: str
+    event_args: Dict[str, Any]
+    transaction_hash: bytes
+    log_index: int
+    timestamp: Optional[int] = field(default=None, metadata={'omit_none': True})
@@ -0,0 +1,127 @@
+import heapq
+import threading
+import time
+
+from eth_account import Account
+from typing import Dict, List, Optional, Set
+from web3 import Web3
+
+
+class SenderLane:
+
+    def __init__(self, private_key: str):
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+        self.next_nonce: Optional[int] = None
+        self.reserved = 0
+        self.in_flight: Set[str] = set()
+        self.gaps: List[int] = []
+        self._lock = threading.Lock()
+
+    @property
+    def load(self) -> int:
+        return self.reserved + len(self.in_flight)
+
+    def reserve_nonce(self, w3: Web3) -> int:
+        with self._lock:
+            if self.gaps:
+                return heapq.heappop(self.gaps)
+            if self.next_nonce is None:
+                self.next_nonce = w3.eth.get_transaction_count(self.address, 'pending')
+            nonce = self.next_nonce
+            self.next_nonce += 1
+            return nonce
+
+    def release_nonce(self, nonce: int) -> bool:
+        # Only the most recently reserved nonce can be rewound. Any earlier
+        # one sits below nonces other workers already hold, so the caller
+        # has to fill it instead.
+        with self._lock:
+            if self.next_nonce is not None and nonce == self.next_nonce - 1:
+                self.next_nonce = nonce
+                return True
+            return False
+
+    def reuse_nonce(self, nonce: int) -> None:
+        with self._lock:
+            heapq.heappush(self.gaps, nonce)
+
+
+class SenderPool:
+
+    def __init__(self,
+                 private_keys: List[str],
+                 refresh_interval: float = 5.0,
+                 batch_size: int = 500):
+        if not private_keys:
+            raise ValueError("SenderPool requires at least one private key")
+        self.lanes = [SenderLane(private_key) for private_key in private_keys]
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self._pending: Dict[str, SenderLane] = {}
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._last_refresh = time.monotonic()
+
+    def acquire(self) -> SenderLane:
+        with self._lock:
+            lane = min(self.lanes, key=lambda lane: lane.load)
+            lane.reserved += 1
+            return lane
+
+    def release(self, lane: SenderLane) -> None:
+        with self._lock:
+            lane.reserved -= 1
+
+    def track(self, lane: SenderLane, tx_hash: str) -> None:
+        with self._lock:
+            lane.reserved -= 1
+            lane.in_flight.add(tx_hash)
+            self._pending[tx_hash] = lane
+
+    def complete(self, tx_hash: str) -> None:
+        with self._lock:
+            lane = self._pending.pop(tx_hash, None)
+            if lane is not None:
+                lane.in_flight.discard(tx_hash)
+
+    def refresh(self, w3: Web3) -> int:
+        # Settle every pending transaction that has a receipt, polling them
+        # with batched eth_getTransactionReceipt requests.
+        with self._lock:
+            pending = list(self._pending)
+        settled = 0
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            responses = w3.provider.make_batch_request([
+                ('eth_getTransactionReceipt', [tx_hash]) for tx_hash in chunk
+            ])
+            if isinstance(responses, dict):
+                error = responses.get('error') or {}
+                raise ConnectionError(error.get('message', 'Batch request failed'))
+            for tx_hash, response in zip(chunk, responses):
+                if response.get('result') is not None:
+                    self.complete(tx_hash)
+                    settled += 1
+        return settled
+
+    def refresh_if_due(self, w3: Web3) -> None:
+        # Called on the write path so asynchronous writes settle without the
+        # caller polling; one thread refreshes while the others carry on.
+        if time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            self._last_refresh = time.monotonic()
+            if self._pending:
+                self.refresh(w3)
+        except Exception:
+            # Bookkeeping must not fail a write; the next refresh retries.
+            pass
+        finally:
+            self._refreshing.release()
+
+    def in_flight(self) -> Dict[str, int]:
+        with self._lock:
+            return {lane.address: lane.load for lane in self.lanes}
@@ -0,0 +1,102 @@
+import dataclasses
+import json
+
+from typing import Any, Dict, IO, Iterable, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+BACKENDS = ('json', 'orjson', 'msgspec')
+
+# Field names per class, computed once, each paired with whether the field
+# is left out when it is None; non-dataclass types map to None.
+_FIELDS: Dict[type, Tuple[Tuple[str, bool], ...] | None] = {}
+
+
+def _field_names(cls: type) -> Tuple[Tuple[str, bool], ...] | None:
+    try:
+        return _FIELDS[cls]
+    except KeyError:
+        names = None
+        if dataclasses.is_dataclass(cls):
+            names = tuple(
+                (field.name, field.metadata.get('omit_none', False))
+                for field in dataclasses.fields(cls)
+            )
+        _FIELDS[cls] = names
+        return names
+
+
+def to_builtins(obj: Any) -> Any:
+    # Unlike dataclasses.asdict this walks only what it must: model fields
+    # and lists of models. Plain dicts and scalars are passed through
+    # without being copied, since the JSON encoder only reads them.
+    names = _field_names(type(obj))
+    if names is not None:
+        fields = {}
+        for name, omit_none in names:
+            value = getattr(obj, name)
+            if value is None and omit_none:
+                continue
+            fields[name] = to_builtins(value)
+        return fields
+    if isinstance(obj, (list, tuple)):
+        return [to_builtins(item) for item in obj]
+    return obj
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (bytes, bytearray)):
+        return '0x' + obj.hex()
+    names = _field_names(type(obj))
+    if names is not None:
+        return to_builtins(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _require(backend: str) -> None:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    if backend == 'orjson' and orjson is None:
+        raise ImportError("The 'orjson' backend requires orjson (pip install orjson)")
+    if backend == 'msgspec' and msgspec is None:
+        raise ImportError("The 'msgspec' backend requires msgspec (pip install msgspec)")
+
+
+def dumps(obj: Any, compact: bool = False, backend: str = 'json') -> str:
+    _require(backend)
+    # Every backend encodes the to_builtins form, so fields omitted when
+    # None are omitted the same way whichever library writes them.
+    if backend == 'orjson':
+        option = 0 if compact else orjson.OPT_INDENT_2
+        return orjson.dumps(to_builtins(obj), default=_default, option=option).decode('utf-8')
+    if backend == 'msgspec':
+        encoded = msgspec.json.encode(to_builtins(obj), enc_hook=_default)
+        if not compact:
+            encoded = msgspec.json.format(encoded, indent=2)
+        return encoded.decode('utf-8')
+    if compact:
+        return json.dumps(to_builtins(obj), separators=(',', ':'), default=_default)
+    return json.dumps(to_builtins(obj), indent=2, default=_default)
+
+
+def iter_ndjson(objs: Iterable[Any], backend: str = 'json') -> Iterator[str]:
+    _require(backend)
+    for obj in objs:
+        yield dumps(obj, compact=True, backend=backend) + '\n'
+
+
+def dump_ndjson(objs: Iterable[Any], fp: IO[str], backend: str = 'json') -> int:
+    count = 0
+    for line in iter_ndjson(objs, backend=backend):
+        fp.write(line)
+        count += 1
+    return count
@@ -0,0 +1,64 @@
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from eth_account import Account
+
+
+# Per-process state, populated once by the pool initializer so the key is
+# not parsed (nor pickled) again for every transaction.
+_worker_account = None
+
+
+def _init_worker(private_key: str) -> None:
+    global _worker_account
+    _worker_account = Account.from_key(private_key)
+
+
+def _sign_transaction(transaction: Dict) -> bytes:
+    return bytes(_worker_account.sign_transaction(transaction).raw_transaction)
+
+
+class SigningPipeline:
+
+    def __init__(self,
+                 private_key: str,
+                 max_workers: Optional[int] = None,
+                 chunksize: int = 16):
+        self.private_key = private_key
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'SigningPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.private_key,)
+                )
+            return self._executor
+
+    def sign(self, transactions: Iterable[Dict]) -> Iterator[bytes]:
+        ordered: List[Dict] = sorted(transactions, key=lambda tx: tx['nonce'])
+        executor = self._get_executor()
+        # map() yields results in submission order, so raw transactions come
+        # back in nonce order even though workers finish out of order.
+        yield from executor.map(
+            _sign_transaction, ordered, chunksize=self.chunksize
+        )
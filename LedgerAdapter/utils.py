@@ -1,28 +1,128 @@
 import ast
 import jcs
-import json
 import time
 
-from dataclasses import asdict
-from hexbytes import HexBytes
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from .models import BlockchainError, EventData
-from .connection import Connection
+from .models import BlockchainError, EventData, RawEventData
+from .serialization import dumps
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+
+def _bytes_to_0xhex_bytes(value):
+    return '0x' + value.hex()
+
+
+def _bytes_to_0xhex_dict(value):
+    converted = {}
+    changed = False
+    for k, v in value.items():
+        new_k = bytes_to_0xhex(k)
+        new_v = bytes_to_0xhex(v)
+        changed = changed or new_k is not k or new_v is not v
+        converted[new_k] = new_v
+    return converted if changed else value
+
+
+def _bytes_to_0xhex_sequence(value):
+    # Lists of bytes32 (hash lists, outgoing links) are hexed in one pass
+    # over a contiguous buffer instead of one dispatch per item.
+    if value and set(map(type, value)) <= _BYTES_TYPES and set(map(len, value)) == {32}:
+        joined = b''.join(value).hex(' ', 32)
+        return type(value)(('0x' + joined.replace(' ', ' 0x')).split(' '))
+    converted = [bytes_to_0xhex(v) for v in value]
+    if all(new_v is v for new_v, v in zip(converted, value)):
+        return value
+    return type(value)(converted)
+
+
+def _identity(value):
+    return value
+
+
+# Bytes subclasses such as HexBytes are added on first sight by
+# bytes_to_0xhex, so this module does not have to import hexbytes.
+_BYTES_TYPES = {bytes}
+
+_TO_0XHEX = {
+    bytes: _bytes_to_0xhex_bytes,
+    dict: _bytes_to_0xhex_dict,
+    list: _bytes_to_0xhex_sequence,
+    tuple: _bytes_to_0xhex_sequence,
+    str: _identity,
+    int: _identity,
+    bool: _identity,
+    float: _identity,
+    type(None): _identity,
+}
 
 
 def bytes_to_0xhex(value):
+    handler = _TO_0XHEX.get(type(value))
+    if handler is not None:
+        return handler(value)
+    # Subclasses of the dispatched types keep the original isinstance rules.
     if isinstance(value, dict):
         return {bytes_to_0xhex(k): bytes_to_0xhex(v) for k, v in value.items()}
     if isinstance(value, (list, tuple)):
         converted = [bytes_to_0xhex(v) for v in value]
         return type(value)(converted)
-    if isinstance(value, (HexBytes, bytes)):
+    if isinstance(value, bytes):
+        _BYTES_TYPES.add(type(value))
+        _TO_0XHEX[type(value)] = _bytes_to_0xhex_bytes
         return '0x' + value.hex()
     return value
 
 
+def _hex0x_to_bytes_str(value):
+    if value.startswith('0x'):
+        return bytes.fromhex(value[2:])
+    return value
+
+
+def _hex0x_to_bytes_dict(value):
+    converted = {}
+    changed = False
+    for k, v in value.items():
+        new_k = hex0x_to_bytes(k)
+        new_v = hex0x_to_bytes(v)
+        changed = changed or new_k is not k or new_v is not v
+        converted[new_k] = new_v
+    return converted if changed else value
+
+
+def _hex0x_to_bytes_sequence(value):
+    if value and set(map(type, value)) == {str} and set(map(len, value)) == {66}:
+        if all(v.startswith('0x') for v in value):
+            # Only the leading prefix is cut, so a stray '0x' inside an item
+            # reaches fromhex and raises instead of shifting later items.
+            decoded = bytes.fromhex(''.join(v[2:] for v in value))
+            return type(value)(decoded[i:i + 32] for i in range(0, len(decoded), 32))
+    converted = [hex0x_to_bytes(v) for v in value]
+    if all(new_v is v for new_v, v in zip(converted, value)):
+        return value
+    return type(value)(converted)
+
+
+_FROM_0XHEX = {
+    str: _hex0x_to_bytes_str,
+    dict: _hex0x_to_bytes_dict,
+    list: _hex0x_to_bytes_sequence,
+    tuple: _hex0x_to_bytes_sequence,
+    bytes: _identity,
+    int: _identity,
+    bool: _identity,
+    float: _identity,
+    type(None): _identity,
+}
+
+
 def hex0x_to_bytes(value):
+    handler = _FROM_0XHEX.get(type(value))
+    if handler is not None:
+        return handler(value)
     if isinstance(value, dict):
         return {hex0x_to_bytes(k): hex0x_to_bytes(v) for k, v in value.items()}
     if isinstance(value, (list, tuple)):
@@ -34,6 +134,22 @@ def hex0x_to_bytes(value):
 
 
 
+def digest_to_bytes(digest: bytes | str) -> bytes:
+    if isinstance(digest, (bytes, bytearray)):
+        if len(digest) != 32:
+            raise ValueError(f"Digest must be 32 bytes, got {len(digest)}")
+        return bytes(digest)
+    if isinstance(digest, str) and len(digest) == 66 and digest[:2] in ('0x', '0X'):
+        try:
+            result = bytes.fromhex(digest[2:])
+        except ValueError:
+            result = b''
+        # fromhex skips whitespace, so 66 characters can decode short.
+        if len(result) == 32:
+            return result
+    raise ValueError(f"Digest must be 32 bytes or a 0x-prefixed 64-digit hex string: {digest!r}")
+
+
 def parse_error(error: Exception) -> BlockchainError:
     try:
         error_details = error.args[0]
@@ -53,7 +169,7 @@ def parse_error(error: Exception) -> BlockchainError:
 
 
 def wait_for_liveness(
-        connection: Connection,
+        connection: 'Connection',
         timeout: int = 30,
         poll_interval: float = 1.0
         ) -> None:
@@ -85,15 +201,26 @@ def parse_event_data(log) -> EventData:
         block_number=str(log.blockNumber),
         event_name=log.event,
         event_args={
-            k: bytes_to_0xhex(v) if isinstance(v, (bytes, HexBytes)) else v
+            k: bytes_to_0xhex(v) if isinstance(v, bytes) else v
             for k, v in dict(log.args).items()
         },
         transaction_hash=bytes_to_0xhex(log.transactionHash),
         log_index=str(log.logIndex)
     )
 
+def parse_raw_event_data(log) -> RawEventData:
+    return RawEventData(
+        address=log.address,
+        block_hash=log.blockHash,
+        block_number=log.blockNumber,
+        event_name=log.event,
+        event_args=dict(log.args),
+        transaction_hash=log.transactionHash,
+        log_index=log.logIndex
+    )
+
 def canonicalize_json(json_data: Any) -> str:
     return jcs.canonicalize(json_data).decode('utf-8')
 
 def pretty(obj) -> str:
-    return json.dumps(asdict(obj), indent=2)
\ No newline at end of file
+    return dumps(obj)
\ No newline at end of file
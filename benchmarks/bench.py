@@ -0,0 +1,158 @@
+import argparse
+import json
+import sys
+
+from typing import List, Optional
+
+from web3 import Web3
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.utils import wait_for_liveness
+
+import harness
+import micro  # noqa: F401  (registers benchmarks)
+import macro  # noqa: F401  (registers benchmarks)
+import startup  # noqa: F401  (registers benchmarks)
+
+
+PRIVATE_KEY = "0x3f9d4328d47d5aa8b84c4716679a78fc21eab62be253b99315e4fa924d07559f"
+
+
+class Context:
+    # Node-backed state is created on first use, so micro-only runs that do
+    # not need a receipt never start a node.
+
+    def __init__(self,
+                 node_url: Optional[str] = None,
+                 genesis_path: Optional[str] = None,
+                 block_time: float = 0.0,
+                 latency: float = 0.0,
+                 private_key: str = PRIVATE_KEY):
+        self.node_url = node_url
+        self.genesis_path = genesis_path
+        self.block_time = block_time
+        self.latency = latency
+        self.private_key = private_key
+        self.node: Optional[LocalNode] = None
+        self._hash_manager: Optional[HashManager] = None
+        self._hashes: List[str] = []
+        self._receipt = None
+
+    @property
+    def hash_manager(self) -> HashManager:
+        if self._hash_manager is None:
+            if self.node_url is None:
+                self.node = LocalNode(block_time=self.block_time, latency=self.latency).start()
+                node_url = self.node.url
+                genesis = self.node.genesis_contracts()
+            else:
+                node_url = self.node_url
+                with open(self.genesis_path, 'r', encoding='utf-8') as f:
+                    genesis = json.load(f)
+            connection = Connection(node_url=node_url)
+            wait_for_liveness(connection)
+            self._hash_manager = HashManager(
+                node_connection=connection,
+                contract_address=genesis['HashManager']['address'],
+                contract_abi=genesis['HashManager']['abi']
+            )
+        return self._hash_manager
+
+    def ensure_hashes(self, n: int) -> List[str]:
+        missing = n - len(self._hashes)
+        if missing > 0:
+            values = [f"bench-fixture-{len(self._hashes) + i}-{id(self)}" for i in range(missing)]
+            self.hash_manager.add_many(values, self.private_key, synchronous=True)
+            self._hashes.extend(Web3.keccak(text=v).to_0x_hex() for v in values)
+        return self._hashes[:n]
+
+    def sample_receipt(self):
+        if self._receipt is None:
+            tx_hash = self.hash_manager.add(f"bench-receipt-{id(self)}", self.private_key)
+            self._receipt = self.hash_manager.w3.eth.wait_for_transaction_receipt(tx_hash)
+        return self._receipt
+
+    def sample_event_log(self):
+        return self.hash_manager.contract.events.HashAdded().process_receipt(self.sample_receipt())[0]
+
+    def close(self) -> None:
+        if self._hash_manager is not None:
+            self._hash_manager.close()
+        if self.node is not None:
+            self.node.stop()
+
+
+def _run(args: argparse.Namespace) -> int:
+    names = [
+        name for name in harness.REGISTRY
+        if (args.suite == 'all' or name.startswith(args.suite + '.'))
+        and (args.filter is None or args.filter in name)
+    ]
+    context = Context(
+        node_url=args.node_url,
+        genesis_path=args.genesis,
+        block_time=args.block_time,
+        latency=args.latency
+    )
+
+    def report(name, result):
+        print(
+            f"{name:<45} {harness.format_seconds(result['seconds_per_op']):>12}/op "
+            f"{result['ops_per_second']:>14,.1f} ops/s",
+            flush=True
+        )
+
+    try:
+        results = harness.run(context, names, repeat=args.repeat, min_time=args.min_time, report=report)
+    finally:
+        context.close()
+    if args.output:
+        harness.save(results, args.output)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    rows = harness.compare(harness.load(args.baseline), harness.load(args.current), args.threshold)
+    regressions = 0
+    for name, row in rows.items():
+        change = '-' if row['change'] is None else f"{row['change']:+.1%}"
+        flag = 'REGRESSION' if row['regression'] else ''
+        regressions += row['regression']
+        print(
+            f"{name:<45} {harness.format_seconds(row['baseline']):>12} "
+            f"{harness.format_seconds(row['current']):>12} {change:>8} {flag}"
+        )
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="LedgerAdapter benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run benchmarks and optionally store a JSON baseline")
+    run.add_argument('--suite', choices=('micro', 'macro', 'startup', 'all'), default='all')
+    run.add_argument('--filter', help="only run benchmarks whose name contains this text")
+    run.add_argument('--output', help="write results to this JSON file")
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--min-time', type=float, default=0.2)
+    run.add_argument('--node-url', help="benchmark a running node instead of a local stand-in")
+    run.add_argument('--genesis', default='/app/genesis-contracts.json')
+    run.add_argument('--block-time', type=float, default=0.0)
+    run.add_argument('--latency', type=float, default=0.0)
+    run.set_defaults(handler=_run)
+
+    compare = commands.add_parser('compare', help="compare two result files and flag regressions")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help="flag results slower than the baseline by more than this fraction")
+    compare.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
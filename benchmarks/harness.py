@@ -0,0 +1,115 @@
+import json
+import platform
+import statistics
+import sys
+import time
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# A factory receives the shared context and returns the callable to time
+# plus how many operations one call performs.
+Factory = Callable[[Any], Tuple[Callable[[], Any], int]]
+
+REGISTRY: Dict[str, Factory] = {}
+
+
+def benchmark(name: str) -> Callable[[Factory], Factory]:
+    def register(factory: Factory) -> Factory:
+        REGISTRY[name] = factory
+        return factory
+    return register
+
+
+def measure(fn: Callable[[], Any],
+            ops: int = 1,
+            repeat: int = 5,
+            min_time: float = 0.2) -> Dict[str, Any]:
+    # Calibrate like timeit.autorange: grow the loop count until one sample
+    # lasts at least min_time, then take `repeat` samples of that size.
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = [elapsed / number / ops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number / ops)
+
+    median = statistics.median(samples)
+    return {
+        'seconds_per_op': median,
+        'ops_per_second': 1 / median if median else float('inf'),
+        'min': min(samples),
+        'max': max(samples),
+        'number': number,
+        'repeat': repeat,
+        'ops': ops,
+    }
+
+
+def run(context: Any,
+        names: Optional[list] = None,
+        repeat: int = 5,
+        min_time: float = 0.2,
+        report: Callable[[str, Dict[str, Any]], None] = lambda name, result: None
+        ) -> Dict[str, Any]:
+    results = {}
+    for name in names if names is not None else REGISTRY:
+        fn, ops = REGISTRY[name](context)
+        results[name] = measure(fn, ops=ops, repeat=repeat, min_time=min_time)
+        report(name, results[name])
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'timestamp': int(time.time()),
+        },
+        'results': results,
+    }
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any],
+            current: Dict[str, Any],
+            threshold: float = 0.10) -> Dict[str, Dict[str, Any]]:
+    rows = {}
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            rows[name] = {'baseline': None, 'current': result['seconds_per_op'], 'change': None, 'regression': False}
+            continue
+        change = result['seconds_per_op'] / base['seconds_per_op'] - 1
+        rows[name] = {
+            'baseline': base['seconds_per_op'],
+            'current': result['seconds_per_op'],
+            'change': change,
+            'regression': change > threshold,
+        }
+    return rows
+
+
+def format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return '-'
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value / 1e-9:.0f} ns"
@@ -0,0 +1,49 @@
+import itertools
+
+from web3 import Web3
+
+from harness import benchmark
+
+
+BATCH_SIZE = 100
+
+_counter = itertools.count()
+
+
+def _fresh_values(n):
+    return [f"bench-{next(_counter)}" for _ in range(n)]
+
+
+@benchmark('macro.write_tps.execute_many')
+def write_tps(context):
+    def write():
+        context.hash_manager.add_many(_fresh_values(BATCH_SIZE), context.private_key, synchronous=True)
+    return write, BATCH_SIZE
+
+
+@benchmark('macro.receipt_latency.add')
+def receipt_latency(context):
+    def write():
+        context.hash_manager.add(_fresh_values(1)[0], context.private_key, synchronous=True)
+    return write, 1
+
+
+@benchmark('macro.read_qps.call_many')
+def read_qps(context):
+    hashed_values = context.ensure_hashes(BATCH_SIZE)
+    read = context.hash_manager.contract.functions.read
+    functions = [read(Web3.to_bytes(hexstr=h)) for h in hashed_values]
+    return lambda: context.hash_manager.call_many(functions), BATCH_SIZE
+
+
+@benchmark('macro.read_latency.read')
+def read_latency(context):
+    hashed_value = context.ensure_hashes(1)[0]
+    return lambda: context.hash_manager.read(hashed_value), 1
+
+
+@benchmark('macro.event_scan.get_events')
+def event_scan(context):
+    context.ensure_hashes(BATCH_SIZE)
+    events = len(context.hash_manager.get_events(event_name='HashAdded'))
+    return lambda: context.hash_manager.get_events(event_name='HashAdded'), events
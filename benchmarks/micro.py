@@ -0,0 +1,76 @@
+import os
+
+from web3 import Web3
+
+from LedgerAdapter.hashing import hash_canonical_json
+from LedgerAdapter.serialization import dumps
+from LedgerAdapter.utils import bytes_to_0xhex, canonicalize_json, hex0x_to_bytes, parse_event_data
+
+from harness import benchmark
+
+
+DIGESTS = [os.urandom(32) for _ in range(1000)]
+HEX_DIGESTS = ['0x' + d.hex() for d in DIGESTS]
+
+DOCUMENT = {
+    'id': 'item-0001',
+    'status': 'active',
+    'version': 3,
+    'metadata': {'owner': 'Alice', 'tags': ['supply-chain', 'verified'], 'score': 0.875},
+    'items': [{'sku': f"sku-{i}", 'quantity': i, 'price': i * 1.25} for i in range(200)],
+}
+
+
+@benchmark('micro.bytes_to_0xhex.bytes32_list')
+def bytes32_list(context):
+    return lambda: bytes_to_0xhex(DIGESTS), len(DIGESTS)
+
+
+@benchmark('micro.bytes_to_0xhex.event_args')
+def event_args(context):
+    args = {'hashValue': DIGESTS[0], 'owner': '0x' + '11' * 20, 'links': DIGESTS[:8]}
+    return lambda: bytes_to_0xhex(args), 1
+
+
+@benchmark('micro.hex0x_to_bytes.bytes32_list')
+def hex_list(context):
+    return lambda: hex0x_to_bytes(HEX_DIGESTS), len(HEX_DIGESTS)
+
+
+@benchmark('micro.canonicalize_json')
+def canonicalize(context):
+    return lambda: canonicalize_json(DOCUMENT), 1
+
+
+@benchmark('micro.keccak_canonical_json')
+def keccak_canonical(context):
+    return lambda: Web3.keccak(text=canonicalize_json(DOCUMENT)), 1
+
+
+@benchmark('micro.hash_canonical_json')
+def hash_canonical(context):
+    return lambda: hash_canonical_json(DOCUMENT), 1
+
+
+@benchmark('micro.parse_receipt_events')
+def parse_events(context):
+    receipt = context.sample_receipt()
+    return lambda: context.hash_manager._parse_events(receipt), 1
+
+
+@benchmark('micro.parse_event_data')
+def parse_event(context):
+    log = context.sample_event_log()
+    return lambda: parse_event_data(log), 1
+
+
+@benchmark('micro.parse_receipt')
+def parse_receipt(context):
+    receipt = context.sample_receipt()
+    return lambda: context.hash_manager._parse_receipt(receipt), 1
+
+
+@benchmark('micro.serialization.dumps_response')
+def dumps_response(context):
+    response = context.hash_manager._parse_receipt(context.sample_receipt())
+    return lambda: dumps(response, compact=True), 1
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+from harness import benchmark
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each sample is a fresh interpreter, so the numbers include interpreter
+# startup; compare against startup.python to see what the import adds.
+MODULES = {
+    'startup.python': None,
+    'startup.import.package': 'LedgerAdapter',
+    'startup.import.hashing': 'LedgerAdapter.hashing',
+    'startup.import.utils': 'LedgerAdapter.utils',
+    'startup.import.hash_manager': 'LedgerAdapter.hash_manager',
+}
+
+
+def _spawn(module):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (ROOT, env.get('PYTHONPATH'))))
+    code = 'pass' if module is None else f'import {module}'
+    command = [sys.executable, '-c', code]
+
+    def start():
+        subprocess.run(command, env=env, check=True)
+    return start
+
+
+def _register(name, module):
+    @benchmark(name)
+    def factory(context):
+        return _spawn(module), 1
+
+
+for _name, _module in MODULES.items():
+    _register(_name, _module)
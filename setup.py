@@ -8,13 +8,24 @@ setup(
         "cryptography==46.0.3",
         "eth-abi==5.2.0",
         "eth-account==0.13.7",
+        "eth-utils==6.0.0",
         "hexbytes==1.3.1",
         "jcs==0.2.1",
+        "pycryptodome==3.24.1",
         "pytest==9.0.2",
         "pytest-mock==3.15.1",
         "PyJWT==2.10.1",
         "python-dotenv==1.2.1",
         "requests==2.32.5",
+        "rlp==5.0.0",
         "web3==7.14.0",
-    ]
+    ],
+    extras_require={
+        "arrow": ["pyarrow==21.0.0"],
+    },
+    entry_points={
+        "console_scripts": [
+            "ledger-adapter-load=LedgerAdapter.load:main",
+        ],
+    }
 )
\ No newline at end of file
@@ -0,0 +1,50 @@
+import importlib.util
+
+from pathlib import Path
+
+import pytest
+
+
+BENCHMARKS = Path(__file__).resolve().parents[2] / "benchmarks"
+
+
+@pytest.fixture(scope="module")
+def harness():
+    spec = importlib.util.spec_from_file_location("harness", BENCHMARKS / "harness.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _results(**seconds_per_op):
+    return {"results": {name: {"seconds_per_op": value} for name, value in seconds_per_op.items()}}
+
+
+class TestCompare:
+
+    def test_flags_only_slowdowns_past_threshold(self, harness):
+        baseline = _results(steady=1.0, slower=1.0, edge=1.0, faster=1.0)
+        current = _results(steady=1.05, slower=1.25, edge=1.09, faster=0.5)
+
+        rows = harness.compare(baseline, current, threshold=0.10)
+
+        assert {name: row["regression"] for name, row in rows.items()} == {
+            "steady": False, "slower": True, "edge": False, "faster": False,
+        }
+        assert rows["slower"]["change"] == pytest.approx(0.25)
+        assert rows["faster"]["change"] == pytest.approx(-0.5)
+
+    def test_threshold_is_configurable(self, harness):
+        rows = harness.compare(_results(op=1.0), _results(op=1.05), threshold=0.01)
+        assert rows["op"]["regression"] is True
+
+    def test_new_benchmark_is_not_a_regression(self, harness):
+        rows = harness.compare(_results(), _results(new=1.0))
+        assert rows["new"] == {"baseline": None, "current": 1.0, "change": None, "regression": False}
+
+    def test_committed_baseline_covers_every_suite(self, harness):
+        baseline = harness.load(str(BENCHMARKS / "baseline.json"))
+        names = set(baseline["results"])
+        assert {name.split(".")[0] for name in names} == {"micro", "macro", "startup"}
+        assert all(result["seconds_per_op"] > 0 for result in baseline["results"].values())
+        assert not any(row["regression"] for row in harness.compare(baseline, baseline).values())
@@ -0,0 +1,25 @@
+import pytest
+
+from LedgerAdapter.block_cache import BlockHeaderCache
+
+
+class TestBlockHeaderCache:
+
+    def test_get_and_put(self):
+        cache = BlockHeaderCache(maxsize=2)
+        assert cache.get(1) is None
+        cache.put(1, {"timestamp": 10})
+        assert cache.get(1) == {"timestamp": 10}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = BlockHeaderCache(maxsize=2)
+        cache.put(1, {"timestamp": 10})
+        cache.put(2, {"timestamp": 20})
+        cache.get(1)
+        cache.put(3, {"timestamp": 30})
+
+        assert len(cache) == 2
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
+        assert cache.get(3) is not None
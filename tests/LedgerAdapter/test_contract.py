@@ -0,0 +1,274 @@
+import pytest
+import requests
+
+from web3.exceptions import ContractLogicError, Web3RPCError
+from web3.providers import HTTPProvider
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.contract import Contract
+from LedgerAdapter.dag_hash_manager import DagHashManager
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.models import BlockchainError, EventData, NotSentError
+from LedgerAdapter.sender_pool import SenderPool
+
+
+@pytest.fixture
+def offline_contract(test_address):
+    return Contract(
+        http_provider=HTTPProvider("http://127.0.0.1:1"),
+        contract_address=test_address,
+        contract_abi=[]
+    )
+
+
+def _block(number):
+    return {"result": {
+        "number": hex(number),
+        "hash": "0x" + f"{number:064x}",
+        "parentHash": "0x" + f"{number - 1:064x}",
+        "timestamp": hex(1_700_000_000 + number),
+        "extraData": "0xbeef",
+    }}
+
+
+def _event(block_number, block_hash=None):
+    return EventData(
+        address="0x00",
+        block_hash=block_hash or "0x" + f"{block_number:064x}",
+        block_number=str(block_number),
+        event_name="HashAdded",
+        event_args={},
+        transaction_hash="0x02",
+        log_index="0"
+    )
+
+
+class TestBlockHeaders:
+
+    def test_one_fetch_per_distinct_block(self, mocker, offline_contract):
+        batch = mocker.patch.object(
+            offline_contract, "_batch_request",
+            side_effect=lambda requests: [_block(int(params[0], 16)) for _, params in requests]
+        )
+
+        events = offline_contract._with_timestamps([_event(5), _event(5), _event(6)])
+
+        assert [e.timestamp for e in events] == ["1700000005", "1700000005", "1700000006"]
+        assert [params[0] for _, params in batch.call_args.args[0]] == ["0x5", "0x6"]
+
+        offline_contract._with_timestamps([_event(6)])
+        assert batch.call_args.args[0] == []
+
+    def test_stale_header_is_refetched_after_reorg(self, mocker, offline_contract):
+        reorged = _block(5)
+        reorged["result"]["hash"] = "0x" + "ab" * 32
+        reorged["result"]["timestamp"] = hex(1_800_000_000)
+        chain = [[_block(5)], [reorged]]
+        fetched = []
+
+        def batch(requests):
+            if not requests:
+                return []
+            fetched.append(requests)
+            return chain.pop(0)
+
+        mocker.patch.object(offline_contract, "_batch_request", side_effect=batch)
+
+        offline_contract._with_timestamps([_event(5)])
+        events = offline_contract._with_timestamps([_event(5, "0x" + "AB" * 32)])
+
+        assert events[0].timestamp == "1800000000"
+        assert len(fetched) == 2
+        assert offline_contract.get_block_headers([5])[5]["hash"] == "0x" + "ab" * 32
+
+    def test_event_from_orphaned_block_raises(self, mocker, offline_contract):
+        mocker.patch.object(offline_contract, "_batch_request", side_effect=lambda requests: [_block(5)] if requests else [])
+        with pytest.raises(BlockchainError, match="reorganized"):
+            offline_contract._with_timestamps([_event(5, "0x" + "cd" * 32)])
+
+    def test_headers_use_poa_field_name(self, mocker, offline_contract):
+        mocker.patch.object(offline_contract, "_batch_request", return_value=[_block(9)])
+        header = offline_contract.get_block_headers([9])[9]
+        assert header["proofOfAuthorityData"] == "0xbeef"
+        assert "extraData" not in header
+
+
+class TestSimulateMany:
+
+    def test_simulates_at_pending_from_sender(self, mocker, offline_contract):
+        call_many = mocker.patch.object(offline_contract, "call_many", return_value=[
+            BlockchainError(message="Hash already exists"), "0x01",
+        ])
+
+        failures = offline_contract.simulate_many(["f1", "f2"], "0xabc")
+
+        assert [str(f) if f else None for f in failures] == ["Hash already exists", None]
+        call_many.assert_called_once_with(["f1", "f2"], block_identifier="pending", from_address="0xabc")
+
+    def test_execute_many_sends_only_passing(self, mocker, offline_contract, private_key_alice):
+        error = BlockchainError(message="Hash already exists")
+        mocker.patch.object(offline_contract, "simulate_many", return_value=[None, error, None])
+        original = Contract.execute_many
+        sent = []
+
+        def execute_many(contract_functions, *args, simulate=False, **kwargs):
+            if simulate:
+                return original(offline_contract, contract_functions, *args, simulate=True, **kwargs)
+            sent.extend(contract_functions)
+            return [f"0x{f}" for f in contract_functions]
+
+        mocker.patch.object(offline_contract, "execute_many", side_effect=execute_many)
+
+        results = offline_contract.execute_many(["a", "b", "c"], private_key_alice, simulate=True)
+
+        assert sent == ["a", "c"]
+        assert results == ["0xa", error, "0xc"]
+
+
+class TestExecuteMany:
+
+    def test_results_are_per_item(self, mocker, offline_contract, private_key_alice):
+        eth = type(offline_contract.w3.eth)
+        mocker.patch.object(eth, "chain_id", new_callable=mocker.PropertyMock, return_value=1)
+        mocker.patch.object(eth, "get_transaction_count", return_value=5)
+        mocker.patch.object(offline_contract, "_estimate_gas_many", return_value=[
+            21_000, BlockchainError(message="execution reverted: Hash already exists"), 21_000, 21_000,
+        ])
+        mocker.patch.object(
+            offline_contract, "_build_transaction",
+            side_effect=lambda fn, address, nonce, chain_id, gas: {"nonce": nonce}
+        )
+        pipeline = mocker.patch.object(offline_contract, "_signing_pipeline").return_value
+        pipeline.sign.side_effect = lambda txs: [b"%d" % tx["nonce"] for tx in txs]
+        send = mocker.patch.object(offline_contract, "_send_raw_transaction", side_effect=[
+            "0xa", Web3RPCError("nonce too low"),
+        ])
+
+        results = offline_contract.execute_many(["a", "b", "c", "d"], private_key_alice)
+
+        assert results[0] == "0xa"
+        assert "Hash already exists" in str(results[1])
+        assert str(results[2]) == "nonce too low" and not isinstance(results[2], NotSentError)
+        assert isinstance(results[3], NotSentError)
+        assert [c.args[2] for c in send.call_args_list] == [5, 6]
+
+    def test_gas_estimates_are_batched(self, mocker, offline_contract, test_address):
+        batch = mocker.patch.object(offline_contract, "_batch_request", return_value=[
+            {"result": hex(10_000)},
+            {"error": {"code": 3, "message": "execution reverted: Hash already exists"}},
+        ])
+        functions = [mocker.Mock(address=test_address), mocker.Mock(address=test_address)]
+        for i, function in enumerate(functions):
+            function._encode_transaction_data.return_value = f"0x0{i}"
+
+        estimates = offline_contract._estimate_gas_many(functions, "0xabc")
+
+        assert estimates[0] == 12_000
+        assert str(estimates[1]) == "execution reverted: Hash already exists"
+        requests = batch.call_args.args[0]
+        assert [method for method, _ in requests] == ["eth_estimateGas"] * 2
+        assert requests[1][1][0] == {"from": "0xabc", "to": test_address, "data": "0x01", "gasPrice": "0x0"}
+
+    def test_signing_pool_is_reused_until_close(self, mocker, offline_contract, private_key_alice):
+        close = mocker.patch("LedgerAdapter.contract.SigningPipeline.close")
+        with offline_contract:
+            pipeline = offline_contract._signing_pipeline(private_key_alice, 2)
+            assert offline_contract._signing_pipeline(private_key_alice, 2) is pipeline
+            close.assert_not_called()
+        close.assert_called_once()
+        assert offline_contract._signing_pipeline(private_key_alice, 2) is not pipeline
+
+
+class TestPooledExecute:
+
+    def test_batch_writes_reject_a_pool(self, mocker, private_key_alice):
+        pool = SenderPool([private_key_alice])
+        genesis = LocalNode().genesis_contracts()
+        connection = Connection(node_url="http://127.0.0.1:1")
+        manager = HashManager(connection, genesis["HashManager"]["address"], genesis["HashManager"]["abi"])
+        dag_manager = DagHashManager(connection, genesis["DagHashManager"]["address"], genesis["DagHashManager"]["abi"])
+        batch = mocker.patch.object(Contract, "_batch_request")
+
+        for write in (
+            lambda: manager.execute_many([], pool),
+            lambda: manager.add_many(["a"], pool),
+            lambda: manager.add_digest_many(["0x" + "ab" * 32], pool),
+            lambda: dag_manager.add_hash_many(["a"], pool),
+            lambda: dag_manager.import_dag(["0x" + "ab" * 32], [], pool),
+        ):
+            with pytest.raises(ValueError, match="single private key"):
+                write()
+        batch.assert_not_called()
+
+    def test_revert_before_reservation_keeps_nonce_counter(self, mocker, offline_contract, private_key_alice):
+        pool = SenderPool([private_key_alice])
+        lane = pool.lanes[0]
+        lane.next_nonce = 5
+        mocker.patch.object(type(offline_contract.w3.eth), "chain_id", new_callable=mocker.PropertyMock, return_value=1)
+        mocker.patch.object(
+            offline_contract, "_estimate_gas",
+            side_effect=ContractLogicError("execution reverted: Hash already exists")
+        )
+
+        with pytest.raises(BlockchainError, match="Hash already exists"):
+            offline_contract.execute(mocker.Mock(), pool)
+
+        assert lane.next_nonce == 5
+        assert pool.in_flight() == {lane.address: 0}
+
+    def test_send_failure_rewinds_last_nonce(self, mocker, offline_contract, private_key_alice):
+        pool = SenderPool([private_key_alice])
+        lane = pool.lanes[0]
+        lane.next_nonce = 5
+        mocker.patch.object(type(offline_contract.w3.eth), "chain_id", new_callable=mocker.PropertyMock, return_value=1)
+        mocker.patch.object(offline_contract, "_estimate_gas", return_value=21_000)
+        mocker.patch.object(offline_contract, "_build_transaction", return_value={
+            "to": lane.address, "value": 0, "gas": 21_000, "gasPrice": 0, "nonce": 5, "chainId": 1
+        })
+        mocker.patch.object(
+            offline_contract, "_send_raw_transaction",
+            side_effect=requests.exceptions.ConnectionError("connection reset")
+        )
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            offline_contract.execute(mocker.Mock(), pool)
+
+        assert pool.in_flight() == {lane.address: 0}
+        assert lane.reserve_nonce(offline_contract.w3) == 5
+
+    def test_send_failure_below_other_reservations_is_filled(self, private_key_alice):
+        pool = SenderPool([private_key_alice])
+        lane = pool.lanes[0]
+        with LocalNode() as node:
+            contract = node.genesis_contracts()["HashManager"]
+            manager = HashManager(Connection(node_url=node.url), contract["address"], contract["abi"])
+            send = manager._send_raw_transaction
+
+            def send_after_another_reservation(raw_transaction, address, nonce, contract_function):
+                # Another worker reserves the next nonce before this send fails.
+                held = lane.reserve_nonce(manager.w3)
+                assert held == nonce + 1
+                lane.reuse_nonce(held)
+                raise requests.exceptions.Timeout("read timed out")
+
+            manager._send_raw_transaction = send_after_another_reservation
+            with pytest.raises(requests.exceptions.Timeout):
+                manager.add("gap", pool)
+            manager._send_raw_transaction = send
+
+            receipt = manager.add("after-gap", pool, synchronous=True)
+            assert receipt.status == "1"
+            assert manager.w3.eth.get_transaction_count(lane.address) == 2
+
+    def test_async_writes_settle_on_refresh(self, private_key_alice):
+        pool = SenderPool([private_key_alice], refresh_interval=0)
+        with LocalNode() as node:
+            contract = node.genesis_contracts()["HashManager"]
+            manager = HashManager(Connection(node_url=node.url), contract["address"], contract["abi"])
+            manager.add("async-1", pool)
+            assert pool.in_flight() == {pool.lanes[0].address: 1}
+            manager.add("async-2", pool)
+            assert pool.in_flight() == {pool.lanes[0].address: 1}
+            assert pool.refresh(manager.w3) == 1
+        assert pool.in_flight() == {pool.lanes[0].address: 0}
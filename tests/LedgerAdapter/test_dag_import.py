@@ -0,0 +1,117 @@
+import pytest
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.dag_hash_manager import DagHashManager, _edge_levels
+from LedgerAdapter.models import (
+    BlockchainError,
+    BlockchainResponse,
+    BlockDetails,
+    NotSentError,
+    TransactionDetails,
+)
+
+
+def _function(name, inputs, outputs=()):
+    return {
+        "type": "function",
+        "name": name,
+        "stateMutability": "view" if outputs else "nonpayable",
+        "inputs": [{"name": n, "type": "bytes32"} for n in inputs],
+        "outputs": [{"name": "", "type": t} for t in outputs],
+    }
+
+
+ABI = [
+    _function("addHash", ["hashValue"]),
+    _function("readHash", ["hashValue"], ["address"]),
+    _function("addOutgoingLink", ["fromHash", "toHash"]),
+    _function("readOutgoingLinks", ["hashValue"], ["bytes32[]"]),
+]
+
+A, B, C, D = ("0x" + c * 64 for c in "abcd")
+
+
+@pytest.fixture
+def offline_dag_manager(test_address):
+    return DagHashManager(
+        node_connection=Connection(node_url="http://127.0.0.1:1"),
+        contract_address=test_address,
+        contract_abi=ABI
+    )
+
+
+def _response(tx_hash):
+    return BlockchainResponse(
+        status='1',
+        block=BlockDetails(block_hash='0x00', block_number='1'),
+        transaction=TransactionDetails(
+            transaction_hash=tx_hash, from_address='0x00', to_address='0x00', gas_used='0'
+        ),
+        events=[]
+    )
+
+
+class TestEdgeLevels:
+
+    def test_levels_follow_source_depth(self):
+        levels = _edge_levels([(C, D), (A, B), (B, C), (A, C)])
+        assert levels == [[(A, B), (A, C)], [(B, C)], [(C, D)]]
+
+    def test_cycle_raises(self):
+        with pytest.raises(ValueError):
+            _edge_levels([(A, B), (B, A)])
+
+
+class TestImportDag:
+
+    def test_skips_existing_and_submits_by_level(self, mocker, offline_dag_manager):
+        not_found = BlockchainError(message="Hash does not exist")
+        mocker.patch.object(offline_dag_manager, "call_many", side_effect=[
+            [(A,), not_found, not_found],
+            [[B], []],
+        ])
+        execute_many = mocker.patch.object(
+            offline_dag_manager, "execute_many",
+            side_effect=lambda fns, *args, **kwargs: [_response(f"0x{i}") for i, _ in enumerate(fns)]
+        )
+
+        report = offline_dag_manager.import_dag([A, B, C], [(A, B), (B, C)], "key")
+
+        assert [(i.kind, i.status) for i in report] == [
+            ('node', 'exists'), ('node', 'added'), ('node', 'added'),
+            ('edge', 'exists'), ('edge', 'added'),
+        ]
+        assert report[-1].key == f"{B}->{C}"
+        assert execute_many.call_count == 2
+
+    def test_failed_batch_falls_back_to_single_sends(self, mocker, offline_dag_manager):
+        mocker.patch.object(offline_dag_manager, "call_many", side_effect=[
+            [BlockchainError(message="Hash does not exist")] * 2, [],
+        ])
+        mocker.patch.object(
+            offline_dag_manager, "execute_many",
+            side_effect=BlockchainError(message="Hash already exists")
+        )
+        mocker.patch.object(offline_dag_manager, "execute", side_effect=[
+            _response("0x1"), BlockchainError(message="Hash already exists"),
+        ])
+
+        report = offline_dag_manager.import_dag([A, B], [], "key")
+
+        assert [i.status for i in report] == ['added', 'failed']
+        assert report[1].error
+
+    def test_only_unsent_items_are_retried(self, mocker, offline_dag_manager):
+        mocker.patch.object(offline_dag_manager, "call_many", side_effect=[
+            [BlockchainError(message="Hash does not exist")] * 3, [],
+        ])
+        mocker.patch.object(offline_dag_manager, "execute_many", return_value=[
+            _response("0x1"), BlockchainError(message="nonce too low"), NotSentError(),
+        ])
+        execute = mocker.patch.object(offline_dag_manager, "execute", return_value=_response("0x3"))
+
+        report = offline_dag_manager.import_dag([A, B, C], [], "key")
+
+        assert [i.status for i in report] == ['added', 'failed', 'added']
+        assert [i.transaction_hash for i in report] == ["0x1", None, "0x3"]
+        execute.assert_called_once()
@@ -0,0 +1,91 @@
+import pytest
+
+from LedgerAdapter.dag_mirror import DagMirror
+from LedgerAdapter.models import EventData
+
+
+ABI = [
+    {"type": "event", "name": "HashAdded", "inputs": [
+        {"name": "hashValue", "type": "bytes32"}, {"name": "owner", "type": "address"}]},
+    {"type": "event", "name": "HashDeprecated", "inputs": [{"name": "hashValue", "type": "bytes32"}]},
+    {"type": "event", "name": "OutgoingLinkAdded", "inputs": [
+        {"name": "fromHash", "type": "bytes32"}, {"name": "toHash", "type": "bytes32"}]},
+    {"type": "event", "name": "OutgoingLinkDeleted", "inputs": [
+        {"name": "fromHash", "type": "bytes32"}, {"name": "toHash", "type": "bytes32"}]},
+]
+
+A, B, C, D = ("0x" + c * 64 for c in "abcd")
+
+
+def _event(name, block, **args):
+    return EventData(
+        address="0x00",
+        block_hash="0x01",
+        block_number=str(block),
+        event_name=name,
+        event_args=args,
+        transaction_hash="0x02",
+        log_index="0"
+    )
+
+
+@pytest.fixture
+def manager(mocker):
+    manager = mocker.Mock()
+    manager.contract.abi = ABI
+    manager.iter_event_batches.return_value = iter([
+        (0, 9, [_event("HashAdded", 1, hashValue=h, owner="0x00") for h in (A, B, C, D)]),
+        (10, 19, [
+            _event("OutgoingLinkAdded", 10, fromHash=A, toHash=B),
+            _event("OutgoingLinkAdded", 11, fromHash=B, toHash=C),
+            _event("OutgoingLinkAdded", 11, fromHash=A, toHash=D),
+            _event("OutgoingLinkDeleted", 12, fromHash=A, toHash=D),
+            _event("HashDeprecated", 13, hashValue=D),
+        ]),
+    ])
+    return manager
+
+
+class TestDagMirror:
+
+    def test_sync_builds_forward_and_reverse_index(self, manager):
+        mirror = DagMirror(manager)
+        assert mirror.sync() == 9
+        assert mirror.last_block == 19
+
+        assert mirror.children(A) == {B}
+        assert mirror.parents(C) == {B}
+        assert mirror.descendants(A) == {B, C}
+        assert mirror.descendants(A, max_depth=1) == {B}
+        assert mirror.ancestors(C) == {A, B}
+        assert mirror.path(A, C) == [A, B, C]
+        assert mirror.path(C, A) is None
+        assert mirror.nodes[D] == "deprecated"
+
+    def test_only_link_events_change_edges(self, manager):
+        mirror = DagMirror(manager)
+        mirror.sync()
+        # Two bytes32 arguments alone do not make a link event.
+        mirror.apply(_event("LinkRemovalRequested", 20, fromHash=A, toHash=B))
+        mirror.apply(_event("HashesMerged", 20, fromHash=C, toHash=A))
+
+        assert mirror.children(A) == {B}
+        assert mirror.children(C) == set()
+
+    def test_sync_is_incremental(self, manager):
+        mirror = DagMirror(manager)
+        mirror.sync()
+        manager.iter_event_batches.return_value = iter([])
+        mirror.sync()
+        assert manager.iter_event_batches.call_args.kwargs["from_block"] == 20
+
+    def test_snapshot_round_trip(self, manager, tmp_path):
+        mirror = DagMirror(manager)
+        mirror.sync()
+        path = str(tmp_path / "mirror.json")
+        mirror.save(path)
+
+        loaded = DagMirror.load(path, manager)
+        assert loaded.last_block == 19
+        assert loaded.ancestors(C) == {A, B}
+        assert loaded.nodes == mirror.nodes
@@ -0,0 +1,76 @@
+import pytest
+
+from eth_abi import encode
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.dag_hash_manager import DagHashManager
+from LedgerAdapter.models import BlockchainError
+
+
+ABI = [{
+    "type": "function",
+    "name": "readOutgoingLinks",
+    "stateMutability": "view",
+    "inputs": [{"name": "hashValue", "type": "bytes32"}],
+    "outputs": [{"name": "", "type": "bytes32[]"}],
+}]
+
+A, B, C, D = ("0x" + c * 64 for c in "abcd")
+GRAPH = {A: [B, C], B: [D], C: [D], D: []}
+
+
+@pytest.fixture
+def offline_dag_manager(test_address):
+    return DagHashManager(
+        node_connection=Connection(node_url="http://127.0.0.1:1"),
+        contract_address=test_address,
+        contract_abi=ABI
+    )
+
+
+def _answer(requests):
+    responses = []
+    for method, (params, block) in requests:
+        node = "0x" + params["data"][-64:]
+        if node not in GRAPH:
+            responses.append({"error": {"code": 3, "message": "execution reverted: Hash does not exist"}})
+            continue
+        links = [bytes.fromhex(h[2:]) for h in GRAPH[node]]
+        responses.append({"result": "0x" + encode(["bytes32[]"], [links]).hex()})
+    return responses
+
+
+class TestTraverse:
+
+    def test_levels_are_batched_and_deduped(self, mocker, offline_dag_manager):
+        batch = mocker.patch.object(offline_dag_manager, "_batch_request", side_effect=_answer)
+
+        result = offline_dag_manager.traverse(A, block_identifier=42)
+
+        assert result.levels == [[A], [B, C], [D]]
+        assert result.links[A] == [B, C]
+        assert result.block_number == 42
+        assert batch.call_count == 3
+        assert all(params[1] == hex(42) for call in batch.call_args_list for _, params in call.args[0])
+
+    def test_max_depth(self, mocker, offline_dag_manager):
+        mocker.patch.object(offline_dag_manager, "_batch_request", side_effect=_answer)
+        result = offline_dag_manager.traverse(A, max_depth=1, block_identifier=1)
+        assert result.levels == [[A], [B, C]]
+
+    def test_missing_root_raises(self, mocker, offline_dag_manager):
+        mocker.patch.object(offline_dag_manager, "_batch_request", side_effect=_answer)
+        with pytest.raises(BlockchainError, match="Hash does not exist"):
+            offline_dag_manager.traverse("0x" + "e" * 64, block_identifier=1)
+
+    def test_failed_reads_are_reported_not_treated_as_leaves(self, mocker, offline_dag_manager):
+        missing = "0x" + "e" * 64
+        mocker.patch.dict(GRAPH, {A: [B, C, missing]})
+        mocker.patch.object(offline_dag_manager, "_batch_request", side_effect=_answer)
+
+        result = offline_dag_manager.traverse(A, block_identifier=1)
+
+        assert result.levels == [[A], [B, C, missing], [D]]
+        assert missing not in result.links
+        assert result.errors == {missing: "execution reverted: Hash does not exist"}
+        assert result.links[D] == [] and D not in result.errors
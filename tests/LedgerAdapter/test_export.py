@@ -0,0 +1,83 @@
+import pytest
+
+from web3 import Web3
+
+from LedgerAdapter.models import RawEventData
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from LedgerAdapter.export import ParquetEventExporter
+
+
+ABI = [
+    {
+        "type": "event",
+        "name": "HashAdded",
+        "inputs": [
+            {"name": "hashValue", "type": "bytes32", "indexed": True},
+            {"name": "owner", "type": "address", "indexed": True},
+        ],
+    },
+    {
+        "type": "event",
+        "name": "HashDeprecated",
+        "inputs": [
+            {"name": "hashValue", "type": "bytes32", "indexed": True},
+            {"name": "index", "type": "uint256", "indexed": False},
+        ],
+    },
+]
+
+
+def _event(name, block, args):
+    return RawEventData(
+        address="0x00000000000000000000000000000000000000aa",
+        block_hash=Web3.keccak(text=f"block-{block}"),
+        block_number=block,
+        event_name=name,
+        event_args=args,
+        transaction_hash=Web3.keccak(text=f"tx-{block}-{name}"),
+        log_index=0,
+    )
+
+
+@pytest.fixture
+def contract(mocker):
+    contract = mocker.Mock()
+    contract.contract.abi = ABI
+    return contract
+
+
+class TestParquetEventExporter:
+
+    def test_record_batches_are_typed_per_event(self, contract):
+        exporter = ParquetEventExporter(contract, "unused")
+        hashed = Web3.keccak(text="a")
+        batches = exporter.to_record_batches([
+            _event("HashAdded", 5, {"hashValue": hashed, "owner": "0xe4a2E908bf0E1ca4305C1fE6C5F84EBA66a98863"}),
+            _event("HashDeprecated", 6, {"hashValue": hashed, "index": 2 ** 200}),
+        ])
+
+        added = batches["HashAdded"]
+        assert added.schema.field("block_number").type == pa.int64()
+        assert added.schema.field("arg_hashValue").type == pa.binary(32)
+        assert added.column("arg_hashValue")[0].as_py() == bytes(hashed)
+        assert batches["HashDeprecated"].column("arg_index")[0].as_py() == str(2 ** 200)
+
+    def test_export_is_incremental(self, contract, tmp_path):
+        hashed = Web3.keccak(text="a")
+        contract.iter_event_batches.return_value = iter([
+            (0, 9, [_event("HashAdded", 3, {"hashValue": hashed, "owner": "0x00"})]),
+            (10, 12, []),
+        ])
+        exporter = ParquetEventExporter(contract, str(tmp_path), blocks_per_file=10)
+
+        assert exporter.export(to_block=12) == 1
+        assert exporter.last_exported_block == 12
+        table = pq.read_table(tmp_path / "event_name=HashAdded" / "blocks_000000000000_000000000009.parquet")
+        assert table.column("block_number").to_pylist() == [3]
+
+        contract.iter_event_batches.return_value = iter([])
+        exporter.export()
+        assert contract.iter_event_batches.call_args.kwargs["from_block"] == 13
@@ -0,0 +1,83 @@
+import json
+import pytest
+
+from web3 import Web3
+
+from LedgerAdapter.hashing import (
+    canonicalize_and_hash_many,
+    hash_canonical_json,
+    hash_file,
+    hash_json_file,
+)
+from LedgerAdapter.utils import canonicalize_json
+
+
+def _reference_hash(data):
+    return "0x" + Web3.keccak(text=canonicalize_json(data)).hex()
+
+
+class TestHashCanonicalJson:
+
+    @pytest.mark.parametrize("data", [
+        {"b": 2, "c": 3, "a": 1},
+        {"z": [3, 1, 2], "a": {"y": "foo", "x": "bar"}},
+        {"text": "café", "emoji": "\U0001F600", "€": "é"},
+        {"active": True, "deleted": False, "metadata": None},
+        {"numbers": [0, -1, 1.5, 1e21, 1e-7, 333333333.3333333]},
+        "plain string",
+        [],
+    ])
+    def test_matches_canonicalize_then_keccak(self, data):
+        assert hash_canonical_json(data) == _reference_hash(data)
+
+    def test_matches_for_document_larger_than_buffer(self):
+        data = {f"key-{i}": {"values": list(range(50)), "name": f"n{i}"} for i in range(2000)}
+        assert hash_canonical_json(data) == _reference_hash(data)
+
+    def test_falls_back_without_private_encoder(self, mocker):
+        mocker.patch("LedgerAdapter.hashing.JSONEncoder", None)
+        data = {"text": "café", "numbers": [1.5, 1e21], "a": None}
+        assert hash_canonical_json(data) == _reference_hash(data)
+
+
+class TestCanonicalizeAndHashMany:
+
+    def test_iterable_yields_in_input_order(self):
+        documents = [{"id": i, "tags": ["a", "b"][: i % 3]} for i in range(50)]
+        results = list(canonicalize_and_hash_many(documents, max_workers=2, chunksize=4))
+
+        assert [index for index, _ in results] == list(range(50))
+        assert [digest for _, digest in results] == [_reference_hash(d) for d in documents]
+
+    def test_ndjson_path(self, tmp_path):
+        documents = [{"b": i, "a": str(i)} for i in range(10)]
+        path = tmp_path / "documents.ndjson"
+        path.write_text("\n".join(json.dumps(d) for d in documents) + "\n\n")
+
+        results = list(canonicalize_and_hash_many(str(path), max_workers=2, chunksize=3))
+        assert results == [(i, _reference_hash(d)) for i, d in enumerate(documents)]
+
+
+class TestHashFile:
+
+    def test_binary_file_matches_keccak_of_bytes(self, tmp_path):
+        content = bytes(range(256)) * 5000
+        path = tmp_path / "document.pdf"
+        path.write_bytes(content)
+        assert hash_file(str(path)) == "0x" + Web3.keccak(content).hex()
+
+    def test_text_file_matches_add_hashing(self, tmp_path):
+        path = tmp_path / "document.txt"
+        path.write_text("café", encoding="utf-8")
+        assert hash_file(str(path)) == "0x" + Web3.keccak(text="café").hex()
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty"
+        path.write_bytes(b"")
+        assert hash_file(str(path)) == "0x" + Web3.keccak(b"").hex()
+
+    def test_json_file_is_canonicalized(self, tmp_path):
+        data = {"b": [1, 2], "a": {"y": "foo", "x": "bar"}}
+        path = tmp_path / "document.json"
+        path.write_text(json.dumps(data, indent=4))
+        assert hash_json_file(str(path)) == _reference_hash(data)
@@ -0,0 +1,96 @@
+import logging
+import time
+
+import pytest
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.instrumentation import HistogramHook, Instrumentation, log_hook
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.models import BlockchainError
+
+
+class TestInstrumentation:
+
+    def test_stages_accumulate_and_nested_operations_fold(self):
+        traces = []
+        instrumentation = Instrumentation(traces.append)
+
+        with instrumentation.operation("execute"):
+            with instrumentation.stage("sign"):
+                pass
+            with instrumentation.operation("call_many"):
+                with instrumentation.stage("sign"):
+                    instrumentation.count_rpc("eth_call", 3)
+
+        assert len(traces) == 1
+        assert traces[0].operation == "execute"
+        assert set(traces[0].stages) == {"sign"}
+        assert traces[0].rpc_calls == {"eth_call": 3}
+
+    def test_stage_outside_operation_is_ignored(self):
+        traces = []
+        instrumentation = Instrumentation(traces.append)
+        with instrumentation.stage("sign"):
+            instrumentation.count_rpc("eth_call")
+        assert traces == []
+
+    def test_error_is_recorded(self):
+        histogram = HistogramHook()
+        instrumentation = Instrumentation(histogram)
+        with pytest.raises(ValueError):
+            with instrumentation.operation("call"):
+                raise ValueError("boom")
+        assert histogram.summary()["call"]["errors"] == 1
+
+    def test_log_hook(self, caplog):
+        instrumentation = Instrumentation(log_hook(level=logging.INFO))
+        with caplog.at_level(logging.INFO, logger="LedgerAdapter"):
+            with instrumentation.operation("call"):
+                with instrumentation.stage("eth_call"):
+                    pass
+        assert "call" in caplog.text and "eth_call=" in caplog.text
+
+    def test_contract_stages_and_rpc_counts(self, private_key_alice):
+        histogram = HistogramHook()
+        with LocalNode() as node:
+            contract = node.genesis_contracts()["HashManager"]
+            manager = HashManager(
+                Connection(node_url=node.url), contract["address"], contract["abi"]
+            ).with_instrumentation(Instrumentation(histogram))
+
+            manager.add("instrumented", private_key_alice, synchronous=True)
+            with pytest.raises(BlockchainError):
+                manager.add("instrumented", private_key_alice, synchronous=True)
+            manager.get_events(event_name="HashAdded")
+
+        summary = histogram.summary()
+        assert summary["execute"]["count"] == 2
+        assert summary["execute"]["errors"] == 1
+        assert {
+            "get_transaction_count", "chain_id", "estimate_gas", "build_transaction",
+            "sign", "send_raw_transaction", "wait_for_receipt", "total",
+        } <= set(summary["execute"]["stages"])
+        assert summary["execute"]["rpc_calls"]["eth_sendRawTransaction"] == 1
+        assert {"get_logs", "parse_events"} <= set(summary["get_events"]["stages"])
+
+    def test_batched_gas_estimate_excludes_the_round_trip(self, mocker, private_key_alice):
+        traces = []
+        with LocalNode() as node:
+            contract = node.genesis_contracts()["HashManager"]
+            manager = HashManager(
+                Connection(node_url=node.url), contract["address"], contract["abi"]
+            ).with_instrumentation(Instrumentation(traces.append))
+            make_batch_request = manager.w3.provider.make_batch_request
+
+            def slow_batch_request(requests):
+                time.sleep(0.2)
+                return make_batch_request(requests)
+
+            mocker.patch.object(manager.w3.provider, "make_batch_request", side_effect=slow_batch_request)
+            functions = [manager.contract.functions.add(manager.w3.keccak(text=f"timed-{i}")) for i in range(3)]
+            manager.execute_many(functions, private_key_alice)
+
+        trace = next(t for t in traces if t.operation == "execute_many")
+        assert trace.stages["batch_request"] >= 0.2
+        assert trace.stages["estimate_gas"] < 0.2
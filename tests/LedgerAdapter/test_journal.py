@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.journal import CONFIRMED, DROPPED, FAILED, PENDING, TransactionJournal
+from LedgerAdapter.local_node import LocalNode
+
+
+@pytest.fixture(scope="module")
+def local_node():
+    with LocalNode() as node:
+        yield node
+
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestTransactionJournal:
+
+    def test_record_and_update(self, tmp_path, test_address):
+        journal = TransactionJournal(str(tmp_path / "journal.ndjson"))
+        journal.record("0x01", 0, test_address, "0xaa")
+        journal.record("0x02", 1, test_address, "0xbb")
+
+        journal.update("0x01", CONFIRMED)
+
+        assert journal.get("0x01").status == CONFIRMED
+        assert [e.tx_hash for e in journal.pending()] == ["0x02"]
+        journal.close()
+
+    def test_replay_after_restart(self, tmp_path, test_address):
+        path = str(tmp_path / "journal.ndjson")
+        journal = TransactionJournal(path)
+        journal.record("0x01", 0, test_address, "0xaa")
+        journal.record("0x02", 1, test_address, "0xbb")
+        journal.update("0x02", FAILED)
+        journal.close()
+
+        with open(path, "a") as f:
+            f.write('{"tx_hash": "0x03", "non')
+
+        reopened = TransactionJournal(path)
+        assert reopened.get("0x01").status == PENDING
+        assert reopened.get("0x02").status == FAILED
+        assert reopened.get("0x03") is None
+        assert [e.nonce for e in reopened.pending()] == [0]
+
+        reopened.record("0x04", 2, test_address, "0xcc")
+        reopened.close()
+        with TransactionJournal(path) as journal:
+            assert journal.get("0x04").nonce == 2
+
+    def test_compact_keeps_pending_entries(self, tmp_path, test_address):
+        path = str(tmp_path / "journal.ndjson")
+        with TransactionJournal(path) as journal:
+            journal.record("0x01", 0, test_address, "0xaa")
+            journal.record("0x02", 1, test_address, "0xbb")
+            journal.update("0x01", CONFIRMED)
+            journal.compact()
+            journal.record("0x03", 2, test_address, "0xcc")
+
+        assert [line["tx_hash"] for line in _read_lines(path)] == ["0x02", "0x03"]
+
+    def test_recover_journal_settles_and_compacts(self, tmp_path, local_node, private_key_alice):
+        path = str(tmp_path / "journal.ndjson")
+        contract = local_node.genesis_contracts()["HashManager"]
+        connection = Connection(node_url=local_node.url)
+        never_sent, nonce_reused = "0x" + "00" * 32, "0x" + "11" * 32
+
+        with TransactionJournal(path) as journal:
+            manager = HashManager(
+                node_connection=connection,
+                contract_address=contract["address"],
+                contract_abi=contract["abi"]
+            ).with_journal(journal)
+            tx_hash = manager.add("journal-recovery", private_key_alice)
+            address = journal.get(tx_hash).account
+            nonce = journal.get(tx_hash).nonce
+            # A crash after record but before the node accepted the write,
+            # and a write whose nonce another transaction took.
+            journal.record(never_sent, nonce + 1, address, "0xaa")
+            journal.record(nonce_reused, nonce, address, "0xbb")
+        # Simulate a restart: a fresh manager replays the journal from disk.
+        with TransactionJournal(path) as journal:
+            manager = HashManager(
+                node_connection=connection,
+                contract_address=contract["address"],
+                contract_abi=contract["abi"]
+            ).with_journal(journal)
+            assert len(journal.pending()) == 3
+
+            statuses = manager.recover_journal()
+
+            assert statuses == {tx_hash: CONFIRMED, never_sent: DROPPED, nonce_reused: DROPPED}
+            assert journal.pending() == []
+
+        assert _read_lines(path) == []
+
+    def test_recover_journal_keeps_transactions_the_node_still_holds(self, mocker, tmp_path, test_address):
+        contract = HashManager(Connection(node_url="http://127.0.0.1:1"), test_address, [])
+        with TransactionJournal(str(tmp_path / "journal.ndjson")) as journal:
+            contract.with_journal(journal)
+            journal.record("0x01", 3, test_address, "0xaa")
+            journal.record("0x02", 4, test_address, "0xbb")
+            batch = mocker.patch.object(contract, "_batch_request", return_value=[
+                {"result": None}, {"result": None},
+                {"result": {"hash": "0x01"}}, {"error": {"code": -32000, "message": "busy"}},
+                {"result": hex(3)},
+            ])
+
+            statuses = contract.recover_journal()
+
+            assert statuses == {"0x01": PENDING, "0x02": PENDING}
+            assert [e.tx_hash for e in journal.pending()] == ["0x01", "0x02"]
+            assert [method for method, _ in batch.call_args.args[0]] == [
+                "eth_getTransactionReceipt", "eth_getTransactionReceipt",
+                "eth_getTransactionByHash", "eth_getTransactionByHash",
+                "eth_getTransactionCount",
+            ]
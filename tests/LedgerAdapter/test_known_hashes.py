@@ -0,0 +1,127 @@
+import pytest
+
+from web3 import Web3
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.dag_hash_manager import DagHashManager
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.known_hashes import KnownHashBloom, KnownHashSet
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.models import BlockchainError, BlockchainResponse
+
+
+@pytest.fixture(scope="module")
+def local_node():
+    with LocalNode() as node:
+        yield node
+
+
+def _manager(node, name):
+    contract = node.genesis_contracts()[name]
+    manager_class = HashManager if name == "HashManager" else DagHashManager
+    return manager_class(
+        node_connection=Connection(node_url=node.url),
+        contract_address=contract["address"],
+        contract_abi=contract["abi"]
+    )
+
+
+def _hash(value):
+    return "0x" + Web3.keccak(text=value).hex()
+
+
+class TestKnownHashes:
+
+    def test_set_observes_added_and_deleted(self):
+        known = KnownHashSet()
+        known.observe("HashAdded", {"hashValue": _hash("a"), "owner": "0x00"})
+        known.observe("HashAdded", {"hashValue": _hash("b"), "owner": "0x00"})
+        known.observe("HashDeleted", {"hashValue": _hash("b")})
+
+        assert known.might_contain(_hash("a"))
+        assert not known.might_contain(_hash("b"))
+
+    def test_set_persists(self, tmp_path):
+        path = str(tmp_path / "known.txt")
+        known = KnownHashSet(path)
+        known.add(_hash("a"))
+        known.save()
+
+        assert KnownHashSet(path).might_contain(_hash("a"))
+
+    def test_bloom_has_no_false_negatives(self):
+        bloom = KnownHashBloom(capacity=1000, error_rate=0.01)
+        hashes = [_hash(f"doc-{i}") for i in range(1000)]
+        for hashed_value in hashes:
+            bloom.add(hashed_value)
+
+        assert all(bloom.might_contain(h) for h in hashes)
+        false_positives = sum(bloom.might_contain(_hash(f"other-{i}")) for i in range(1000))
+        assert false_positives < 50
+
+    def test_bloom_persists(self, tmp_path):
+        path = str(tmp_path / "known.bloom")
+        bloom = KnownHashBloom(capacity=100, path=path)
+        bloom.add(_hash("a"))
+        bloom.save()
+
+        reloaded = KnownHashBloom(path=path)
+        assert reloaded.might_contain(_hash("a"))
+        assert reloaded.num_bits == bloom.num_bits
+
+
+class TestKnownHashesOnNode:
+
+    def test_known_hash_is_rejected_without_estimating_gas(self, mocker, local_node, private_key_alice):
+        manager = _manager(local_node, "HashManager").with_known_hashes(KnownHashSet())
+        first = manager.add("known-set", private_key_alice, synchronous=True)
+        assert first.status == "1"
+        assert manager.known_hashes.might_contain(_hash("known-set"))
+
+        estimate = mocker.spy(manager, "_estimate_gas")
+        estimate_many = mocker.spy(manager, "_estimate_gas_many")
+        with pytest.raises(BlockchainError, match="already exists"):
+            manager.add("known-set", private_key_alice)
+        results = manager.add_many(["known-set"], private_key_alice)
+
+        assert isinstance(results[0], BlockchainError)
+        assert "already exists" in str(results[0])
+        estimate.assert_not_called()
+        estimate_many.assert_not_called()
+
+    def test_dag_known_hash_is_rejected_without_estimating_gas(self, mocker, local_node, private_key_alice):
+        manager = _manager(local_node, "DagHashManager").with_known_hashes(KnownHashSet())
+        assert manager.add_hash("known-dag", private_key_alice, synchronous=True).status == "1"
+
+        estimate = mocker.spy(manager, "_estimate_gas")
+        with pytest.raises(BlockchainError, match="already exists"):
+            manager.add_hash("known-dag", private_key_alice)
+        estimate.assert_not_called()
+
+    def test_bloom_false_positive_is_confirmed_and_still_sent(self, mocker, local_node, private_key_alice):
+        bloom = KnownHashBloom(capacity=100)
+        # Stand in for a false positive: the filter says yes, the chain says no.
+        bloom.add(_hash("bloom-false-positive"))
+        manager = _manager(local_node, "HashManager").with_known_hashes(bloom)
+        call_many = mocker.spy(manager, "call_many")
+
+        result = manager.add("bloom-false-positive", private_key_alice, synchronous=True)
+
+        assert isinstance(result, BlockchainResponse)
+        assert result.status == "1"
+        call_many.assert_called_once()
+        with pytest.raises(BlockchainError, match="already exists"):
+            manager.add("bloom-false-positive", private_key_alice)
+
+    def test_sync_known_hashes_fills_the_store_from_events(self, local_node, private_key_alice):
+        writer = _manager(local_node, "HashManager")
+        for value in ("sync-a", "sync-b"):
+            assert writer.add(value, private_key_alice, synchronous=True).status == "1"
+
+        manager = _manager(local_node, "HashManager").with_known_hashes(KnownHashSet())
+        assert not manager.known_hashes.might_contain(_hash("sync-a"))
+        manager.sync_known_hashes()
+
+        assert manager.known_hashes.might_contain(_hash("sync-a"))
+        assert manager.known_hashes.might_contain(_hash("sync-b"))
+        assert not manager.known_hashes.might_contain(_hash("sync-c"))
@@ -0,0 +1,123 @@
+import pytest
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.dag_hash_manager import DagHashManager
+from LedgerAdapter.dag_mirror import ACTIVE, DEPRECATED, DagMirror
+from LedgerAdapter.link_validator import LinkValidator
+from LedgerAdapter.models import BlockchainError
+
+
+A, B, C, D, E = ("0x" + c * 64 for c in "abcde")
+
+
+@pytest.fixture
+def mirror(mocker):
+    manager = mocker.Mock()
+    manager.contract.abi = []
+    mirror = DagMirror(manager)
+    mirror.nodes = {A: ACTIVE, B: ACTIVE, C: ACTIVE, D: DEPRECATED}
+    for from_hash, to_hash in ((A, B), (B, C)):
+        mirror.outgoing.setdefault(from_hash, set()).add(to_hash)
+        mirror.incoming.setdefault(to_hash, set()).add(from_hash)
+    return mirror
+
+
+class TestLinkValidator:
+
+    def test_rejects_cycles(self, mirror):
+        validator = LinkValidator(mirror)
+        validator.check(A, C)
+        with pytest.raises(BlockchainError, match="cycle"):
+            validator.check(C, A)
+        with pytest.raises(BlockchainError, match="cycle"):
+            validator.check(B, B)
+
+    def test_recorded_links_are_considered(self, mirror):
+        validator = LinkValidator(mirror)
+        mirror.nodes[E] = ACTIVE
+        validator.check(E, A)
+        validator.record(E, A)
+        with pytest.raises(BlockchainError, match="cycle"):
+            validator.check(C, E)
+
+        # After reordering, every link still agrees with the order.
+        for from_hash, to_hash in list(mirror.edges()) + list(validator.pending):
+            assert validator.order[from_hash] < validator.order[to_hash]
+        assert (E, A) not in set(mirror.edges())
+        assert A not in mirror.outgoing.get(E, set())
+
+    def test_rejects_duplicate_links(self, mirror):
+        validator = LinkValidator(mirror)
+        with pytest.raises(BlockchainError, match="Link already exists"):
+            validator.check(A, B)
+
+        validator.record(A, C, "0x01")
+        with pytest.raises(BlockchainError, match="Link already exists"):
+            validator.check(A, C)
+
+    def test_reverted_pending_link_is_dropped(self, mirror):
+        validator = LinkValidator(mirror)
+        mirror.nodes[E] = ACTIVE
+        validator.record(C, E, "0xaa")
+        with pytest.raises(BlockchainError, match="cycle"):
+            validator.check(E, A)
+
+        mirror.manager._fetch_receipts.return_value = [{"status": "0x0"}]
+        mirror.last_block = 7
+        validator.check(E, A)
+        mirror.manager._fetch_receipts.assert_called_once_with(["0xaa"])
+        assert validator.pending == {}
+        assert validator.pending_outgoing == {}
+        assert validator.pending_incoming == {}
+
+    def test_confirmed_pending_link_leaves_overlay(self, mirror):
+        validator = LinkValidator(mirror)
+        validator.record(A, C, "0xbb")
+        mirror.outgoing[A].add(C)
+        mirror.incoming[C].add(A)
+        mirror.nodes[E] = ACTIVE
+        mirror.last_block = 3
+        validator.check(C, E)
+        assert validator.pending == {}
+        mirror.manager._fetch_receipts.assert_not_called()
+
+    def test_rejects_deprecated_and_missing(self, mirror):
+        validator = LinkValidator(mirror)
+        with pytest.raises(BlockchainError, match="deprecated"):
+            validator.check(A, D)
+
+        mirror.manager.call_many.return_value = [BlockchainError(message="Hash does not exist")]
+        with pytest.raises(BlockchainError, match="does not exist"):
+            validator.check(A, E)
+
+    def test_rejects_unknown_deprecated_hash(self, mirror):
+        validator = LinkValidator(mirror)
+        read_hash = mirror.manager.contract.functions.readHash
+        read_hash.return_value.abi = {
+            "outputs": [{"name": "owner"}, {"name": "deprecated"}, {"name": "timestamp"}]
+        }
+        mirror.manager.call_many.return_value = [["0x" + "1" * 40, True, 1]]
+        with pytest.raises(BlockchainError, match="deprecated"):
+            validator.check(A, E)
+
+        mirror.manager.call_many.return_value = [["0x" + "1" * 40, False, 1]]
+        validator.check(A, E)
+
+    def test_rebuilds_after_sync(self, mirror):
+        validator = LinkValidator(mirror)
+        mirror.outgoing[C] = {A}
+        mirror.last_block = 5
+        with pytest.raises(BlockchainError, match="Mirrored graph contains a cycle"):
+            validator.check(A, B)
+
+    def test_manager_checks_before_signing(self, mocker, mirror, test_address):
+        manager = DagHashManager(
+            node_connection=Connection(node_url="http://127.0.0.1:1"),
+            contract_address=test_address,
+            contract_abi=[]
+        ).with_link_validator(LinkValidator(mirror))
+        execute = mocker.patch.object(manager, "execute")
+
+        with pytest.raises(BlockchainError, match="cycle"):
+            manager.add_outgoing_link(C, A, "key")
+        execute.assert_not_called()
@@ -0,0 +1,109 @@
+import subprocess
+import sys
+
+import pytest
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.dag_hash_manager import DagHashManager
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.instrumentation import percentile
+from LedgerAdapter.load import LoadGenerator, main, parse_mix
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.models import BlockchainError, BlockchainResponse, BlockDetails, TransactionDetails
+
+
+def _receipt(status):
+    return BlockchainResponse(
+        status=status,
+        block=BlockDetails(block_hash="0x01", block_number="1"),
+        transaction=TransactionDetails(transaction_hash="0x02", from_address="0xa", to_address="0xb", gas_used="1"),
+        events=[]
+    )
+
+
+class TestLoad:
+
+    def test_parse_mix(self):
+        assert parse_mix("add=3, read") == {"add": 3.0, "read": 1.0}
+        with pytest.raises(ValueError):
+            parse_mix("transfer=1")
+        with pytest.raises(ValueError):
+            parse_mix("add=0")
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 0.50) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.5) is None
+
+    def test_run_against_local_node(self, private_key_alice, private_key_bob):
+        with LocalNode() as node:
+            genesis = node.genesis_contracts()
+            connection = Connection(node_url=node.url)
+            generator = LoadGenerator(
+                hash_managers=[HashManager(connection, genesis["HashManager"]["address"], genesis["HashManager"]["abi"])],
+                dag_hash_managers=[
+                    DagHashManager(connection, genesis["DagHashManager"]["address"], genesis["DagHashManager"]["abi"])
+                ],
+                private_keys=[private_key_alice, private_key_bob],
+                mix=parse_mix("add=2,read=2,deprecate=1,add_outgoing_link=1,get_events=1"),
+                concurrency=4,
+            )
+            generator.seed(5)
+            report = generator.run(duration=30, limit=40, out=None)
+
+        assert report["completed"] + report["failed"] >= 40
+        assert report["config"]["keys"] == 2
+        for row in report["operations"].values():
+            if row["count"]:
+                assert row["p50"] <= row["p95"] <= row["p99"] <= row["max"]
+
+    def test_no_wait_settles_in_flight(self, private_key_alice):
+        with LocalNode() as node:
+            genesis = node.genesis_contracts()
+            connection = Connection(node_url=node.url)
+            generator = LoadGenerator(
+                hash_managers=[HashManager(connection, genesis["HashManager"]["address"], genesis["HashManager"]["abi"])],
+                dag_hash_managers=[
+                    DagHashManager(connection, genesis["DagHashManager"]["address"], genesis["DagHashManager"]["abi"])
+                ],
+                private_keys=[private_key_alice],
+                mix=parse_mix("add=1"),
+                concurrency=2,
+                wait_for_receipts=False,
+            )
+            report = generator.run(duration=30, limit=10, out=None)
+
+        assert report["completed"] >= 10
+        assert report["in_flight"] == 0
+
+    def test_returned_failures_are_recorded(self, mocker, private_key_alice):
+        hash_manager = mocker.Mock()
+        hash_manager.add.side_effect = [
+            _receipt("1"), BlockchainError(message="Transaction not found"), _receipt("0"), _receipt("1"),
+        ]
+        generator = LoadGenerator(
+            hash_managers=[hash_manager],
+            dag_hash_managers=[mocker.Mock()],
+            private_keys=[private_key_alice],
+            mix=parse_mix("add=1"),
+            concurrency=1,
+        )
+
+        report = generator.run(duration=30, limit=4, out=None)
+
+        assert (report["completed"], report["failed"]) == (2, 2)
+        assert report["errors"]["add"] == {
+            "BlockchainError: Transaction not found": 1, "BlockchainError: Transaction reverted": 1,
+        }
+        assert len(generator.keys[0].hashes) == 2
+
+    def test_node_url_requires_private_key(self, capsys):
+        with pytest.raises(SystemExit):
+            main(["--node-url", "http://127.0.0.1:1"])
+        assert "--private-key is required" in capsys.readouterr().err
+
+    def test_import_does_not_load_local_node(self):
+        code = "import sys, LedgerAdapter.load; print('LedgerAdapter.local_node' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "False"
@@ -0,0 +1,196 @@
+import json
+
+import pytest
+
+from web3 import Web3
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.dag_hash_manager import DagHashManager
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.hashing import hash_file, hash_json_file
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.models import BlockchainError, BlockchainResponse
+from LedgerAdapter.utils import bytes_to_0xhex, wait_for_liveness
+
+
+@pytest.fixture(scope="module")
+def local_node():
+    with LocalNode() as node:
+        yield node
+
+
+@pytest.fixture
+def local_connection(local_node):
+    connection = Connection(node_url=local_node.url)
+    wait_for_liveness(connection, timeout=5)
+    return connection
+
+
+def _manager(cls, local_node, local_connection, name):
+    contract = local_node.genesis_contracts()[name]
+    return cls(
+        node_connection=local_connection,
+        contract_address=contract["address"],
+        contract_abi=contract["abi"]
+    )
+
+
+class TestLocalNode:
+
+    def test_add_read_and_revert_messages(self, local_node, local_connection, private_key_alice, private_key_bob):
+        manager = _manager(HashManager, local_node, local_connection, "HashManager")
+
+        response = manager.add("local-node", private_key_alice, synchronous=True)
+        assert isinstance(response, BlockchainResponse)
+        assert response.status == "1"
+        assert response.events[0].event_name == "HashAdded"
+
+        hashed_value = Web3.keccak(text="local-node").to_0x_hex()
+        assert manager.read(hashed_value).value[1] is False
+        with pytest.raises(BlockchainError, match="Hash already exists"):
+            manager.add("local-node", private_key_alice, synchronous=True)
+        with pytest.raises(BlockchainError, match="Caller is not the owner"):
+            manager.deprecate(hashed_value, private_key_bob, synchronous=True)
+
+    def test_bulk_writes_and_events(self, local_node, local_connection, private_key_alice):
+        manager = _manager(DagHashManager, local_node, local_connection, "DagHashManager")
+        a, b, c = (Web3.keccak(text=f"bulk-{v}") for v in "abc")
+
+        report = manager.import_dag([a, b, c], [(a, b), (b, c)], private_key_alice)
+        assert {item.status for item in report} == {"added"}
+        with pytest.raises(BlockchainError, match="Link would create a cycle"):
+            manager.add_outgoing_link(c.to_0x_hex(), a.to_0x_hex(), private_key_alice, synchronous=True)
+
+        events = manager.get_events(event_name="OutgoingLinkAdded")
+        assert [(e.event_args["fromHash"], e.event_args["toHash"]) for e in events] == [
+            (a.to_0x_hex(), b.to_0x_hex()), (b.to_0x_hex(), c.to_0x_hex()),
+        ]
+
+    def test_add_digest(self, local_node, local_connection, private_key_alice):
+        manager = _manager(HashManager, local_node, local_connection, "HashManager")
+        digest = Web3.keccak(text="add-digest")
+
+        response = manager.add_digest(digest.to_0x_hex(), private_key_alice, synchronous=True)
+        assert response.status == "1"
+        assert response.events[0].event_results["hashValue"] == digest.to_0x_hex()
+        assert manager.read(digest.to_0x_hex()).value[1] is False
+        with pytest.raises(BlockchainError, match="Hash already exists"):
+            manager.add_digest(digest, private_key_alice, synchronous=True)
+        with pytest.raises(ValueError, match="Digest must be 32 bytes"):
+            manager.add_digest("0x" + "ab " * 21 + "a", private_key_alice)
+
+    def test_add_hash_digest(self, local_node, local_connection, private_key_alice):
+        manager = _manager(DagHashManager, local_node, local_connection, "DagHashManager")
+        digest = Web3.keccak(text="add-hash-digest")
+
+        response = manager.add_hash_digest(digest, private_key_alice, synchronous=True)
+        assert response.status == "1"
+        assert manager.read_hash(digest.to_0x_hex()).value[1] is False
+        with pytest.raises(BlockchainError, match="Hash already exists"):
+            manager.add_hash_digest("0x" + digest.hex().upper(), private_key_alice, synchronous=True)
+        with pytest.raises(ValueError, match="Digest must be 32 bytes"):
+            manager.add_hash_digest(digest[:31], private_key_alice)
+
+    def test_add_file(self, tmp_path, local_node, local_connection, private_key_alice):
+        manager = _manager(HashManager, local_node, local_connection, "HashManager")
+        path = tmp_path / "document.bin"
+        path.write_bytes(b"add-file contents\n")
+
+        response = manager.add_file(str(path), private_key_alice, synchronous=True)
+        assert response.status == "1"
+        assert response.events[0].event_results["hashValue"] == hash_file(str(path))
+        assert manager.read(hash_file(str(path))).value[1] is False
+
+    @pytest.mark.parametrize("json_document, hasher", [(False, hash_file), (True, hash_json_file)])
+    def test_add_hash_file(self, tmp_path, local_node, local_connection, private_key_alice, json_document, hasher):
+        manager = _manager(DagHashManager, local_node, local_connection, "DagHashManager")
+        path = tmp_path / "document.json"
+        # Non-canonical key order, so the two hashing modes differ.
+        path.write_text(json.dumps({"b": 1, "a": [json_document]}))
+        assert hash_file(str(path)) != hash_json_file(str(path))
+
+        response = manager.add_hash_file(str(path), private_key_alice, synchronous=True, json_document=json_document)
+        assert response.status == "1"
+        assert response.events[0].event_results["hashValue"] == hasher(str(path))
+        assert manager.read_hash(hasher(str(path))).value[1] is False
+
+    def test_raw_results_match_parsed(self, local_node, local_connection, private_key_alice):
+        manager = _manager(HashManager, local_node, local_connection, "HashManager")
+        tx_hash = manager.add("raw-and-parsed", private_key_alice)
+
+        raw = manager.wait_for_receipt(tx_hash, raw=True)
+        parsed = manager.wait_for_receipt(tx_hash)
+        assert str(raw.status) == parsed.status
+        assert bytes_to_0xhex(raw.block.block_hash) == parsed.block.block_hash
+        assert str(raw.block.block_number) == parsed.block.block_number
+        assert bytes_to_0xhex(raw.transaction.transaction_hash) == parsed.transaction.transaction_hash == tx_hash
+        assert raw.transaction.from_address == parsed.transaction.from_address
+        assert raw.transaction.to_address == parsed.transaction.to_address
+        assert str(raw.transaction.gas_used) == parsed.transaction.gas_used
+        assert [(e.event_name, bytes_to_0xhex(e.event_results)) for e in raw.events] == [
+            (e.event_name, e.event_results) for e in parsed.events
+        ]
+
+        block = int(parsed.block.block_number)
+        raw_events = manager.get_events(from_block=block, to_block=block, raw=True)
+        events = manager.get_events(from_block=block, to_block=block)
+        assert len(raw_events) == len(events) == 1
+        for raw_event, event in zip(raw_events, events):
+            assert raw_event.address == event.address
+            assert bytes_to_0xhex(raw_event.block_hash) == event.block_hash
+            assert str(raw_event.block_number) == event.block_number
+            assert raw_event.event_name == event.event_name
+            assert bytes_to_0xhex(raw_event.event_args) == event.event_args
+            assert bytes_to_0xhex(raw_event.transaction_hash) == event.transaction_hash
+            assert str(raw_event.log_index) == event.log_index
+
+    def test_log_range_past_head_is_empty(self, local_node, local_connection, private_key_alice):
+        manager = _manager(HashManager, local_node, local_connection, "HashManager")
+        manager.add("log-range", private_key_alice, synchronous=True)
+        latest = manager.w3.eth.block_number
+
+        assert manager.get_events(from_block=latest, to_block=latest)
+        assert manager.get_events(from_block=latest + 1) == []
+        assert manager.get_events(from_block=latest + 1, to_block=latest + 5) == []
+        assert manager.get_events(from_block=latest, to_block=latest - 1) == []
+
+    def test_plain_transfer_to_account_succeeds(self, local_node, local_connection, private_key_alice):
+        w3 = Web3(local_connection.get_provider())
+        account = w3.eth.account.from_key(private_key_alice)
+        signed = account.sign_transaction({
+            "to": account.address, "value": 0, "gas": 21_000, "gasPrice": 0,
+            "nonce": w3.eth.get_transaction_count(account.address), "chainId": w3.eth.chain_id,
+        })
+        receipt = w3.eth.wait_for_transaction_receipt(w3.eth.send_raw_transaction(signed.raw_transaction))
+        assert receipt.status == 1
+
+    def test_future_nonces_wait_for_the_gap(self):
+        node = LocalNode()
+        manager = _manager(HashManager, node, Connection(node_url="http://127.0.0.1:1"), "HashManager")
+        account = manager.w3.eth.account.from_key(
+            "0x3f9d4328d47d5aa8b84c4716679a78fc21eab62be253b99315e4fa924d07559f"
+        )
+        raws = [
+            account.sign_transaction(manager.contract.functions.add(Web3.keccak(text=str(i))).build_transaction({
+                "from": account.address, "chainId": node.chain_id, "gasPrice": 0, "gas": 100_000, "nonce": i,
+            })).raw_transaction.to_0x_hex()
+            for i in range(2)
+        ]
+
+        node.handle_rpc({"id": 1, "method": "eth_sendRawTransaction", "params": [raws[1]]})
+        assert node.handle_rpc({"id": 2, "method": "eth_blockNumber"})["result"] == "0x0"
+        node.handle_rpc({"id": 3, "method": "eth_sendRawTransaction", "params": [raws[0]]})
+        assert node.handle_rpc({"id": 4, "method": "eth_blockNumber"})["result"] == "0x2"
+
+    def test_authentication(self, private_key_alice):
+        with LocalNode(credentials={"alice": "secret"}) as node:
+            with pytest.raises(ConnectionError):
+                Connection(node_url=node.url).with_authentication("alice", "wrong")
+
+            manager = _manager(HashManager, node, Connection(node_url=node.url), "HashManager")
+            with pytest.raises(Exception):
+                manager.w3.eth.block_number
+
+            connection = Connection(node_url=node.url).with_authentication("alice", "secret")
+            manager = _manager(HashManager, node, connection, "HashManager")
+            assert manager.w3.eth.block_number == 0
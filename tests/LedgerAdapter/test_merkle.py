@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from web3 import Web3
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.merkle import MerkleBatch, MerkleTree, compute_root, leaf_hash, verify_inclusion
+from LedgerAdapter.models import BlockchainError, BlockchainResponse, BlockDetails, TransactionDetails
+from LedgerAdapter.utils import canonicalize_json
+
+
+class TestMerkleTree:
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13])
+    def test_every_proof_rebuilds_root(self, size):
+        tree = MerkleTree([leaf_hash({"id": i}) for i in range(size)])
+        for index in range(size):
+            proof = tree.proof(index)
+            assert compute_root(proof.leaf, proof.proof) == tree.root
+
+    def test_leaf_uses_canonical_json(self):
+        assert leaf_hash({"b": 1, "a": 2}) == leaf_hash({"a": 2, "b": 1})
+
+    def test_tampered_proof_fails(self):
+        tree = MerkleTree([leaf_hash({"id": i}) for i in range(4)])
+        proof = tree.proof(0)
+        other = "0x" + leaf_hash({"id": 99}).hex()
+        assert compute_root(other, proof.proof) != tree.root
+
+    def test_save_and_load(self, tmp_path):
+        tree = MerkleTree([leaf_hash({"id": i}) for i in range(5)])
+        path = str(tmp_path / "tree.json")
+        tree.save(path, transaction_hash="0x01")
+        assert MerkleTree.load(path).root == tree.root
+
+    def test_leaves_and_nodes_are_domain_separated(self):
+        document = {"id": 1}
+        assert leaf_hash(document) == Web3.keccak(b"\x00" + canonicalize_json(document).encode())
+
+        left, right = sorted([leaf_hash({"id": 1}), leaf_hash({"id": 2})])
+        tree = MerkleTree([right, left])
+        assert tree.root == Web3.keccak(b"\x01" + left + right).to_0x_hex()
+        # Plain pair hashing would let the pair be presented as a leaf.
+        assert tree.root != Web3.keccak(left + right).to_0x_hex()
+
+
+class TestMerkleBatch:
+
+    def test_anchor_and_verify_against_local_node(self, tmp_path, private_key_alice):
+        with LocalNode() as node:
+            contract = node.genesis_contracts()["HashManager"]
+            manager = HashManager(Connection(node_url=node.url), contract["address"], contract["abi"])
+            batch = MerkleBatch(manager, str(tmp_path))
+            documents = [{"id": i, "body": f"document {i}"} for i in range(5)]
+            for document in documents:
+                batch.append(document)
+
+            response = batch.anchor(private_key_alice)
+
+            assert response.status == "1"
+            assert (tmp_path / f"{batch.tree.root}.json").exists()
+            for index, document in enumerate(documents):
+                assert verify_inclusion(manager, document, batch.proof(index))
+            assert not verify_inclusion(manager, {"id": 0, "body": "forged"}, batch.proof(0))
+
+            unanchored = MerkleTree([leaf_hash(document) for document in documents[:3]])
+            assert not verify_inclusion(manager, documents[0], unanchored.proof(0))
+
+    def test_reverted_anchor_keeps_leaves(self, tmp_path, private_key_alice):
+        with LocalNode() as node:
+            contract = node.genesis_contracts()["HashManager"]
+            manager = HashManager(Connection(node_url=node.url), contract["address"], contract["abi"])
+            documents = [{"id": i} for i in range(3)]
+            first = MerkleBatch(manager, str(tmp_path / "first"))
+            second = MerkleBatch(manager, str(tmp_path / "second"))
+            for document in documents:
+                first.append(document)
+                second.append(document)
+            first.anchor(private_key_alice)
+
+            # The same batch has the same root, which is already on chain.
+            with pytest.raises(BlockchainError, match="Hash already exists"):
+                second.anchor(private_key_alice)
+
+            assert len(second.leaves) == 3
+            assert second.tree is None
+            assert not os.path.exists(tmp_path / "second")
+
+    @pytest.mark.parametrize("response", [
+        BlockchainError(message="Transaction not found"),
+        BlockchainResponse(
+            status="0",
+            block=BlockDetails(block_hash="0x01", block_number="1"),
+            transaction=TransactionDetails(
+                transaction_hash="0x02", from_address="0xa", to_address="0xb", gas_used="1"
+            ),
+            events=[]
+        ),
+    ])
+    def test_failed_anchor_response_is_raised(self, mocker, tmp_path, response):
+        manager = mocker.Mock()
+        manager.add.return_value = response
+        batch = MerkleBatch(manager, str(tmp_path))
+        batch.append({"id": 1})
+
+        with pytest.raises(BlockchainError):
+            batch.anchor("key")
+
+        assert len(batch.leaves) == 1
+        assert os.listdir(tmp_path) == []
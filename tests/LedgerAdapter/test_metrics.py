@@ -0,0 +1,190 @@
+import re
+
+import pytest
+import requests
+
+from LedgerAdapter.connection import Connection
+from LedgerAdapter.hash_manager import HashManager
+from LedgerAdapter.local_node import LocalNode
+from LedgerAdapter.metrics import (
+    ContractMetrics,
+    MetricsRegistry,
+    MetricsServer,
+    OTHER_REASON,
+    track_connection,
+    track_sender_pool,
+)
+from LedgerAdapter.models import BlockchainError
+from LedgerAdapter.sender_pool import SenderPool
+
+
+class TestMetricsRegistry:
+
+    def test_counter_and_gauge_render(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('requests_total', "Requests", ('method',))
+        gauge = registry.gauge('in_flight', "In flight")
+        counter.inc(method='eth_call')
+        counter.inc(2, method='eth_call')
+        gauge.set(3)
+        gauge.dec()
+
+        text = registry.render()
+        assert '# TYPE requests_total counter' in text
+        assert 'requests_total{method="eth_call"} 3' in text
+        assert 'in_flight 2' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('latency_seconds', "Latency", ('method',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, method='eth_call')
+
+        text = registry.render()
+        assert text.startswith('# HELP latency_seconds Latency\n# TYPE latency_seconds histogram\n')
+        assert 'latency_seconds_sum{method="eth_call"} 5.55' in text
+        assert 'latency_seconds_bucket{method="eth_call",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{method="eth_call",le="1"} 2' in text
+        assert 'latency_seconds_bucket{method="eth_call",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{method="eth_call"} 3' in text
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter('errors_total', "Errors", ('reason',)).inc(reason='say "no"\n')
+        registry.histogram('latency_seconds', "Latency", ('path',), buckets=(1.0,)).observe(0.5, path='C:\\tmp')
+        text = registry.render()
+        assert 'errors_total{reason="say \\"no\\"\\n"} 1' in text
+        assert 'latency_seconds_bucket{path="C:\\\\tmp",le="1"} 1' in text
+
+    def test_exposition_format(self):
+        registry = MetricsRegistry()
+        registry.counter('requests_total', "Requests", ('method',)).inc(method='eth_call')
+        registry.gauge('in_flight', "In flight").set(1.5)
+        registry.histogram('latency_seconds', "Latency", ('method',)).observe(0.2, method='eth_call')
+
+        sample = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{([a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*",?)*\})? (\S+)$')
+        types = {}
+        for line in registry.render().splitlines():
+            if line.startswith('# TYPE '):
+                _, _, name, kind = line.split(' ')
+                assert name not in types
+                types[name] = kind
+                continue
+            if line.startswith('# HELP '):
+                continue
+            match = sample.match(line)
+            assert match, line
+            name = re.sub(r'_(bucket|sum|count)$', '', match.group(1)) \
+                if match.group(1) not in types else match.group(1)
+            assert name in types, line
+            float(match.group(5).replace('+Inf', 'inf'))
+        assert types == {'requests_total': 'counter', 'in_flight': 'gauge', 'latency_seconds': 'histogram'}
+
+    def test_invalid_usage(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('requests_total', "Requests", ('method',))
+        with pytest.raises(ValueError):
+            counter.inc(-1, method='eth_call')
+        with pytest.raises(ValueError):
+            counter.inc(host='node')
+        with pytest.raises(ValueError):
+            registry.gauge('requests_total', "Requests", ('method',))
+        assert registry.counter('requests_total', "Requests", ('method',)) is counter
+
+    def test_callbacks_are_read_at_collection(self):
+        registry = MetricsRegistry()
+        pool = SenderPool([
+            "0x3f9d4328d47d5aa8b84c4716679a78fc21eab62be253b99315e4fa924d07559f",
+        ])
+        track_sender_pool(registry, pool)
+        lane = pool.acquire()
+        pool.track(lane, '0x01')
+        assert registry.get('ledger_adapter_sender_in_flight').get(account=lane.address) == 1
+        pool.complete('0x01')
+        assert registry.get('ledger_adapter_sender_in_flight').get(account=lane.address) == 0
+
+    def test_in_flight_is_settled_by_refresh_and_expires(self):
+        metrics = ContractMetrics(MetricsRegistry(), 'contract', refresh_interval=3600, max_in_flight_age=3600)
+        metrics.sent('0x01')
+        metrics.sent('0x02')
+        metrics.refresh(lambda hashes: [{'status': '0x1'}, None])
+        assert metrics.in_flight.get(contract='contract') == 2
+
+        metrics.refresh(lambda hashes: [{'status': '0x1'}, None], force=True)
+        assert metrics.in_flight.get(contract='contract') == 1
+
+        metrics.max_in_flight_age = 0
+        metrics.refresh(lambda hashes: [None] * len(hashes), force=True)
+        assert metrics.in_flight.get(contract='contract') == 0
+
+    def test_failed_refresh_keeps_entries(self):
+        metrics = ContractMetrics(MetricsRegistry(), 'contract')
+        metrics.sent('0x01')
+
+        def fail(hashes):
+            raise ConnectionError("node down")
+
+        metrics.refresh(fail, force=True)
+        assert metrics.in_flight.get(contract='contract') == 1
+
+    def test_error_reasons_are_capped(self):
+        metrics = ContractMetrics(MetricsRegistry(), 'contract', max_reasons=1)
+        metrics.record_error('execute', BlockchainError(message="Hash already exists"))
+        metrics.record_error('execute', BlockchainError(message="Block 7 not found"))
+        assert metrics.errors.get(contract='contract', operation='execute', reason=OTHER_REASON) == 1
+
+
+class TestContractMetrics:
+
+    def test_contract_operations_are_measured(self, private_key_alice):
+        registry = MetricsRegistry()
+        with LocalNode() as node:
+            contract = node.genesis_contracts()['HashManager']
+            connection = Connection(node_url=node.url, pool_maxsize=4)
+            track_connection(registry, connection)
+            manager = HashManager(
+                connection, contract['address'], contract['abi']
+            ).with_metrics(registry)
+            address = manager.contract.address
+
+            manager.add("metrics", private_key_alice, synchronous=True)
+            tx_hash = manager.add("metrics-async", private_key_alice)
+            with pytest.raises(BlockchainError):
+                manager.add("metrics", private_key_alice, synchronous=True)
+            assert registry.get('ledger_adapter_transactions_in_flight').get(contract=address) == 1
+            manager.wait_for_receipt(tx_hash)
+            manager.add("metrics-unawaited", private_key_alice)
+            assert registry.get('ledger_adapter_transactions_in_flight').get(contract=address) == 1
+            manager.metrics.refresh(manager._fetch_receipts, force=True)
+            events = list(manager.iter_events(event_name='HashAdded', block_chunk_size=1))
+
+            with MetricsServer(registry) as server:
+                response = requests.get(server.url, timeout=5)
+                missing = requests.get(server.url.replace('/metrics', '/other'), timeout=5)
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/plain')
+        assert missing.status_code == 404
+        assert f'ledger_adapter_http_pool_max_size{{node="{connection.node_url}"}} 4' in response.text
+        assert f'ledger_adapter_http_requests_in_flight{{node="{connection.node_url}"}} 0' in response.text
+
+        rpc = registry.get('ledger_adapter_rpc_duration_seconds')
+        assert rpc.snapshot(contract=address, method='eth_sendRawTransaction')['count'] == 3
+        assert registry.get('ledger_adapter_rpc_errors_total').get(
+            contract=address, method='eth_estimateGas') == 1
+        reasons = [
+            key[2] for key in registry.get('ledger_adapter_errors_total').samples()
+            if key[:2] == (address, 'execute')
+        ]
+        assert len(reasons) == 1 and "Hash already exists" in reasons[0]
+        assert registry.get('ledger_adapter_transactions_in_flight').get(contract=address) == 0
+        assert registry.get('ledger_adapter_transactions_sent_total').get(contract=address) == 3
+        assert registry.get('ledger_adapter_events_scanned_total').get(contract=address) == len(events) == 3
+        assert registry.get('ledger_adapter_event_scan_block').get(contract=address) == \
+            registry.get('ledger_adapter_event_scan_target_block').get(contract=address)
+
+    def test_with_metrics_twice_fails(self):
+        manager = HashManager(Connection(node_url='http://127.0.0.1:1'), '0x' + '42' * 20, [])
+        manager.with_metrics(MetricsRegistry())
+        with pytest.raises(ValueError):
+            manager.with_metrics(MetricsRegistry())
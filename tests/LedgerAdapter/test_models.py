@@ -0,0 +1,31 @@
+import dataclasses
+import pytest
+
+from LedgerAdapter.models import BlockDetails, EventData, RawBlockDetails
+from LedgerAdapter.utils import pretty
+
+
+class TestModels:
+
+    def test_models_are_slotted(self):
+        block = BlockDetails(block_hash="0x01", block_number="1")
+        assert not hasattr(block, "__dict__")
+        with pytest.raises(AttributeError):
+            block.extra = 1
+
+    def test_raw_models_are_frozen(self):
+        block = RawBlockDetails(block_hash=b"\x01" * 32, block_number=1)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            block.block_number = 2
+
+    def test_pretty_still_serializes(self):
+        event = EventData(
+            address="0x00",
+            block_hash="0x01",
+            block_number="1",
+            event_name="HashAdded",
+            event_args={"hashValue": "0x02"},
+            transaction_hash="0x03",
+            log_index="0"
+        )
+        assert '"event_name": "HashAdded"' in pretty(event)
@@ -0,0 +1,78 @@
+import pytest
+
+from eth_account import Account
+
+from LedgerAdapter.sender_pool import SenderPool
+
+
+class TestSenderPool:
+
+    def test_requires_keys(self):
+        with pytest.raises(ValueError):
+            SenderPool([])
+
+    def test_acquire_picks_least_loaded_lane(self, private_key_alice, private_key_bob):
+        pool = SenderPool([private_key_alice, private_key_bob])
+
+        first = pool.acquire()
+        pool.track(first, "0x01")
+        second = pool.acquire()
+
+        assert first.address != second.address
+        assert pool.in_flight() == {first.address: 1, second.address: 1}
+
+    def test_complete_frees_lane(self, private_key_alice):
+        pool = SenderPool([private_key_alice])
+        address = Account.from_key(private_key_alice).address
+
+        lane = pool.acquire()
+        pool.track(lane, "0x01")
+        assert pool.in_flight() == {address: 1}
+
+        pool.complete("0x01")
+        assert pool.in_flight() == {address: 0}
+
+    def test_nonce_lane_is_local_after_first_read(self, mocker, private_key_alice):
+        w3 = mocker.Mock()
+        w3.eth.get_transaction_count.return_value = 7
+        lane = SenderPool([private_key_alice]).lanes[0]
+
+        assert [lane.reserve_nonce(w3) for _ in range(3)] == [7, 8, 9]
+        w3.eth.get_transaction_count.assert_called_once_with(lane.address, 'pending')
+
+    def test_release_rewinds_only_the_last_nonce(self, mocker, private_key_alice):
+        w3 = mocker.Mock()
+        w3.eth.get_transaction_count.return_value = 7
+        lane = SenderPool([private_key_alice]).lanes[0]
+        first, second = lane.reserve_nonce(w3), lane.reserve_nonce(w3)
+
+        assert lane.release_nonce(first) is False
+        assert lane.release_nonce(second) is True
+        assert lane.reserve_nonce(w3) == 8
+
+        lane.reuse_nonce(first)
+        assert [lane.reserve_nonce(w3), lane.reserve_nonce(w3)] == [7, 9]
+        w3.eth.get_transaction_count.assert_called_once()
+
+    def test_refresh_settles_receipts_in_one_batch(self, mocker, private_key_alice):
+        w3 = mocker.Mock()
+        w3.provider.make_batch_request.return_value = [{"result": {"status": "0x1"}}, {"result": None}]
+        pool = SenderPool([private_key_alice])
+        lane = pool.acquire()
+        pool.track(lane, "0x01")
+        lane = pool.acquire()
+        pool.track(lane, "0x02")
+
+        assert pool.refresh(w3) == 1
+        w3.provider.make_batch_request.assert_called_once_with([
+            ("eth_getTransactionReceipt", ["0x01"]),
+            ("eth_getTransactionReceipt", ["0x02"]),
+        ])
+        assert pool.in_flight() == {lane.address: 1}
+
+    def test_refresh_if_due_respects_interval(self, mocker, private_key_alice):
+        w3 = mocker.Mock()
+        pool = SenderPool([private_key_alice], refresh_interval=3600)
+        pool.track(pool.acquire(), "0x01")
+        pool.refresh_if_due(w3)
+        w3.provider.make_batch_request.assert_not_called()
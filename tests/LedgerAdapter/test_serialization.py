@@ -0,0 +1,81 @@
+import io
+import json
+import pytest
+
+from dataclasses import asdict
+
+from LedgerAdapter.models import (
+    BlockchainError,
+    BlockchainResponse,
+    BlockDetails,
+    EventData,
+    EventDetails,
+    RawBlockDetails,
+    TransactionDetails,
+)
+from LedgerAdapter.serialization import dump_ndjson, dumps
+
+
+def _response():
+    return BlockchainResponse(
+        status="1",
+        block=BlockDetails(block_hash="0x01", block_number="5"),
+        transaction=TransactionDetails(
+            transaction_hash="0x02",
+            from_address="0xa",
+            to_address="0xb",
+            gas_used="21000"
+        ),
+        events=[EventDetails(event_name="HashAdded", event_results={"hashValue": "0x03", "owner": "café"})]
+    )
+
+
+def _event(i):
+    return EventData(
+        address="0x00",
+        block_hash="0x01",
+        block_number=str(i),
+        event_name="HashAdded",
+        event_args={"hashValue": "0x02", "owner": "0x03"},
+        transaction_hash="0x04",
+        log_index="0"
+    )
+
+
+class TestSerialization:
+
+    @pytest.mark.parametrize("obj", [_response(), BlockchainError(message="Hash already exists")])
+    def test_pretty_mode_matches_asdict(self, obj):
+        assert dumps(obj) == json.dumps(asdict(obj), indent=2)
+
+    def test_unset_timestamp_is_omitted(self):
+        expected = asdict(_event(1))
+        del expected["timestamp"]
+        assert dumps(_event(1)) == json.dumps(expected, indent=2)
+        assert dumps(_event(1), compact=True) == json.dumps(expected, separators=(",", ":"))
+
+        event = _event(1)
+        event.timestamp = "1700000000"
+        assert json.loads(dumps(event))["timestamp"] == "1700000000"
+
+    def test_unset_timestamp_is_omitted_by_every_backend(self):
+        pytest.importorskip("orjson")
+        assert "timestamp" not in json.loads(dumps(_event(1), backend="orjson"))
+
+    def test_bytes_are_hex_encoded(self):
+        block = RawBlockDetails(block_hash=b"\x01\x02", block_number=5)
+        assert json.loads(dumps(block)) == {"block_hash": "0x0102", "block_number": 5}
+
+    def test_ndjson_stream(self):
+        out = io.StringIO()
+        assert dump_ndjson([_event(i) for i in range(3)], out) == 3
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["block_number"] for line in lines] == ["0", "1", "2"]
+
+    def test_orjson_backend_is_equivalent(self):
+        pytest.importorskip("orjson")
+        assert json.loads(dumps(_response(), backend="orjson")) == asdict(_response())
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            dumps(_event(1), backend="yaml")
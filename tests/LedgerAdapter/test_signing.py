@@ -0,0 +1,42 @@
+import pytest
+
+from eth_account import Account
+
+from LedgerAdapter.signing import SigningPipeline
+
+
+def _transaction(nonce):
+    return {
+        'to': '0xe4a2E908bf0E1ca4305C1fE6C5F84EBA66a98863',
+        'value': 0,
+        'gas': 50000,
+        'gasPrice': 0,
+        'nonce': nonce,
+        'chainId': 1337,
+        'data': '0x'
+    }
+
+
+class TestSigningPipeline:
+
+    def test_sign_matches_account_signature(self, private_key_alice):
+        transactions = [_transaction(nonce) for nonce in range(4)]
+        with SigningPipeline(private_key_alice, max_workers=2, chunksize=1) as pipeline:
+            signed = list(pipeline.sign(transactions))
+
+        expected = [
+            bytes(Account.sign_transaction(tx, private_key_alice).raw_transaction)
+            for tx in transactions
+        ]
+        assert signed == expected
+
+    def test_sign_yields_in_nonce_order(self, private_key_alice):
+        transactions = [_transaction(nonce) for nonce in (3, 0, 2, 1)]
+        with SigningPipeline(private_key_alice, max_workers=2, chunksize=1) as pipeline:
+            signed = list(pipeline.sign(transactions))
+
+        expected = [
+            bytes(Account.sign_transaction(_transaction(nonce), private_key_alice).raw_transaction)
+            for nonce in range(4)
+        ]
+        assert signed == expected
@@ -0,0 +1,140 @@
+import subprocess
+import sys
+
+import pytest
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from LedgerAdapter.utils import (
+    bytes_to_0xhex,
+    digest_to_bytes,
+    hex0x_to_bytes,
+    parse_event_data,
+    parse_raw_event_data,
+)
+
+
+HASH_A = Web3.keccak(text="a")
+HASH_B = Web3.keccak(text="b")
+
+
+class TestDigestToBytes:
+
+    def test_accepts_bytes_and_hex(self):
+        digest = Web3.keccak(text="value")
+        assert digest_to_bytes(digest) == digest
+        assert digest_to_bytes("0x" + digest.hex()) == digest
+        assert digest_to_bytes("0x" + digest.hex().upper()) == digest
+
+    @pytest.mark.parametrize("digest", [
+        b"\x00" * 31,
+        "0x" + "00" * 31,
+        "00" * 32,
+        "0x" + "zz" * 32,
+        "0x" + "ab " * 21 + "a",
+        "0x" + "ab" * 31 + " \n",
+        123,
+    ])
+    def test_rejects_malformed(self, digest):
+        with pytest.raises(ValueError, match="Digest must be 32 bytes"):
+            digest_to_bytes(digest)
+
+
+class TestHexConverters:
+
+    def test_bytes_to_0xhex_nested(self):
+        value = {
+            "hash": HASH_A,
+            "links": [HASH_A, HexBytes(HASH_B)],
+            "pair": (b"\x01\x02", 5),
+            "owner": "0xe4a2E908bf0E1ca4305C1fE6C5F84EBA66a98863",
+            "count": 3,
+            None: None,
+        }
+        assert bytes_to_0xhex(value) == {
+            "hash": "0x" + HASH_A.hex(),
+            "links": ["0x" + HASH_A.hex(), "0x" + HASH_B.hex()],
+            "pair": ("0x0102", 5),
+            "owner": "0xe4a2E908bf0E1ca4305C1fE6C5F84EBA66a98863",
+            "count": 3,
+            None: None,
+        }
+
+    def test_bytes_to_0xhex_keeps_container_types(self):
+        converted = bytes_to_0xhex((HASH_A, HASH_B))
+        assert converted == ("0x" + HASH_A.hex(), "0x" + HASH_B.hex())
+        assert isinstance(converted, tuple)
+
+    def test_unchanged_containers_are_not_rebuilt(self):
+        value = {"owner": "0x00", "items": [1, "a", None]}
+        assert bytes_to_0xhex(value) is value
+        assert hex0x_to_bytes({"items": [1, "a"]})["items"] == [1, "a"]
+
+    def test_hex0x_to_bytes_nested(self):
+        value = {"hashValue": "0x" + HASH_A.hex(), "links": ["0x" + HASH_A.hex(), "0x" + HASH_B.hex()], "n": 1}
+        assert hex0x_to_bytes(value) == {"hashValue": HASH_A, "links": [HASH_A, HASH_B], "n": 1}
+
+    def test_round_trip_mixed_list(self):
+        value = [HASH_A, b"\x01", "plain", 7]
+        assert hex0x_to_bytes(bytes_to_0xhex(value)) == value
+
+    def test_hex0x_to_bytes_leaves_unprefixed_strings(self):
+        value = ["0x" + HASH_A.hex(), "ab" + HASH_B.hex()]
+        assert hex0x_to_bytes(value) == [HASH_A, "ab" + HASH_B.hex()]
+
+    def test_hex0x_to_bytes_rejects_embedded_prefix(self):
+        malformed = "0x" + HASH_A.hex()[:60] + "0x12"
+        with pytest.raises(ValueError):
+            hex0x_to_bytes(["0x" + HASH_B.hex(), malformed, "0x" + HASH_A.hex()])
+        with pytest.raises(ValueError):
+            hex0x_to_bytes(malformed)
+
+
+class TestParseEventData:
+
+    def _log(self):
+        return AttributeDict({
+            "address": "0xe4a2E908bf0E1ca4305C1fE6C5F84EBA66a98863",
+            "blockHash": HexBytes(HASH_A),
+            "blockNumber": 12,
+            "event": "HashAdded",
+            "args": AttributeDict({"hashValue": HexBytes(HASH_B), "owner": "0x00"}),
+            "transactionHash": HexBytes(HASH_B),
+            "logIndex": 3,
+        })
+
+    def test_parse_event_data_converts(self):
+        event = parse_event_data(self._log())
+        assert event.block_number == "12"
+        assert event.log_index == "3"
+        assert event.event_args["hashValue"] == "0x" + HASH_B.hex()
+
+    def test_parse_raw_event_data_keeps_values(self):
+        log = self._log()
+        event = parse_raw_event_data(log)
+        assert event.block_number == 12
+        assert event.log_index == 3
+        assert event.block_hash is log.blockHash
+        assert event.event_args["hashValue"] is log.args.hashValue
+
+
+class TestLightweightImports:
+
+    @pytest.mark.parametrize("module", ["LedgerAdapter.utils", "LedgerAdapter.hashing", "LedgerAdapter.connection"])
+    def test_module_does_not_import_web3_or_requests(self, module):
+        code = (
+            f"import sys, {module}; "
+            "print(sorted(m for m in ('web3', 'eth_account', 'requests') if m in sys.modules))"
+        )
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == '[]'
+
+    def test_bytes_subclasses_are_converted(self):
+        class Digest(bytes):
+            pass
+
+        value = Digest(HASH_A)
+        assert bytes_to_0xhex(value) == HASH_A.to_0x_hex()
+        assert bytes_to_0xhex([value, Digest(HASH_B)]) == [HASH_A.to_0x_hex(), HASH_B.to_0x_hex()]